@@ -1,15 +1,12 @@
 from . import base
 
-from . import feature
-from . import image
-from . import io
-from . import landmark
-from . import math
-from . import model
-from . import shape
-from . import transform
-from . import visualize
-
 from ._version import get_versions
 __version__ = get_versions()['version']
 del get_versions
+
+# The subpackages are imported on first access, so that e.g. a script that
+# only uses menpo.io does not pay for importing everything else.
+base._lazy_module_attributes(__name__, {
+    name: ('.' + name, None) for name in ('feature', 'image', 'io', 'landmark',
+                                          'math', 'model', 'shape',
+                                          'transform', 'visualize')})
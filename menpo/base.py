@@ -1,7 +1,13 @@
 import collections
-from itertools import chain
+import importlib
+import operator
+from bisect import bisect_right
+from itertools import islice
 from functools import partial, wraps
 import os.path
+import sys
+import threading
+import types
 import warnings
 
 
@@ -301,6 +307,81 @@ class Targetable(Copyable):
         raise NotImplementedError()
 
 
+class _LazyModule(types.ModuleType):
+    r"""
+    A module that loads missing attributes on first access. Used to provide
+    lazy attributes on Python versions that predate module level
+    ``__getattr__`` (:pep:`562`).
+    """
+    def __getattr__(self, name):
+        # Only called if normal lookup fails
+        load = self.__dict__.get('_lazy_load')
+        if load is not None and name in self.__dict__['_lazy_attributes']:
+            return load(name)
+        raise AttributeError('module {!r} has no attribute '
+                             '{!r}'.format(self.__name__, name))
+
+    def __dir__(self):
+        return sorted(set(self.__dict__) | set(self._lazy_attributes))
+
+
+def _lazy_module_attributes(module_name, attributes):
+    r"""
+    Load the public attributes of a package lazily - the first time each is
+    accessed - using a module level ``__getattr__`` (:pep:`562`). This keeps
+    importing a package cheap, as only the submodules that are actually used
+    are ever imported. On Python versions before 3.7 the package is made an
+    instance of a module subclass that does the same.
+
+    Parameters
+    ----------
+    module_name : `str`
+        The ``__name__`` of the package.
+    attributes : `dict` of `str` -> ``(str, str or None)``
+        For each attribute, the (relative) module it lives in and its name in
+        that module. A name of ``None`` means the attribute is the module
+        itself.
+    """
+    module = sys.modules[module_name]
+
+    def load(name):
+        submodule, attribute = attributes[name]
+        value = importlib.import_module(submodule, module_name)
+        if attribute is not None:
+            value = getattr(value, attribute)
+        setattr(sys.modules[module_name], name, value)
+        return value
+
+    if sys.version_info < (3, 7):
+        module._lazy_attributes = attributes
+        module._lazy_load = load
+        try:
+            # Python 3.5+ allows changing the class of a module
+            module.__class__ = _LazyModule
+        except TypeError:
+            # Otherwise replace the module in sys.modules - the import
+            # machinery returns whatever is there once the package has run.
+            # The original module is kept alive as on Python 2 its globals
+            # are cleared when it is garbage collected.
+            lazy_module = _LazyModule(module_name, module.__doc__)
+            lazy_module.__dict__.update(module.__dict__)
+            lazy_module._lazy_original_module = module
+            sys.modules[module_name] = lazy_module
+        return
+
+    def __getattr__(name):
+        if name in attributes:
+            return load(name)
+        raise AttributeError('module {!r} has no attribute '
+                             '{!r}'.format(module_name, name))
+
+    def __dir__():
+        return sorted(set(module.__dict__) | set(attributes))
+
+    module.__getattr__ = __getattr__
+    module.__dir__ = __dir__
+
+
 def menpo_src_dir_path():
     r"""The path to the top of the menpo Python package.
 
@@ -459,6 +540,173 @@ class doc_inherit(object):
         return func
 
 
+# The attributes that make up the representation of a LazyList
+_LAZY_LIST_STATE = {'_source', '_indices', '_length', '_pipeline'}
+
+
+def _call_nth(callables, i):
+    return callables[i]()
+
+
+def _index_into(items, i):
+    return items[i]
+
+
+def _apply_nth(fs, lazy_list, i):
+    return fs[i](lazy_list[i])
+
+
+def _cached_nth(cache, lazy_list, i):
+    return cache.get(i, partial(lazy_list._get, i))
+
+
+class _Concat(object):
+    r"""
+    Index callable of the concatenation of several lazy lists. Nested
+    concatenations are flattened, so indexing is a bisection over the
+    offsets of the lists however many times lists are concatenated.
+    """
+    def __init__(self, lazy_lists):
+        self.lazy_lists, self.offsets = [], []
+        self.length = 0
+        for lazy_list in lazy_lists:
+            if (isinstance(lazy_list._source, _Concat) and
+                    lazy_list._indices is None and not lazy_list._pipeline):
+                parts = lazy_list._source.lazy_lists
+            else:
+                parts = [lazy_list]
+            for part in parts:
+                if len(part) > 0:
+                    self.lazy_lists.append(part)
+                    self.offsets.append(self.length)
+                    self.length += len(part)
+
+    def __call__(self, i):
+        k = bisect_right(self.offsets, i) - 1
+        return self.lazy_lists[k]._get(i - self.offsets[k])
+
+
+def _nbytes(obj):
+    r"""
+    The (approximate) memory footprint of an object, counting the NumPy
+    arrays that dominate the size of Menpo types - the pixels and mask of
+    images, the points of shapes and the points of any landmarks. Objects
+    holding none of these fall back to ``sys.getsizeof``.
+    """
+    import numpy as np
+    if isinstance(obj, np.ndarray):
+        return obj.nbytes
+    elif isinstance(obj, (list, tuple)):
+        return sum(_nbytes(x) for x in obj)
+    n_bytes = 0
+    for attr in ('pixels', 'points'):
+        array = getattr(obj, attr, None)
+        if isinstance(array, np.ndarray):
+            n_bytes += array.nbytes
+    mask = getattr(obj, 'mask', None)
+    if mask is not None and not isinstance(mask, np.ndarray):
+        n_bytes += _nbytes(mask)
+    if getattr(obj, 'has_landmarks', False):
+        n_bytes += sum(_nbytes(l) for l in obj.landmarks.values())
+    return n_bytes or sys.getsizeof(obj)
+
+
+class LazyListCache(object):
+    r"""
+    A cache of the items of a :map:`LazyList`, bounded by the total size of
+    the cached items (see :meth:`LazyList.cache`). The size of each item is
+    taken to be the size of its pixel, mask and point arrays.
+
+    The cache is safe to share between threads. When pickled (e.g. to be
+    sent to a worker process) the cached items are dropped.
+
+    Parameters
+    ----------
+    max_bytes : `int`
+        The maximum total size of the cached items.
+    policy : ``{'lru', 'fifo'}``, optional
+        Whether the least recently used or the first cached item is evicted
+        when the cache is full.
+    """
+    def __init__(self, max_bytes, policy='lru'):
+        if max_bytes <= 0:
+            raise ValueError('max_bytes must be positive '
+                             '({} provided)'.format(max_bytes))
+        if policy not in ('lru', 'fifo'):
+            raise ValueError("Unknown policy '{}' - valid values are 'lru' "
+                             "and 'fifo'.".format(policy))
+        self.max_bytes = max_bytes
+        self.policy = policy
+        self._reset()
+
+    def _reset(self):
+        self.hits = 0
+        self.misses = 0
+        self.n_bytes = 0
+        self._items = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        return {'max_bytes': self.max_bytes, 'policy': self.policy}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._reset()
+
+    def __len__(self):
+        return len(self._items)
+
+    def __str__(self):
+        return '{}: {} items, {}/{} bytes ({} hits, {} misses)'.format(
+            type(self).__name__, len(self), self.n_bytes, self.max_bytes,
+            self.hits, self.misses)
+
+    def get(self, key, f):
+        r"""
+        Return the cached item for ``key``, invoking ``f`` to build (and
+        cache) it on a miss.
+
+        Parameters
+        ----------
+        key : `hashable`
+            The key of the item.
+        f : `callable`
+            Builds the item.
+
+        Returns
+        -------
+        item : `object`
+            The (possibly cached) item.
+        """
+        with self._lock:
+            entry = self._items.get(key)
+            if entry is not None:
+                self.hits += 1
+                if self.policy == 'lru':
+                    self._items[key] = self._items.pop(key)
+                return entry[0]
+            self.misses += 1
+        item = f()
+        n_bytes = _nbytes(item)
+        if n_bytes <= self.max_bytes:
+            with self._lock:
+                if key not in self._items:
+                    self._items[key] = (item, n_bytes)
+                    self.n_bytes += n_bytes
+                    while self.n_bytes > self.max_bytes:
+                        _, (_, evicted) = self._items.popitem(last=False)
+                        self.n_bytes -= evicted
+        return item
+
+    def clear(self):
+        r"""
+        Remove every item from the cache (the statistics are retained).
+        """
+        with self._lock:
+            self._items.clear()
+            self.n_bytes = 0
+
+
 class LazyList(collections.Sequence, Copyable):
     r"""
     An immutable sequence that provides the ability to lazily access objects.
@@ -470,6 +718,13 @@ class LazyList(collections.Sequence, Copyable):
     When slicing, another `LazyList` is returned, containing the subset
     of callables.
 
+    Internally, lists that are not built from a list of callables are
+    represented compactly - by a single callable taking an index in to an
+    underlying sequence, an (optional) array of indices and a pipeline of
+    functions that is applied to every element. This means that
+    :meth:`map`, :meth:`repeat`, slicing and concatenation never allocate
+    a Python object per element, even for lists of millions of elements.
+
     Parameters
     ----------
     callables : list of `callable`
@@ -477,23 +732,122 @@ class LazyList(collections.Sequence, Copyable):
     """
 
     def __init__(self, callables):
-        self._callables = callables
+        self._source = list(callables)
+        self._indices = None
+        self._length = len(callables)
+        self._pipeline = ()
+
+    @classmethod
+    def _init_from_source(cls, source, indices=None, length=None,
+                          pipeline=()):
+        r"""
+        Create a lazy list from an index callable ``source``. Element ``i`` of
+        the list is ``source(indices[i])`` (or ``source(i)`` if ``indices``
+        is ``None``) with each function of ``pipeline`` applied in turn.
+        """
+        new = cls.__new__(cls)
+        new._source = source
+        new._indices = indices
+        new._length = len(indices) if indices is not None else length
+        new._pipeline = tuple(pipeline)
+        return new
+
+    def _derive(self, source, indices=None, length=None, pipeline=()):
+        r"""
+        A new lazy list with the given representation that keeps any other
+        (e.g. duck typed) attributes of this list.
+        """
+        new = self.__class__.__new__(self.__class__)
+        for k, v in self.__dict__.items():
+            if k in _LAZY_LIST_STATE:
+                continue
+            try:
+                new.__dict__[k] = v.copy()
+            except AttributeError:
+                new.__dict__[k] = v
+        new._source = source
+        new._indices = indices
+        new._length = len(indices) if indices is not None else length
+        new._pipeline = tuple(pipeline)
+        return new
+
+    @property
+    def _is_callables(self):
+        return isinstance(self._source, list)
+
+    @property
+    def _callables(self):
+        r"""
+        The callables that build each element of this list.
+        """
+        if self._is_callables and not self._pipeline:
+            return self._source
+        return [partial(self._get, i) for i in range(len(self))]
+
+    def _index_source(self):
+        r"""
+        The ``(source, indices)`` pair of the index representation of this
+        list (converting a list of callables if necessary).
+        """
+        if self._is_callables:
+            return partial(_call_nth, self._source), None
+        return self._source, self._indices
+
+    def _index_array(self):
+        import numpy as np
+        if self._indices is None:
+            return np.arange(self._length)
+        return self._indices
+
+    def _get(self, index):
+        if self._is_callables:
+            item = self._source[index]()
+        elif self._indices is None:
+            if index < 0:
+                index += self._length
+            if not 0 <= index < self._length:
+                raise IndexError('LazyList index out of range')
+            item = self._source(index)
+        else:
+            item = self._source(int(self._indices[index]))
+        for f in self._pipeline:
+            item = f(item)
+        return item
 
     def __getitem__(self, slice_):
         # note that we have to check for iterable *before* __index__ as ndarray
         # has both (but we expect the iteration behavior when slicing)
         if isinstance(slice_, collections.Iterable):
             # An iterable object is passed - return a new LazyList
-            return LazyList([self._callables[s] for s in slice_])
+            if self._is_callables:
+                new = LazyList([self._source[s] for s in slice_])
+                new._pipeline = self._pipeline
+                return new
+            import numpy as np
+            index = np.asarray(list(slice_) if not hasattr(slice_, '__len__')
+                               else slice_, dtype=np.int64)
+            return LazyList._init_from_source(
+                self._source, self._index_array()[index],
+                pipeline=self._pipeline)
         elif isinstance(slice_, int) or hasattr(slice_, '__index__'):
             # PEP 357 and single integer index access - returns element
-            return self._callables[slice_]()
-        else:
+            return self._get(operator.index(slice_))
+        elif self._is_callables:
             # A slice or unknown type is passed - let List handle it
-            return LazyList(self._callables[slice_])
+            new = LazyList(self._source[slice_])
+            new._pipeline = self._pipeline
+            return new
+        else:
+            return LazyList._init_from_source(
+                self._source, self._index_array()[slice_],
+                pipeline=self._pipeline)
 
     def __len__(self):
-        return len(self._callables)
+        return self._length
+
+    def __iter__(self):
+        for i in range(self._length):
+            yield self._get(i)
 
     @classmethod
     def init_from_iterable(cls, iterable, f=None):
@@ -517,11 +871,10 @@ class LazyList(collections.Sequence, Copyable):
             A LazyList where each element returns each item of the provided
             iterable, optionally with `f` applied to it.
         """
-        if f is None:
-            # The identity function
-            def f(i):
-                return i
-        return cls([partial(f, x) for x in iterable])
+        items = list(iterable)
+        return cls._init_from_source(partial(_index_into, items),
+                                     length=len(items),
+                                     pipeline=() if f is None else (f,))
 
     @classmethod
     def init_from_index_callable(cls, f, n_elements):
@@ -545,7 +898,7 @@ class LazyList(collections.Sequence, Copyable):
             A LazyList where each element returns the underlying indexable
             object wrapped by ``f``.
         """
-        return cls([partial(f, i) for i in range(n_elements)])
+        return cls._init_from_source(f, length=n_elements)
 
     def map(self, f):
         r"""
@@ -572,25 +925,20 @@ class LazyList(collections.Sequence, Copyable):
         lazy : `LazyList`
             A new LazyList where each element is wrapped by (each) ``f``.
         """
-        # We need this delayed helper function in order to ensure that f
-        # is passed the actual instantiated object and not the callable itself.
-        def delayed(delay_f, delay_x):
-            return delay_f(delay_x())
-
         if isinstance(f, collections.Iterable) and callable(f):
             raise ValueError('It is ambiguous whether the provided argument '
                              'is an iterable object or a callable.')
 
-        new = self.copy()
         if isinstance(f, collections.Iterable):
-            if len(f) != len(new):
+            if len(f) != len(self):
                 raise ValueError('A callable per element of the LazyList must '
                                  'be passed.')
-            new._callables = [partial(delayed, one_f, x)
-                              for one_f, x in zip(f, new._callables)]
+            return self._derive(partial(_apply_nth, list(f), self),
+                                length=len(self))
         else:
-            new._callables = [partial(delayed, f, x) for x in new._callables]
-        return new
+            # A single callable is simply appended to the pipeline
+            return self._derive(self._source, self._indices, self._length,
+                                self._pipeline + (f,))
 
     def repeat(self, n):
         r"""
@@ -616,10 +964,154 @@ class LazyList(collections.Sequence, Copyable):
         >>> repeated_ll = ll.repeat(2)  # Returns immediately
         >>> items = list(repeated_ll)   # [0, 0, 1, 1]
         """
-        new = self.copy()
-        new._callables = list(chain(*zip(*[new._callables] * n)))
+        import numpy as np
+        source, indices = self._index_source()
+        if indices is None:
+            indices = np.arange(self._length)
+        return self._derive(source, np.repeat(indices, n),
+                            pipeline=self._pipeline)
+
+    def cache(self, max_bytes=2 ** 30, policy='lru'):
+        r"""
+        Create a new LazyList that caches the items of this list, so that
+        indexing the same item again (e.g. on a second pass over a dataset)
+        returns the cached item rather than invoking the underlying callable.
+        The cache is bounded by the total size of the pixel, mask and point
+        arrays of the cached items.
+
+        Slices of the returned list share the cache, as do lists created by
+        :meth:`map` (which cache the items before ``f`` is applied). The
+        cache, and its hit and miss statistics, are available as the
+        ``cache_info`` attribute of the returned list.
+
+        Note that cached items are returned as is - modifying an item in
+        place modifies the cached item.
+
+        Parameters
+        ----------
+        max_bytes : `int`, optional
+            The maximum total size of the cached items.
+        policy : ``{'lru', 'fifo'}``, optional
+            Whether the least recently used or the first cached item is
+            evicted when the cache is full.
+
+        Returns
+        -------
+        lazy : `LazyList`
+            A LazyList that caches the items of this list.
+
+        Raises
+        ------
+        ValueError
+            If ``max_bytes`` is not positive or ``policy`` is unknown.
+        """
+        cache = LazyListCache(max_bytes, policy=policy)
+        new = self._derive(partial(_cached_nth, cache, self),
+                           length=len(self))
+        new.cache_info = cache
         return new
 
+    def imap_parallel(self, workers=4, backend='thread', chunksize=1,
+                      prefetch=None):
+        r"""
+        Generator that yields every item of this list, in order, evaluating
+        the items on a pool of workers ahead of the consumer. This allows a
+        chain of lazy operations (e.g. import, crop and rescale) to make use
+        of every core.
+
+        With the ``'process'`` backend every callable of this list must be
+        picklable (so no lambdas). On Python 3.8 or later, large arrays in
+        the items (such as the pixels of images) are returned from the
+        workers through shared memory rather than being pickled. The
+        returned arrays are views on to the shared memory, which is freed
+        once they are garbage collected.
+
+        Parameters
+        ----------
+        workers : positive `int`, optional
+            The number of threads or processes evaluating items.
+        backend : ``{'thread', 'process'}``, optional
+            Evaluate on a pool of threads or a pool of processes. Threads are
+            ideal for work that releases the GIL (such as decoding images).
+        chunksize : positive `int`, optional
+            The number of consecutive items each task evaluates. Larger
+            chunks reduce the overhead of dispatching cheap items to
+            processes.
+        prefetch : positive `int`, optional
+            The maximum number of chunks evaluated ahead of the consumer.
+            Defaults to twice the number of workers.
+
+        Yields
+        ------
+        item : `object`
+            Each item of this list, in order.
+
+        Raises
+        ------
+        ValueError
+            If ``workers``, ``chunksize`` or ``prefetch`` are not positive or
+            ``backend`` is unknown.
+        """
+        if chunksize < 1:
+            raise ValueError('chunksize must be positive '
+                             '({} provided)'.format(chunksize))
+        if prefetch is None:
+            prefetch = 2 * workers
+        shared = backend == 'process' and _shared_memory_available()
+        if shared:
+            # Make sure the workers share our resource tracker, so any
+            # blocks that are never collected are freed when we exit.
+            from multiprocessing import resource_tracker
+            resource_tracker.ensure_running()
+        if backend == 'process':
+            # Send this list to each worker once, rather than with each chunk
+            invoke = partial(_invoke_range, None, to_shared_memory=shared)
+            initializer, initargs = _set_worker_lazy_list, (self,)
+        else:
+            invoke = partial(_invoke_range, self)
+            initializer, initargs = None, ()
+        chunks = (partial(invoke, i, min(i + chunksize, len(self)))
+                  for i in range(0, len(self), chunksize))
+        results = prefetch_callables(
+            chunks, prefetch, workers=workers, backend=backend,
+            initializer=initializer, initargs=initargs,
+            discard=_unlink_shared_memory_chunk if shared else None)
+        try:
+            for chunk in results:
+                chunk = collections.deque(chunk)
+                try:
+                    while chunk:
+                        item = chunk.popleft()
+                        yield _from_shared_memory(item) if shared else item
+                finally:
+                    # Free the blocks of any items that were never yielded
+                    if shared:
+                        _unlink_shared_memory_chunk(chunk)
+        finally:
+            results.close()
+
+    def materialize(self, workers=4, backend='thread', chunksize=1):
+        r"""
+        Evaluate every item of this list on a pool of workers, returning the
+        items as a Python `list`. See :meth:`imap_parallel` for details.
+
+        Parameters
+        ----------
+        workers : positive `int`, optional
+            The number of threads or processes evaluating items.
+        backend : ``{'thread', 'process'}``, optional
+            Evaluate on a pool of threads or a pool of processes.
+        chunksize : positive `int`, optional
+            The number of consecutive items each task evaluates.
+
+        Returns
+        -------
+        items : `list`
+            Every item of this list, in order.
+        """
+        return list(self.imap_parallel(workers=workers, backend=backend,
+                                       chunksize=chunksize))
+
     def copy(self):
         r"""
         Generate an efficient copy of this LazyList - copying the underlying
@@ -632,7 +1124,8 @@ class LazyList(collections.Sequence, Copyable):
             A copy of this LazyList.
         """
         new = Copyable.copy(self)
-        new._callables = list(self._callables)
+        if new._is_callables:
+            new._source = list(self._source)
         return new
 
     def __add__(self, other):
@@ -662,7 +1155,18 @@ class LazyList(collections.Sequence, Copyable):
             If other is not a LazyList or an Iterable
         """
         if isinstance(other, LazyList):
-            return LazyList(self._callables + other._callables)
+            import numpy as np
+            if self._is_callables or other._is_callables:
+                # Explicit callables are kept as they are
+                return LazyList(self._callables + other._callables)
+            elif (self._source is other._source and
+                    self._pipeline == other._pipeline):
+                return LazyList._init_from_source(
+                    self._source, np.concatenate([self._index_array(),
+                                                  other._index_array()]),
+                    pipeline=self._pipeline)
+            source = _Concat([self, other])
+            return LazyList._init_from_source(source, length=source.length)
         elif isinstance(other, collections.Iterable):
             return self + LazyList.init_from_iterable(other)
         else:
@@ -671,6 +1175,116 @@ class LazyList(collections.Sequence, Copyable):
                 '- {} is neither'.format(type(other)))
 
 
+def _worker_pool(workers, backend='thread', initializer=None, initargs=()):
+    r"""
+    Create a pool of ``workers`` threads or processes.
+
+    Parameters
+    ----------
+    workers : `int`
+        The number of workers in the pool.
+    backend : ``{'thread', 'process'}``, optional
+        Whether the pool is made of threads or processes. Note that the
+        process backend requires that all the work submitted is picklable.
+    initializer : `callable`, optional
+        If provided, each worker calls ``initializer(*initargs)`` when it
+        starts.
+    initargs : `tuple`, optional
+        The arguments passed to ``initializer``.
+
+    Returns
+    -------
+    pool : `multiprocessing.pool.Pool`
+        The pool. It is the callers responsibility to terminate it.
+
+    Raises
+    ------
+    ValueError
+        If ``workers`` is not positive or ``backend`` is unknown.
+    """
+    if workers < 1:
+        raise ValueError('The number of workers must be positive '
+                         '({} provided)'.format(workers))
+    if backend == 'thread':
+        from multiprocessing.pool import ThreadPool
+        return ThreadPool(workers, initializer=initializer, initargs=initargs)
+    elif backend == 'process':
+        from multiprocessing import Pool
+        return Pool(workers, initializer=initializer, initargs=initargs)
+    else:
+        raise ValueError("Unknown backend '{}' - valid values are 'thread' "
+                         "and 'process'.".format(backend))
+
+
+def prefetch_callables(callables, prefetch, workers=1, backend='thread',
+                       initializer=None, initargs=(), discard=None):
+    r"""
+    Generator that yields the result of invoking each of ``callables`` in
+    order, evaluating up to ``prefetch`` of them ahead of the consumer on a
+    bounded pool of workers. The yielded order is always the order of
+    ``callables``, regardless of which worker finishes first. Any exception
+    raised by a callable is re-raised in the consumer when its result is
+    reached.
+
+    Parameters
+    ----------
+    callables : `iterable` of `callable`
+        Callables taking no arguments (e.g. the elements of a
+        :map:`LazyList`).
+    prefetch : `int`
+        The maximum number of results that are evaluated ahead of the
+        consumer.
+    workers : `int`, optional
+        The number of threads or processes that evaluate the callables.
+    backend : ``{'thread', 'process'}``, optional
+        Evaluate on a pool of threads or a pool of processes. Threads are
+        ideal for work that releases the GIL (such as decoding images), the
+        process backend requires every callable and its result to be
+        picklable.
+    initializer : `callable`, optional
+        If provided, each worker calls ``initializer(*initargs)`` when it
+        starts. Useful to send large shared state to each process once,
+        rather than with every callable.
+    initargs : `tuple`, optional
+        The arguments passed to ``initializer``.
+    discard : `callable`, optional
+        If provided, called with every result that was evaluated but never
+        yielded, if the generator is closed early. Useful to free resources
+        held by the results.
+
+    Yields
+    ------
+    result : `object`
+        The result of each callable, in order.
+
+    Raises
+    ------
+    ValueError
+        If ``prefetch`` or ``workers`` are not positive.
+    """
+    if prefetch < 1:
+        raise ValueError('prefetch must be positive '
+                         '({} provided)'.format(prefetch))
+    callables = iter(callables)
+    pool = _worker_pool(workers, backend=backend, initializer=initializer,
+                        initargs=initargs)
+    try:
+        pending = collections.deque(pool.apply_async(c)
+                                    for c in islice(callables, prefetch))
+        while pending:
+            result = pending.popleft()
+            # Keep the queue topped up before blocking on the next result
+            for c in islice(callables, 1):
+                pending.append(pool.apply_async(c))
+            yield result.get()
+    finally:
+        if discard is not None:
+            for result in pending:
+                if result.ready() and result.successful():
+                    discard(result.get())
+        pool.terminate()
+
+
 def partial_doc(func, *args, **kwargs):
     r"""
     Return a partial function but the __doc__ attached to the returned
@@ -720,3 +1334,111 @@ def copy_landmarks_and_path(source, target):
     if hasattr(source, 'path'):
         target.path = source.path
     return target
+
+
+# Arrays smaller than this are returned from worker processes in the pickle
+# stream rather than through shared memory
+_SHARED_MEMORY_MIN_BYTES = 2 ** 16
+
+
+def _shared_memory_available():
+    # Requires multiprocessing.shared_memory and pickle protocol 5
+    return sys.version_info >= (3, 8)
+
+
+# The LazyList being evaluated by a worker process of imap_parallel
+_WORKER_LAZY_LIST = None
+
+
+def _set_worker_lazy_list(lazy_list):
+    global _WORKER_LAZY_LIST
+    _WORKER_LAZY_LIST = lazy_list
+
+
+def _invoke_range(lazy_list, start, stop, to_shared_memory=False):
+    r"""
+    Evaluate the items ``[start, stop)`` of ``lazy_list`` (or the list of the
+    worker process, if ``None``), optionally via :func:`_to_shared_memory`.
+    """
+    if lazy_list is None:
+        lazy_list = _WORKER_LAZY_LIST
+    items = [lazy_list[i] for i in range(start, stop)]
+    if to_shared_memory:
+        items = [_to_shared_memory(item) for item in items]
+    return items
+
+
+def _to_shared_memory(item):
+    r"""
+    In a worker process, pickle ``item`` with its large buffers (e.g. the
+    pixels of images) placed in shared memory blocks, see
+    :func:`_from_shared_memory`.
+    """
+    import pickle
+    from multiprocessing import shared_memory
+    buffers = []
+
+    def out_of_band(buffer):
+        # a false return value places the buffer out-of-band
+        if buffer.raw().nbytes < _SHARED_MEMORY_MIN_BYTES:
+            return True
+        buffers.append(buffer)
+
+    data = pickle.dumps(item, protocol=5, buffer_callback=out_of_band)
+    blocks = []
+    for buffer in buffers:
+        raw = buffer.raw()
+        shm = shared_memory.SharedMemory(create=True, size=raw.nbytes)
+        shm.buf[:raw.nbytes] = raw
+        blocks.append((shm.name, raw.nbytes))
+        shm.close()
+    return data, blocks
+
+
+def _from_shared_memory(result):
+    r"""
+    Rebuild a result of :func:`_to_shared_memory` without copying. The
+    arrays of the result are views on to the shared memory blocks. Each
+    block is unlinked as soon as it is mapped, and is unmapped once the last
+    array that uses it is garbage collected.
+    """
+    import pickle
+    import weakref
+    import numpy as np
+    from multiprocessing import shared_memory
+    data, blocks = result
+    buffers = []
+    try:
+        for i, (name, n_bytes) in enumerate(blocks):
+            shm = shared_memory.SharedMemory(name=name)
+            shm.unlink()
+            # np.frombuffer does not hold an export of shm.buf, so the block
+            # can be closed as soon as this array (and so every view of it)
+            # is collected
+            buffer = np.frombuffer(shm.buf, dtype=np.uint8, count=n_bytes)
+            weakref.finalize(buffer, shm.close)
+            buffers.append(buffer)
+    except BaseException:
+        _unlink_shared_memory((data, blocks[i + 1:]))
+        raise
+    return pickle.loads(data, buffers=buffers)
+
+
+def _unlink_shared_memory(result):
+    r"""
+    Free the shared memory blocks of a result of :func:`_to_shared_memory`
+    that is never going to be rebuilt.
+    """
+    from multiprocessing import shared_memory
+    for name, _ in result[1]:
+        try:
+            shm = shared_memory.SharedMemory(name=name)
+        except FileNotFoundError:
+            continue
+        shm.close()
+        shm.unlink()
+
+
+def _unlink_shared_memory_chunk(chunk):
+    for item in chunk:
+        _unlink_shared_memory(item)
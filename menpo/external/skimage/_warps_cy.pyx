@@ -95,7 +95,7 @@ def _warp_fast(IMAGE_TYPES[:, :] image, cnp.ndarray H, output_shape=None,
     cdef char mode_c = ord(mode[0].upper())
 
     cdef IMAGE_TYPES (*interp_func)(IMAGE_TYPES*, Py_ssize_t, Py_ssize_t,
-                                    double, double, char, double)
+                                    double, double, char, double) nogil
     if order == 0:
         interp_func = nearest_neighbour_interpolation
     elif order == 1:
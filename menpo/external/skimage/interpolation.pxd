@@ -13,7 +13,7 @@ ctypedef fused IMAGE_TYPES:
     np.uint16_t
 
 
-cdef inline Py_ssize_t round(IMAGE_TYPES r):
+cdef inline Py_ssize_t round(IMAGE_TYPES r) nogil:
     return <Py_ssize_t>((r + 0.5) if (r > 0.0) else (r - 0.5))
 
 
@@ -23,7 +23,7 @@ cdef inline IMAGE_TYPES nearest_neighbour_interpolation(IMAGE_TYPES* image,
                                                         double r,
                                                         double c,
                                                         char mode,
-                                                        double cval):
+                                                        double cval) nogil:
     """Nearest neighbour interpolation at a given position in the image.
 
     Parameters
@@ -52,7 +52,7 @@ cdef inline IMAGE_TYPES bilinear_interpolation(IMAGE_TYPES* image,
                                                Py_ssize_t rows,
                                                Py_ssize_t cols,
                                                double r, double c,
-                                               char mode, double cval):
+                                               char mode, double cval) nogil:
     """Bilinear interpolation at a given position in the image.
 
     Parameters
@@ -91,7 +91,7 @@ cdef inline IMAGE_TYPES bilinear_interpolation(IMAGE_TYPES* image,
     return <IMAGE_TYPES>((1 - dr) * top + dr * bottom)
 
 
-cdef inline double quadratic_interpolation(double x, double[3] f):
+cdef inline double quadratic_interpolation(double x, double[3] f) nogil:
     """Quadratic interpolation.
 
     Parameters
@@ -113,7 +113,7 @@ cdef inline IMAGE_TYPES biquadratic_interpolation(IMAGE_TYPES* image,
                                                   Py_ssize_t rows,
                                                   Py_ssize_t cols,
                                                   double r, double c,
-                                                  char mode, double cval):
+                                                  char mode, double cval) nogil:
     """Biquadratic interpolation at a given position in the image.
 
     Parameters
@@ -164,7 +164,7 @@ cdef inline IMAGE_TYPES biquadratic_interpolation(IMAGE_TYPES* image,
     return <IMAGE_TYPES>quadratic_interpolation(xr, fr)
 
 
-cdef inline double cubic_interpolation(double x, double[4] f):
+cdef inline double cubic_interpolation(double x, double[4] f) nogil:
     """Cubic interpolation.
 
     Parameters
@@ -189,7 +189,7 @@ cdef inline double cubic_interpolation(double x, double[4] f):
 cdef inline IMAGE_TYPES bicubic_interpolation(IMAGE_TYPES* image,
                                               Py_ssize_t rows, Py_ssize_t cols,
                                               double r, double c,
-                                              char mode, double cval):
+                                              char mode, double cval) nogil:
     """Bicubic interpolation at a given position in the image.
 
     Parameters
@@ -238,7 +238,7 @@ cdef inline IMAGE_TYPES bicubic_interpolation(IMAGE_TYPES* image,
 
 cdef inline IMAGE_TYPES get_pixel2d(IMAGE_TYPES* image, Py_ssize_t rows,
                                     Py_ssize_t cols, Py_ssize_t r, Py_ssize_t c,
-                                    char mode, double cval):
+                                    char mode, double cval) nogil:
     """Get a pixel from the image, taking wrapping mode into consideration.
 
     Parameters
@@ -268,7 +268,7 @@ cdef inline IMAGE_TYPES get_pixel2d(IMAGE_TYPES* image, Py_ssize_t rows,
         return image[coord_map(rows, r, mode) * cols + coord_map(cols, c, mode)]
 
 
-cdef inline Py_ssize_t coord_map(Py_ssize_t dim, Py_ssize_t coord, char mode):
+cdef inline Py_ssize_t coord_map(Py_ssize_t dim, Py_ssize_t coord, char mode) nogil:
     """
     Wrap a coordinate, according to a given mode.
 
@@ -1,3 +1,4 @@
 from .base import Image, ImageBoundaryError
 from .boolean import BooleanImage
 from .masked import MaskedImage, OutOfMaskSampleError
+from .warp import warp_images, WarpPlan
@@ -0,0 +1,185 @@
+import numpy as np
+cimport numpy as np
+cimport cython
+from libc.math cimport floor
+
+from menpo.external.skimage.interpolation cimport (
+    nearest_neighbour_interpolation, bilinear_interpolation,
+    biquadratic_interpolation, bicubic_interpolation)
+
+
+ctypedef fused IMAGE_TYPES:
+    float
+    double
+    np.uint8_t
+    np.uint16_t
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+cdef void _sample_2d(const IMAGE_TYPES[:, :, :] pixels,
+                     const double[:, :] points,
+                     IMAGE_TYPES[:, :] out,
+                     Py_ssize_t start, Py_ssize_t stop, int order,
+                     bint nearest, IMAGE_TYPES cval) nogil:
+    cdef Py_ssize_t n_channels = pixels.shape[0]
+    cdef Py_ssize_t height = pixels.shape[1], width = pixels.shape[2]
+    cdef Py_ssize_t i, c, r0, r1, c0, c1
+    cdef double y, x, fy, fx, v
+
+    for i in range(start, stop):
+        y = points[i, 0]
+        x = points[i, 1]
+        if nearest:
+            # Clamp in to the image (the negated tests also catch nan)
+            if not y >= 0:
+                y = 0
+            elif y > height - 1:
+                y = height - 1
+            if not x >= 0:
+                x = 0
+            elif x > width - 1:
+                x = width - 1
+        elif not (0 <= y <= height - 1 and 0 <= x <= width - 1):
+            for c in range(n_channels):
+                out[c, i] = cval
+            continue
+
+        if order == 0:
+            r0 = <Py_ssize_t> floor(y + 0.5)
+            c0 = <Py_ssize_t> floor(x + 0.5)
+            for c in range(n_channels):
+                out[c, i] = pixels[c, r0, c0]
+        else:
+            r0 = <Py_ssize_t> floor(y)
+            c0 = <Py_ssize_t> floor(x)
+            fy = y - r0
+            fx = x - c0
+            r1 = r0 + 1 if r0 < height - 1 else r0
+            c1 = c0 + 1 if c0 < width - 1 else c0
+            for c in range(n_channels):
+                v = ((1 - fy) * ((1 - fx) * pixels[c, r0, c0] +
+                                 fx * pixels[c, r0, c1]) +
+                     fy * ((1 - fx) * pixels[c, r1, c0] +
+                           fx * pixels[c, r1, c1]))
+                if IMAGE_TYPES is float or IMAGE_TYPES is double:
+                    out[c, i] = <IMAGE_TYPES> v
+                else:
+                    # Round to nearest, as scipy does for integer output
+                    out[c, i] = <IMAGE_TYPES> (v + 0.5)
+
+
+cdef void _sample_2d_nogil(const IMAGE_TYPES[:, :, :] pixels,
+                           const double[:, :] points, IMAGE_TYPES[:, :] out,
+                           Py_ssize_t start, Py_ssize_t stop, int order,
+                           bint nearest, double cval):
+    cdef IMAGE_TYPES cval_t = <IMAGE_TYPES> cval
+    with nogil:
+        _sample_2d(pixels, points, out, start, stop, order, nearest, cval_t)
+
+
+def sample_2d(np.ndarray pixels, const double[:, :] points, np.ndarray out,
+              Py_ssize_t start, Py_ssize_t stop, int order, bint nearest,
+              double cval):
+    r"""
+    Sample every channel of ``pixels`` at ``points[start:stop]`` with nearest
+    neighbour (``order=0``) or bilinear (``order=1``) interpolation, writing
+    the result in to ``out[:, start:stop]``. ``out`` must be of the same
+    dtype as ``pixels``. The GIL is released whilst sampling, so disjoint
+    ranges of points can be sampled concurrently.
+    """
+    # Cython can't dispatch a def function on read-only (const) fused
+    # memoryviews, so dispatch on the dtype manually
+    if pixels.dtype != out.dtype:
+        raise ValueError('pixels and out must share a dtype '
+                         '({} and {} provided)'.format(pixels.dtype,
+                                                       out.dtype))
+    if pixels.dtype == np.float32:
+        _sample_2d_nogil[float](pixels, points, out, start, stop, order,
+                                nearest, cval)
+    elif pixels.dtype == np.float64:
+        _sample_2d_nogil[double](pixels, points, out, start, stop, order,
+                                 nearest, cval)
+    elif pixels.dtype == np.uint8:
+        _sample_2d_nogil[np.uint8_t](pixels, points, out, start, stop, order,
+                                     nearest, cval)
+    elif pixels.dtype == np.uint16:
+        _sample_2d_nogil[np.uint16_t](pixels, points, out, start, stop,
+                                      order, nearest, cval)
+    else:
+        raise ValueError('Unsupported dtype {}'.format(pixels.dtype))
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+cdef void _warp_rows(const IMAGE_TYPES[:, :, ::1] pixels,
+                     const double[:, ::1] H, IMAGE_TYPES[:, :, ::1] out,
+                     Py_ssize_t start, Py_ssize_t stop, int order, char mode,
+                     double cval) nogil:
+    cdef Py_ssize_t n_channels = pixels.shape[0]
+    cdef Py_ssize_t rows = pixels.shape[1], cols = pixels.shape[2]
+    cdef Py_ssize_t out_c = out.shape[2], size = rows * cols
+    cdef Py_ssize_t tfr, tfc, ch
+    cdef double r, c, zz
+    cdef IMAGE_TYPES* image = <IMAGE_TYPES*> &pixels[0, 0, 0]
+
+    for tfr in range(start, stop):
+        for tfc in range(out_c):
+            # The transform is shared by every channel - only apply it once
+            zz = H[2, 0] * tfc + H[2, 1] * tfr + H[2, 2]
+            c = (H[0, 0] * tfc + H[0, 1] * tfr + H[0, 2]) / zz
+            r = (H[1, 0] * tfc + H[1, 1] * tfr + H[1, 2]) / zz
+            for ch in range(n_channels):
+                if order == 0:
+                    out[ch, tfr, tfc] = nearest_neighbour_interpolation(
+                        image + ch * size, rows, cols, r, c, mode, cval)
+                elif order == 1:
+                    out[ch, tfr, tfc] = bilinear_interpolation(
+                        image + ch * size, rows, cols, r, c, mode, cval)
+                elif order == 2:
+                    out[ch, tfr, tfc] = biquadratic_interpolation(
+                        image + ch * size, rows, cols, r, c, mode, cval)
+                else:
+                    out[ch, tfr, tfc] = bicubic_interpolation(
+                        image + ch * size, rows, cols, r, c, mode, cval)
+
+
+cdef void _warp_rows_nogil(const IMAGE_TYPES[:, :, ::1] pixels,
+                           const double[:, ::1] H, IMAGE_TYPES[:, :, ::1] out,
+                           Py_ssize_t start, Py_ssize_t stop, int order,
+                           char mode, double cval):
+    with nogil:
+        _warp_rows(pixels, H, out, start, stop, order, mode, cval)
+
+
+def warp_2d(np.ndarray pixels, np.ndarray H, np.ndarray out, Py_ssize_t start,
+            Py_ssize_t stop, int order, char mode, double cval):
+    r"""
+    Warp every channel of the C-contiguous ``pixels`` through the
+    ``(3, 3)`` homography ``H`` (mapping ``(x, y)`` output coordinates to
+    input coordinates), writing rows ``start:stop`` of the C-contiguous
+    ``out`` (of the same dtype). The interpolation (``order`` in [0, 3]) and
+    boundary ``mode`` (one of ``b'C'``, ``b'N'``, ``b'R'`` or ``b'W'``)
+    match ``_warp_fast``. The GIL is released whilst warping, so disjoint
+    ranges of rows can be warped concurrently.
+    """
+    if pixels.dtype != out.dtype:
+        raise ValueError('pixels and out must share a dtype '
+                         '({} and {} provided)'.format(pixels.dtype,
+                                                       out.dtype))
+    if pixels.dtype == np.float32:
+        _warp_rows_nogil[float](pixels, H, out, start, stop, order, mode,
+                                cval)
+    elif pixels.dtype == np.float64:
+        _warp_rows_nogil[double](pixels, H, out, start, stop, order, mode,
+                                 cval)
+    elif pixels.dtype == np.uint8:
+        _warp_rows_nogil[np.uint8_t](pixels, H, out, start, stop, order,
+                                     mode, cval)
+    elif pixels.dtype == np.uint16:
+        _warp_rows_nogil[np.uint16_t](pixels, H, out, start, stop, order,
+                                      mode, cval)
+    else:
+        raise ValueError('Unsupported dtype {}'.format(pixels.dtype))
@@ -1,6 +1,7 @@
 from __future__ import division
 from warnings import warn
 from collections import Iterable
+from functools import partial
 
 import numpy as np
 import PIL.Image as PILImage
@@ -9,13 +10,13 @@ from menpo.compatibility import basestring
 from menpo.base import (Vectorizable, MenpoDeprecationWarning,
                         copy_landmarks_and_path)
 from menpo.shape import PointCloud, bounding_box
-from menpo.landmark import Landmarkable
+from menpo.landmark import Landmarkable, LandmarkManager
 from menpo.transform import (Translation, NonUniformScale, Rotation,
                              AlignmentUniformScale, Affine, scale_about_centre,
                              transform_about_centre)
 from menpo.visualize.base import ImageViewer, LandmarkableViewable, Viewable
 
-from .interpolation import scipy_interpolation, cython_interpolation
+from .interpolation import cython_point_interpolation, cython_interpolation
 from .patches import extract_patches, set_patches
 
 
@@ -1119,12 +1120,23 @@ class Image(Vectorizable, Landmarkable, Viewable, LandmarkableViewable):
             axes_y_limits, axes_x_ticks, axes_y_ticks, figure_size)
 
     def crop(self, min_indices, max_indices, constrain_to_boundary=False,
-             return_transform=False):
+             return_transform=False, copy=True):
         r"""
         Return a cropped copy of this image using the given minimum and
         maximum indices. Landmarks are correctly adjusted so they maintain
         their position relative to the newly cropped image.
 
+        If ``copy=False``, the pixels of the cropped image are instead a view
+        on to the pixels of this image, so no pixels are copied whatever the
+        size of the crop. Nor are the landmarks: the view only holds on to
+        the landmark groups of this image, and copies and translates them
+        when its landmarks are first accessed. Groups that are later set on
+        (or removed from) this image do not affect the view, but the points
+        of the groups must not be modified in place until then. Note that
+        the pixels of a view are not C-contiguous and that writing to them
+        changes this image - call :meth:`copy` on the view for an independent
+        image.
+
         Parameters
         ----------
         min_indices : ``(n_dims,)`` `ndarray`
@@ -1138,6 +1150,9 @@ class Image(Vectorizable, Landmarkable, Viewable, LandmarkableViewable):
         return_transform : `bool`, optional
             If ``True``, then the :map:`Transform` object that was used to
             perform the cropping is also returned.
+        copy : `bool`, optional
+            If ``False``, the pixels of the cropped image are a view on to the
+            pixels of this image.
 
         Returns
         -------
@@ -1175,14 +1190,54 @@ class Image(Vectorizable, Landmarkable, Viewable, LandmarkableViewable):
             raise ImageBoundaryError(min_indices, max_indices,
                                      min_bounded, max_bounded)
 
+        if not copy:
+            return self._crop_view(min_bounded, max_bounded,
+                                   return_transform=return_transform)
         new_shape = (max_bounded - min_bounded).astype(np.int)
         return self.warp_to_shape(new_shape, Translation(min_bounded), order=0,
                                   warp_landmarks=True,
                                   return_transform=return_transform)
 
+    def _crop_view(self, min_indices, max_indices, return_transform=False):
+        r"""
+        The in-bounds crop between the integer ``min_indices`` and
+        ``max_indices`` as a view on to this image. See :meth:`crop`.
+        """
+        transform = Translation(min_indices)
+        cropped = self._view_region(tuple(
+            slice(int(a), int(b)) for a, b in zip(min_indices, max_indices)))
+        if self.has_landmarks:
+            # Capture the landmark groups (not this image, nor copies of
+            # their points) so that the view neither keeps the whole of this
+            # image alive nor sees groups later set on this image
+            cropped._set_landmarks_lazily(partial(
+                _transformed_landmarks,
+                self.landmarks._landmark_groups.copy(),
+                transform.pseudoinverse()))
+        if hasattr(self, 'path'):
+            cropped.path = self.path
+        if return_transform:
+            return cropped, transform
+        else:
+            return cropped
+
+    def _view_region(self, slices):
+        r"""
+        A new instance of ``type(self)``, without landmarks, whose pixels are
+        a view on to the region of this image given by ``slices`` (one per
+        spatial dimension). Overridden by :map:`MaskedImage` to also take a
+        view of the mask.
+        """
+        # Bypass the constructor - it would make the (non C-contiguous)
+        # pixels contiguous
+        view = self.__class__.__new__(self.__class__)
+        Landmarkable.__init__(view)
+        view.pixels = self.pixels[(slice(None),) + tuple(slices)]
+        return view
+
     def crop_to_pointcloud(self, pointcloud, boundary=0,
                            constrain_to_boundary=True,
-                           return_transform=False):
+                           return_transform=False, copy=True):
         r"""
         Return a copy of this image cropped so that it is bounded around a
         pointcloud with an optional ``n_pixel`` boundary.
@@ -1200,6 +1255,9 @@ class Image(Vectorizable, Landmarkable, Viewable, LandmarkableViewable):
         return_transform : `bool`, optional
             If ``True``, then the :map:`Transform` object that was used to
             perform the cropping is also returned.
+        copy : `bool`, optional
+            If ``False``, the pixels of the cropped image are a view on to the
+            pixels of this image (see :meth:`crop`).
 
         Returns
         -------
@@ -1218,11 +1276,11 @@ class Image(Vectorizable, Landmarkable, Viewable, LandmarkableViewable):
         min_indices, max_indices = pointcloud.bounds(boundary=boundary)
         return self.crop(min_indices, max_indices,
                          constrain_to_boundary=constrain_to_boundary,
-                         return_transform=return_transform)
+                         return_transform=return_transform, copy=copy)
 
     def crop_to_landmarks(self, group=None, boundary=0,
                           constrain_to_boundary=True,
-                          return_transform=False):
+                          return_transform=False, copy=True):
         r"""
         Return a copy of this image cropped so that it is bounded around a set
         of landmarks with an optional ``n_pixel`` boundary
@@ -1241,6 +1299,9 @@ class Image(Vectorizable, Landmarkable, Viewable, LandmarkableViewable):
         return_transform : `bool`, optional
             If ``True``, then the :map:`Transform` object that was used to
             perform the cropping is also returned.
+        copy : `bool`, optional
+            If ``False``, the pixels of the cropped image are a view on to the
+            pixels of this image (see :meth:`crop`).
 
         Returns
         -------
@@ -1259,12 +1320,12 @@ class Image(Vectorizable, Landmarkable, Viewable, LandmarkableViewable):
         pc = self.landmarks[group]
         return self.crop_to_pointcloud(
             pc, boundary=boundary, constrain_to_boundary=constrain_to_boundary,
-            return_transform=return_transform)
+            return_transform=return_transform, copy=copy)
 
     def crop_to_pointcloud_proportion(self, pointcloud, boundary_proportion,
                                       minimum=True,
                                       constrain_to_boundary=True,
-                                      return_transform=False):
+                                      return_transform=False, copy=True):
         r"""
         Return a copy of this image cropped so that it is bounded around a
         pointcloud with an optional ``n_pixel`` boundary.
@@ -1289,6 +1350,9 @@ class Image(Vectorizable, Landmarkable, Viewable, LandmarkableViewable):
         return_transform : `bool`, optional
             If ``True``, then the :map:`Transform` object that was used to
             perform the cropping is also returned.
+        copy : `bool`, optional
+            If ``False``, the pixels of the cropped image are a view on to the
+            pixels of this image (see :meth:`crop`).
 
         Returns
         -------
@@ -1312,12 +1376,12 @@ class Image(Vectorizable, Landmarkable, Viewable, LandmarkableViewable):
         return self.crop_to_pointcloud(
             pointcloud, boundary=boundary,
             constrain_to_boundary=constrain_to_boundary,
-            return_transform=return_transform)
+            return_transform=return_transform, copy=copy)
 
     def crop_to_landmarks_proportion(self, boundary_proportion,
                                      group=None, minimum=True,
                                      constrain_to_boundary=True,
-                                     return_transform=False):
+                                     return_transform=False, copy=True):
         r"""
         Crop this image to be bounded around a set of landmarks with a
         border proportional to the landmark spread or range.
@@ -1343,6 +1407,9 @@ class Image(Vectorizable, Landmarkable, Viewable, LandmarkableViewable):
         return_transform : `bool`, optional
             If ``True``, then the :map:`Transform` object that was used to
             perform the cropping is also returned.
+        copy : `bool`, optional
+            If ``False``, the pixels of the cropped image are a view on to the
+            pixels of this image (see :meth:`crop`).
 
         Returns
         -------
@@ -1363,7 +1430,7 @@ class Image(Vectorizable, Landmarkable, Viewable, LandmarkableViewable):
         return self.crop_to_pointcloud_proportion(
             pc, boundary_proportion, minimum=minimum,
             constrain_to_boundary=constrain_to_boundary,
-            return_transform=return_transform)
+            return_transform=return_transform, copy=copy)
 
     def constrain_points_to_bounds(self, points):
         r"""
@@ -1615,7 +1682,7 @@ class Image(Vectorizable, Landmarkable, Viewable, LandmarkableViewable):
 
     def warp_to_mask(self, template_mask, transform, warp_landmarks=True,
                      order=1, mode='constant', cval=0.0, batch_size=None,
-                     return_transform=False):
+                     return_transform=False, plan=None, workers=1):
         r"""
         Return a copy of this image warped into a different reference space.
 
@@ -1664,6 +1731,15 @@ class Image(Vectorizable, Landmarkable, Viewable, LandmarkableViewable):
         return_transform : `bool`, optional
             This argument is for internal use only. If ``True``, then the
             :map:`Transform` object is also returned.
+        plan : :map:`WarpPlan`, optional
+            A plan built for ``template_mask``. The template points (and, for
+            a piecewise affine transform, the triangle containment of each
+            point) are then taken from the plan rather than being recomputed
+            for every warp.
+        workers : `int`, optional
+            The number of threads to sample the template points with. Only
+            used for large templates with nearest neighbour or bilinear
+            interpolation.
 
         Returns
         -------
@@ -1677,11 +1753,21 @@ class Image(Vectorizable, Landmarkable, Viewable, LandmarkableViewable):
             raise ValueError(
                 "Trying to warp a {}D image with a {}D transform "
                 "(they must match)".format(self.n_dims, transform.n_dims))
-        template_points = template_mask.true_indices()
-        points_to_sample = transform.apply(template_points,
-                                           batch_size=batch_size)
-        sampled = self.sample(points_to_sample,
-                              order=order, mode=mode, cval=cval)
+        if plan is None:
+            template_points = template_mask.true_indices()
+            points_to_sample = transform.apply(template_points,
+                                               batch_size=batch_size)
+        else:
+            if not plan._fits_mask(template_mask):
+                raise ValueError(
+                    "The plan was not built for this template mask (the plan "
+                    "samples {} points of a template of shape {}, the mask "
+                    "has {} True points and is of shape {})".format(
+                        plan.n_points, plan.template_shape,
+                        template_mask.n_true(), template_mask.shape))
+            points_to_sample = plan.apply(transform, batch_size=batch_size)
+        sampled = self.sample(points_to_sample, order=order, mode=mode,
+                              cval=cval, workers=workers)
 
         # set any nan values to 0
         sampled[np.isnan(sampled)] = 0
@@ -1719,7 +1805,8 @@ class Image(Vectorizable, Landmarkable, Viewable, LandmarkableViewable):
         warped_image._from_vector_inplace(sampled_pixel_values.ravel())
         return warped_image
 
-    def sample(self, points_to_sample, order=1, mode='constant', cval=0.0):
+    def sample(self, points_to_sample, order=1, mode='constant', cval=0.0,
+               workers=1):
         r"""
         Sample this image at the given sub-pixel accurate points. The input
         PointCloud should have the same number of dimensions as the image e.g.
@@ -1741,6 +1828,10 @@ class Image(Vectorizable, Landmarkable, Viewable, LandmarkableViewable):
         cval : `float`, optional
             Used in conjunction with mode ``constant``, the value outside
             the image boundaries.
+        workers : `int`, optional
+            The number of threads to split the points between. Only used for
+            large numbers of points with nearest neighbour or bilinear
+            interpolation.
 
         Returns
         -------
@@ -1752,12 +1843,13 @@ class Image(Vectorizable, Landmarkable, Viewable, LandmarkableViewable):
         # 'special case' and not document the ndarray ability.
         if isinstance(points_to_sample, PointCloud):
             points_to_sample = points_to_sample.points
-        return scipy_interpolation(self.pixels, points_to_sample,
-                                   order=order,  mode=mode, cval=cval)
+        return cython_point_interpolation(self.pixels, points_to_sample,
+                                          order=order, mode=mode, cval=cval,
+                                          workers=workers)
 
     def warp_to_shape(self, template_shape, transform, warp_landmarks=True,
                       order=1, mode='constant', cval=0.0, batch_size=None,
-                      return_transform=False):
+                      return_transform=False, workers=1):
         """
         Return a copy of this image warped into a different reference space.
 
@@ -1803,6 +1895,10 @@ class Image(Vectorizable, Landmarkable, Viewable, LandmarkableViewable):
         return_transform : `bool`, optional
             This argument is for internal use only. If ``True``, then the
             :map:`Transform` object is also returned.
+        workers : `int`, optional
+            The number of threads to warp with. Only used for large 2D affine
+            warps (of order at most 3), and for large templates sampled with
+            nearest neighbour or bilinear interpolation.
 
         Returns
         -------
@@ -1841,13 +1937,15 @@ class Image(Vectorizable, Landmarkable, Viewable, LandmarkableViewable):
             # interpolation for 2D affine warps - let's use that
             sampled = cython_interpolation(self.pixels, template_shape,
                                            transform, order=order,
-                                           mode=mode, cval=cval)
+                                           mode=mode, cval=cval,
+                                           workers=workers)
         else:
             template_points = indices_for_image_of_shape(template_shape)
             points_to_sample = transform.apply(template_points,
                                                batch_size=batch_size)
             sampled = self.sample(points_to_sample,
-                                  order=order, mode=mode, cval=cval)
+                                  order=order, mode=mode, cval=cval,
+                                  workers=workers)
 
         # set any nan values to 0
         sampled[np.isnan(sampled)] = 0
@@ -1879,7 +1977,7 @@ class Image(Vectorizable, Landmarkable, Viewable, LandmarkableViewable):
             return warped_image
 
     def rescale(self, scale, round='ceil', order=1,
-                return_transform=False):
+                return_transform=False, workers=1):
         r"""
         Return a copy of this image, rescaled by a given factor.
         Landmarks are rescaled appropriately.
@@ -1909,6 +2007,8 @@ class Image(Vectorizable, Landmarkable, Viewable, LandmarkableViewable):
         return_transform : `bool`, optional
             If ``True``, then the :map:`Transform` object that was used to
             perform the rescale is also returned.
+        workers : `int`, optional
+            The number of threads to warp with. See :meth:`warp_to_shape`.
 
         Returns
         -------
@@ -1962,7 +2062,8 @@ class Image(Vectorizable, Landmarkable, Viewable, LandmarkableViewable):
         return self.warp_to_shape(template_shape, inverse_transform,
                                   warp_landmarks=True, order=order,
                                   mode='nearest',
-                                  return_transform=return_transform)
+                                  return_transform=return_transform,
+                                  workers=workers)
 
     def rescale_to_diagonal(self, diagonal, round='ceil',
                             return_transform=False):
@@ -2089,7 +2190,7 @@ class Image(Vectorizable, Landmarkable, Viewable, LandmarkableViewable):
         return self.rescale(scale, round=round, order=order,
                             return_transform=return_transform)
 
-    def resize(self, shape, order=1, return_transform=False):
+    def resize(self, shape, order=1, return_transform=False, workers=1):
         r"""
         Return a copy of this image, resized to a particular shape.
         All image information (landmarks, and mask in the case of
@@ -2116,6 +2217,8 @@ class Image(Vectorizable, Landmarkable, Viewable, LandmarkableViewable):
         return_transform : `bool`, optional
             If ``True``, then the :map:`Transform` object that was used to
             perform the resize is also returned.
+        workers : `int`, optional
+            The number of threads to warp with. See :meth:`warp_to_shape`.
 
         Returns
         -------
@@ -2143,9 +2246,10 @@ class Image(Vectorizable, Landmarkable, Viewable, LandmarkableViewable):
         # we get (250, 250) even if the number we obtain is 250 to some
         # floating point inaccuracy.
         return self.rescale(scales, round='round', order=order,
-                            return_transform=return_transform)
+                            return_transform=return_transform,
+                            workers=workers)
 
-    def zoom(self, scale, cval=0.0, return_transform=False):
+    def zoom(self, scale, cval=0.0, return_transform=False, workers=1):
         r"""
         Return a copy of this image, zoomed about the centre point. ``scale``
         values greater than 1.0 denote zooming **in** to the image and values
@@ -2165,6 +2269,8 @@ class Image(Vectorizable, Landmarkable, Viewable, LandmarkableViewable):
         return_transform : `bool`, optional
             If ``True``, then the :map:`Transform` object that was used to
             perform the zooming is also returned.
+        workers : `int`, optional
+            The number of threads to warp with. See :meth:`warp_to_shape`.
 
         Returns
         -------
@@ -2176,11 +2282,12 @@ class Image(Vectorizable, Landmarkable, Viewable, LandmarkableViewable):
         """
         t = scale_about_centre(self, 1.0 / scale)
         return self.warp_to_shape(self.shape, t, cval=cval,
-                                  return_transform=return_transform)
+                                  return_transform=return_transform,
+                                  workers=workers)
 
     def rotate_ccw_about_centre(self, theta, degrees=True, retain_shape=False,
                                 cval=0.0, round='round', order=1,
-                                return_transform=False):
+                                return_transform=False, workers=1):
         r"""
         Return a copy of this image, rotated counter-clockwise about its centre.
 
@@ -2226,6 +2333,8 @@ class Image(Vectorizable, Landmarkable, Viewable, LandmarkableViewable):
         return_transform : `bool`, optional
             If ``True``, then the :map:`Transform` object that was used to
             perform the rotation is also returned.
+        workers : `int`, optional
+            The number of threads to warp with. See :meth:`warp_to_shape`.
 
         Returns
         -------
@@ -2247,11 +2356,12 @@ class Image(Vectorizable, Landmarkable, Viewable, LandmarkableViewable):
         rotation = Rotation.init_from_2d_ccw_angle(theta, degrees=degrees)
         return self.transform_about_centre(rotation, retain_shape=retain_shape,
                                            cval=cval, round=round, order=order,
-                                           return_transform=return_transform)
+                                           return_transform=return_transform,
+                                           workers=workers)
 
     def transform_about_centre(self, transform, retain_shape=False,
                                cval=0.0, round='round', order=1,
-                               return_transform=False):
+                               return_transform=False, workers=1):
         r"""
         Return a copy of this image, transformed about its centre.
 
@@ -2308,6 +2418,8 @@ class Image(Vectorizable, Landmarkable, Viewable, LandmarkableViewable):
         return_transform : `bool`, optional
             If ``True``, then the :map:`Transform` object that was used to
             perform the shearing is also returned.
+        workers : `int`, optional
+            The number of threads to warp with. See :meth:`warp_to_shape`.
 
         Returns
         -------
@@ -2399,7 +2511,8 @@ class Image(Vectorizable, Landmarkable, Viewable, LandmarkableViewable):
         # Warp image
         return self.warp_to_shape(
             shape, applied_transform.pseudoinverse(), order=order,
-            warp_landmarks=True, cval=cval, return_transform=return_transform)
+            warp_landmarks=True, cval=cval, return_transform=return_transform,
+            workers=workers)
 
     def mirror(self, axis=1, return_transform=False):
         r"""
@@ -2949,6 +3062,17 @@ class Image(Vectorizable, Landmarkable, Viewable, LandmarkableViewable):
             marker_edge_width=marker_edge_width, backend=backend)
 
 
+def _transformed_landmarks(groups, transform):
+    r"""
+    A new :map:`LandmarkManager` holding a copy of each of the landmark
+    ``groups``, transformed by ``transform``.
+    """
+    landmarks = LandmarkManager()
+    for group, pointcloud in groups.items():
+        landmarks._landmark_groups[group] = transform.apply(pointcloud)
+    return landmarks
+
+
 def round_image_shape(shape, round):
     if round not in ['ceil', 'round', 'floor']:
         raise ValueError('round must be either ceil, round or floor')
@@ -410,7 +410,8 @@ class BooleanImage(Image):
             boundary=boundary, constrain_to_bounds=constrain_to_bounds)
 
     # noinspection PyMethodOverriding
-    def sample(self, points_to_sample, mode='constant', cval=False, **kwargs):
+    def sample(self, points_to_sample, mode='constant', cval=False, workers=1,
+               **kwargs):
         r"""
         Sample this image at the given sub-pixel accurate points. The input
         PointCloud should have the same number of dimensions as the image e.g.
@@ -429,6 +430,9 @@ class BooleanImage(Image):
         cval : `float`, optional
             Used in conjunction with mode ``constant``, the value outside
             the image boundaries.
+        workers : `int`, optional
+            The number of threads to split the points between. Only used for
+            large numbers of points.
 
         Returns
         -------
@@ -437,12 +441,12 @@ class BooleanImage(Image):
         """
         # enforce the order as 0, as this is boolean data, then call super
         return Image.sample(self, points_to_sample, order=0, mode=mode,
-                            cval=cval)
+                            cval=cval, workers=workers)
 
     # noinspection PyMethodOverriding
     def warp_to_mask(self, template_mask, transform, warp_landmarks=True,
                      mode='constant', cval=False, batch_size=None,
-                     return_transform=False):
+                     return_transform=False, plan=None, workers=1):
         r"""
         Return a copy of this :map:`BooleanImage` warped into a different
         reference space.
@@ -478,6 +482,12 @@ class BooleanImage(Image):
         return_transform : `bool`, optional
             This argument is for internal use only. If ``True``, then the
             :map:`Transform` object is also returned.
+        plan : :map:`WarpPlan`, optional
+            A plan built for ``template_mask``, from which the template points
+            (and any cached piecewise affine data) are taken.
+        workers : `int`, optional
+            The number of threads to sample the template points with. Only
+            used for large templates.
 
         Returns
         -------
@@ -491,12 +501,12 @@ class BooleanImage(Image):
         return Image.warp_to_mask(
             self, template_mask, transform, warp_landmarks=warp_landmarks,
             order=0, mode=mode, cval=cval, batch_size=batch_size,
-            return_transform=return_transform)
+            return_transform=return_transform, plan=plan, workers=workers)
 
     # noinspection PyMethodOverriding
     def warp_to_shape(self, template_shape, transform, warp_landmarks=True,
                       mode='constant', cval=False, order=None,
-                      batch_size=None, return_transform=False):
+                      batch_size=None, return_transform=False, workers=1):
         """
         Return a copy of this :map:`BooleanImage` warped into a different
         reference space.
@@ -533,6 +543,10 @@ class BooleanImage(Image):
         return_transform : `bool`, optional
             This argument is for internal use only. If ``True``, then the
             :map:`Transform` object is also returned.
+        workers : `int`, optional
+            The number of threads to warp with. Only used for large 2D affine
+            warps (of order at most 3), and for large templates sampled with
+            nearest neighbour or bilinear interpolation.
 
         Returns
         -------
@@ -547,7 +561,7 @@ class BooleanImage(Image):
         warped = Image.warp_to_shape(self, template_shape, transform,
                                      warp_landmarks=warp_landmarks, order=0,
                                      mode=mode, cval=cval,
-                                     batch_size=batch_size)
+                                     batch_size=batch_size, workers=workers)
         # unfortunately we can't escape copying here, let BooleanImage
         # convert us to np.bool
         boolean_image = BooleanImage(warped.pixels.reshape(template_shape))
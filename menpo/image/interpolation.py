@@ -1,14 +1,47 @@
+from multiprocessing import cpu_count
+
 import numpy as np
 map_coordinates = None  # expensive, from scipy.ndimage
-from menpo.external.skimage._warps_cy import _warp_fast
+from menpo.base import _worker_pool
 from menpo.transform import Homogeneous
 
+from ._interpolation import sample_2d, warp_2d
+
+# The pixel types that the native sampler supports (bool is sampled as uint8)
+_SAMPLE_2D_DTYPES = {np.dtype(t) for t in (np.float32, np.float64, np.uint8,
+                                           np.uint16, np.bool_)}
+# Below this many output values per thread it is not worth starting threads
+_MIN_VALUES_PER_WORKER = 2 ** 16
+
 # Store out a transform that simply switches the x and y axis
 xy_yx = Homogeneous(np.array([[0., 1., 0.],
                               [1., 0., 0.],
                               [0., 0., 1.]]))
 
 
+def _split_between_threads(f, n_items, item_size, workers):
+    r"""
+    Call ``f(start, stop)`` on contiguous ranges that together cover
+    ``range(n_items)``, splitting them between up to ``workers`` threads
+    (or the number of CPUs if ``None``). ``f`` must release the GIL to
+    benefit. Each thread is given at least ``_MIN_VALUES_PER_WORKER`` values,
+    where each item is made up of ``item_size`` values.
+    """
+    if workers is None:
+        workers = cpu_count()
+    workers = max(min(workers,
+                      n_items * item_size // _MIN_VALUES_PER_WORKER), 1)
+    if workers == 1:
+        f(0, n_items)
+        return
+    bounds = np.linspace(0, n_items, workers + 1).astype(np.int64)
+    pool = _worker_pool(workers)
+    try:
+        pool.map(lambda b: f(*b), list(zip(bounds[:-1], bounds[1:])))
+    finally:
+        pool.terminate()
+
+
 def scipy_interpolation(pixels, points_to_sample, mode='constant', order=1,
                         cval=0.):
     r"""
@@ -54,12 +87,79 @@ def scipy_interpolation(pixels, points_to_sample, mode='constant', order=1,
     return np.concatenate(sampled_pixel_values, axis=0)
 
 
+def cython_point_interpolation(pixels, points_to_sample, mode='constant',
+                               order=1, cval=0., workers=1):
+    r"""
+    Interpolation utilizing a native sampler for 2D images. Every channel is
+    sampled in a single pass over the points, the pixels are never upcast
+    (the result has the same dtype as ``pixels``) and the GIL is released
+    whilst sampling.
+
+    Only nearest neighbour and bilinear interpolation (``order`` 0 or 1) with
+    the ``constant`` or ``nearest`` modes of ``float32``, ``float64``,
+    ``uint8`` or ``uint16`` images (and nearest neighbour interpolation of
+    ``bool`` images) are supported natively - all other cases fall back to
+    :func:`scipy_interpolation`, which the result matches.
+
+    Parameters
+    ----------
+    pixels : ``(n_channels, M, N, ...)`` `ndarray`
+        The image to be sampled from, the first axis containing channel
+        information
+    points_to_sample : ``(n_points, n_dims)`` `ndarray`
+        The points which should be sampled from pixels
+    mode : ``{constant, nearest, reflect, wrap}``, optional
+        Points outside the boundaries of the input are filled according to the
+        given mode
+    order : `int,` optional
+        The order of the spline interpolation. The order has to be in the
+        range [0, 5].
+    cval : `float`, optional
+        The value that should be used for points that are sampled from
+        outside the image bounds if mode is ``constant``.
+    workers : `int`, optional
+        The number of threads to split the points between. Only used for
+        large numbers of points.
+
+    Returns
+    -------
+    sampled_image : ``(n_channels, n_points)`` `ndarray`
+        The pixel information sampled at each of the points.
+    """
+    if (pixels.ndim != 3 or points_to_sample.shape[1] != 2 or
+            order not in (0, 1) or mode not in ('constant', 'nearest') or
+            pixels.dtype not in _SAMPLE_2D_DTYPES or
+            (pixels.dtype == np.bool_ and order != 0)):
+        return scipy_interpolation(pixels, points_to_sample, mode=mode,
+                                   order=order, cval=cval)
+    is_bool = pixels.dtype == np.bool_
+    if is_bool:
+        pixels = pixels.view(np.uint8)
+        cval = float(bool(cval))
+    points = np.require(points_to_sample, dtype=np.float64)
+    n_points = points.shape[0]
+    out = np.empty((pixels.shape[0], n_points), dtype=pixels.dtype)
+    nearest = mode == 'nearest'
+
+    _split_between_threads(
+        lambda start, stop: sample_2d(pixels, points, out, start, stop,
+                                      order, nearest, cval),
+        n_points, out.shape[0], workers)
+    return out.view(np.bool_) if is_bool else out
+
+
 def cython_interpolation(pixels, template_shape, h_transform, mode='constant',
-                         order=1, cval=0.):
+                         order=1, cval=0., workers=1):
     r"""
-    Interpolation utilizing skimage fast cython warp function. This method
-    assumes that the warp takes the form of a homogeneous transform, and
-    thus is much faster for operations such as scaling.
+    Interpolation utilizing a fast Cython warp function (matching skimage's
+    ``_warp_fast``). This method assumes that the warp takes the form of a
+    homogeneous transform, and thus is much faster for operations such as
+    scaling.
+
+    Every channel is warped in a single pass, straight in to the result, and
+    ``bool``, ``uint8``, ``uint16``, ``float32`` and ``float64`` pixels are
+    warped without a cast. The GIL is released whilst warping, so large
+    warps can optionally be split by row between ``workers`` threads.
 
     Parameters
     ----------
@@ -73,38 +173,47 @@ def cython_interpolation(pixels, template_shape, h_transform, mode='constant',
         given mode.
     order : int, optional
         The order of the spline interpolation. The order has to be in the
-        range [0,5].
+        range [0,3].
     cval : `float`, optional
         The value that should be used for points that are sampled from
         outside the image bounds if mode is 'constant'
+    workers : `int`, optional
+        The maximum number of threads to warp with. If ``None``, the number
+        of CPUs is used. Small warps are always performed on one thread.
+        Note that callers which already warp many images concurrently should
+        leave this as ``1``.
 
     Returns
     -------
-    sampled_image : `ndarray`
+    sampled_image : ``(n_channels, n_template_pixels)`` `ndarray`
         The pixel information sampled at each of the points.
+
+    Raises
+    ------
+    ValueError
+        If the mode or order is invalid.
     """
+    if mode not in ('constant', 'wrap', 'reflect', 'nearest'):
+        raise ValueError("Invalid mode specified.  Please use "
+                         "`constant`, `nearest`, `wrap` or `reflect`.")
+    if order not in range(4):
+        raise ValueError('Order must be in the range [0, 3]')
     # unfortunately they consider xy -> yx
     matrix = xy_yx.compose_before(h_transform).compose_before(xy_yx).h_matrix
-    warped_channels = []
-    # Unfortunately, Cython does not seem to support the boolean numpy type,
-    # so I think we need to do the cast here. If we don't we lose support
-    # for warping BooleanImage.
-    # TODO: Can Cython support bool types? If so, skip this
-    if pixels.dtype == np.bool:
-        in_pixels = pixels.astype(np.uint8)
-    else:
-        in_pixels = pixels
-    # Loop over every channel in image - we know last axis is always channels
-    # Note that map_coordinates uses the opposite (dims, points) convention
-    # to us so we transpose
-    for i in range(pixels.shape[0]):
-        warped_channels.append(_warp_fast(in_pixels[i], matrix,
-                                          output_shape=template_shape,
-                                          mode=mode, order=order, cval=cval))
-    warped_channels = [v.reshape([1, -1]) for v in warped_channels]
-
-    result = np.concatenate(warped_channels, axis=0)
-    # As above, we need to convert the uint8 back to bool
-    if pixels.dtype == np.bool:
-        result = result.astype(np.bool)
-    return result
+    matrix = np.require(matrix, dtype=np.float64, requirements=['C'])
+    template_shape = tuple(int(s) for s in template_shape)
+    pixels = np.ascontiguousarray(pixels)
+    # Booleans are warped as their underlying bytes (which stay 0 or 1)
+    is_bool = pixels.dtype == np.bool
+    if is_bool:
+        pixels = pixels.view(np.uint8)
+        cval = float(bool(cval))
+    out = np.zeros((pixels.shape[0],) + template_shape, dtype=pixels.dtype)
+    mode_c = ord(mode[0].upper())
+
+    _split_between_threads(
+        lambda start, stop: warp_2d(pixels, matrix, out, start, stop, order,
+                                    mode_c, cval),
+        template_shape[0], out[0, 0].size * out.shape[0], workers)
+    out = out.reshape([out.shape[0], -1])
+    return out.view(np.bool) if is_bool else out
@@ -794,6 +794,15 @@ class MaskedImage(Image):
             axes_font_size, axes_font_style, axes_font_weight, axes_x_limits,
             axes_y_limits, axes_x_ticks, axes_y_ticks, figure_size)
 
+    def _view_region(self, slices):
+        r"""
+        As :meth:`Image._view_region`, but the mask is also a view on to the
+        same region of the mask of this image.
+        """
+        view = Image._view_region(self, slices)
+        view.mask = self.mask._view_region(slices)
+        return view
+
     def crop_to_true_mask(self, boundary=0, constrain_to_boundary=True,
                           return_transform=False):
         r"""
@@ -833,7 +842,8 @@ class MaskedImage(Image):
                          constrain_to_boundary=constrain_to_boundary,
                          return_transform=return_transform)
 
-    def sample(self, points_to_sample, order=1, mode='constant', cval=0.0):
+    def sample(self, points_to_sample, order=1, mode='constant', cval=0.0,
+               workers=1):
         r"""
         Sample this image at the given sub-pixel accurate points. The input
         PointCloud should have the same number of dimensions as the image e.g.
@@ -860,6 +870,10 @@ class MaskedImage(Image):
         cval : `float`, optional
             Used in conjunction with mode ``constant``, the value outside
             the image boundaries.
+        workers : `int`, optional
+            The number of threads to split the points between. Only used for
+            large numbers of points with nearest neighbour or bilinear
+            interpolation.
 
         Returns
         -------
@@ -874,9 +888,10 @@ class MaskedImage(Image):
             mask of valid sample points, **as well as** the sampled points
             themselves, in case you want to ignore the error.
         """
-        sampled_mask = self.mask.sample(points_to_sample, mode=mode, cval=cval)
+        sampled_mask = self.mask.sample(points_to_sample, mode=mode, cval=cval,
+                                        workers=workers)
         sampled_values = Image.sample(self, points_to_sample, order=order,
-                                      mode=mode, cval=cval)
+                                      mode=mode, cval=cval, workers=workers)
         if not np.all(sampled_mask):
             raise OutOfMaskSampleError(sampled_mask, sampled_values)
         return sampled_values
@@ -884,7 +899,7 @@ class MaskedImage(Image):
     # noinspection PyMethodOverriding
     def warp_to_mask(self, template_mask, transform, warp_landmarks=False,
                      order=1, mode='constant', cval=0., batch_size=None,
-                     return_transform=False):
+                     return_transform=False, plan=None, workers=1):
         r"""
         Warps this image into a different reference space.
 
@@ -929,6 +944,13 @@ class MaskedImage(Image):
         return_transform : `bool`, optional
             This argument is for internal use only. If ``True``, then the
             :map:`Transform` object is also returned.
+        plan : :map:`WarpPlan`, optional
+            A plan built for ``template_mask``, from which the template points
+            (and any cached piecewise affine data) are taken.
+        workers : `int`, optional
+            The number of threads to sample the template points with. Only
+            used for large templates with nearest neighbour or bilinear
+            interpolation.
 
         Returns
         -------
@@ -943,7 +965,8 @@ class MaskedImage(Image):
         warped_image = Image.warp_to_mask(self, template_mask, transform,
                                           warp_landmarks=warp_landmarks,
                                           order=order, mode=mode, cval=cval,
-                                          batch_size=batch_size)
+                                          batch_size=batch_size, plan=plan,
+                                          workers=workers)
         # Set the template mask as our mask
         warped_image.mask = template_mask
         # optionally return the transform
@@ -955,7 +978,7 @@ class MaskedImage(Image):
     # noinspection PyMethodOverriding
     def warp_to_shape(self, template_shape, transform, warp_landmarks=False,
                       order=1, mode='constant', cval=0., batch_size=None,
-                      return_transform=False):
+                      return_transform=False, workers=1):
         """
         Return a copy of this :map:`MaskedImage` warped into a different
         reference space.
@@ -1002,6 +1025,10 @@ class MaskedImage(Image):
         return_transform : `bool`, optional
             This argument is for internal use only. If ``True``, then the
             :map:`Transform` object is also returned.
+        workers : `int`, optional
+            The number of threads to warp with. Only used for large 2D affine
+            warps (of order at most 3), and for large templates sampled with
+            nearest neighbour or bilinear interpolation.
 
         Returns
         -------
@@ -1015,11 +1042,12 @@ class MaskedImage(Image):
         warped_image = Image.warp_to_shape(self, template_shape, transform,
                                            warp_landmarks=warp_landmarks,
                                            order=order, mode=mode, cval=cval,
-                                           batch_size=batch_size)
+                                           batch_size=batch_size,
+                                           workers=workers)
         # warp the mask separately and reattach.
         mask = self.mask.warp_to_shape(template_shape, transform,
                                        warp_landmarks=warp_landmarks,
-                                       mode=mode, cval=cval)
+                                       mode=mode, cval=cval, workers=workers)
         # efficiently turn the Image into a MaskedImage, attaching the
         # landmarks
         masked_warped_image = warped_image.as_masked(mask=mask, copy=False)
@@ -1,6 +1,6 @@
 import numpy as np
 from numpy.testing import assert_allclose
-from menpo.image import Image
+from menpo.image import Image, MaskedImage
 from menpo.shape import bounding_box
 
 
@@ -81,3 +81,77 @@ def test_crop_to_landmarks_return_transform():
     assert_allclose(img_back.pixels, img.pixels)
     assert_allclose(img_back.landmarks['test'].points,
                     img.landmarks['test'].points)
+
+
+def test_crop_view_shares_pixels():
+    img = Image(np.random.rand(3, 100, 120))
+    img.landmarks['test'] = bounding_box([40, 40], [80, 80])
+    cropped = img.crop(np.array([20, 30]), np.array([90, 95]), copy=False)
+    expected = img.crop(np.array([20, 30]), np.array([90, 95]))
+    assert(np.shares_memory(cropped.pixels, img.pixels))
+    assert_allclose(cropped.pixels, expected.pixels)
+    assert_allclose(cropped.landmarks['test'].points,
+                    expected.landmarks['test'].points)
+    # The landmarks of the view are independent of the parent
+    assert_allclose(img.landmarks['test'].points,
+                    bounding_box([40, 40], [80, 80]).points)
+
+
+def test_crop_to_landmarks_view():
+    img = Image.init_blank((100, 100), n_channels=1)
+    img.landmarks['test'] = bounding_box([10, 20], [30, 50])
+    cropped = img.crop_to_landmarks_proportion(0.1, copy=False)
+    assert(np.shares_memory(cropped.pixels, img.pixels))
+    assert_allclose(cropped.shape,
+                    img.crop_to_landmarks_proportion(0.1).shape)
+    assert_allclose(cropped.landmarks['test'].bounds()[0], [2, 2])
+
+
+def test_crop_view_masked_and_pickle():
+    import pickle
+    img = MaskedImage(np.random.rand(2, 50, 60))
+    img.mask.pixels[0, :25] = False
+    img.landmarks['test'] = bounding_box([10, 10], [40, 40])
+    cropped = img.crop_to_landmarks(copy=False)
+    assert(type(cropped) == MaskedImage)
+    assert(np.shares_memory(cropped.mask.pixels, img.mask.pixels))
+    assert_allclose(cropped.mask.pixels,
+                    img.crop_to_landmarks().mask.pixels)
+    unpickled = pickle.loads(pickle.dumps(cropped))
+    assert_allclose(unpickled.pixels, cropped.pixels)
+    assert_allclose(unpickled.landmarks['test'].points,
+                    cropped.landmarks['test'].points)
+
+
+def test_crop_view_landmarks_independent_of_parent():
+    import gc
+    import weakref
+    img = Image(np.random.rand(1, 50, 60))
+    img.landmarks['test'] = bounding_box([10, 10], [40, 40])
+    expected = img.crop(np.array([5, 5]), np.array([45, 45]))
+    cropped = img.crop(np.array([5, 5]), np.array([45, 45]), copy=False)
+    copied = cropped.copy()
+    img.landmarks['test'] = bounding_box([0, 0], [5, 5])
+    img.landmarks['other'] = bounding_box([0, 0], [5, 5])
+    ref = weakref.ref(img)
+    del img, cropped
+    gc.collect()
+    assert(ref() is None)
+    assert(copied.landmarks.group_labels == ['test'])
+    assert_allclose(copied.landmarks['test'].points,
+                    expected.landmarks['test'].points)
+
+
+def test_crop_view_landmarks_copied_on_first_access():
+    from mock import patch
+    from menpo.shape import PointCloud
+    img = Image(np.random.rand(1, 50, 60))
+    img.landmarks['test'] = PointCloud(np.array([[10., 10.], [40., 40.]]))
+    with patch.object(PointCloud, 'copy', autospec=True,
+                      side_effect=PointCloud.copy) as copy:
+        cropped = img.crop(np.array([5, 5]), np.array([45, 45]), copy=False)
+        assert(copy.call_count == 0)
+        assert_allclose(cropped.landmarks['test'].points,
+                        [[5., 5.], [35., 35.]])
+        assert(copy.call_count == 1)
+    assert_allclose(img.landmarks['test'].points, [[10., 10.], [40., 40.]])
@@ -2,9 +2,14 @@ import numpy as np
 import menpo
 from nose.tools import raises
 from numpy.testing import assert_allclose, assert_almost_equal
-from menpo.image import BooleanImage, Image, MaskedImage, OutOfMaskSampleError
+from menpo.image import (BooleanImage, Image, MaskedImage, OutOfMaskSampleError,
+                         warp_images, WarpPlan)
 from menpo.shape import PointCloud, bounding_box
-from menpo.transform import Affine, UniformScale, Rotation
+from menpo.transform import (Affine, UniformScale, Rotation,
+                             ThinPlateSplines, PiecewiseAffine)
+from menpo.image.interpolation import (cython_point_interpolation,
+                                       scipy_interpolation,
+                                       cython_interpolation)
 import menpo.io as mio
 
 # do the import to generate the expected outputs
@@ -344,3 +349,181 @@ def test_maskedimage_retain_shape():
     rotated_img = image.rotate_ccw_about_centre(theta=77, retain_shape=True)
     assert(image.shape == rotated_img.shape)
     assert(type(rotated_img) == MaskedImage)
+
+
+def test_warp_images_to_shape():
+    transforms = [Affine.init_identity(2).from_vector(initial_params),
+                  UniformScale(0.5, 2)]
+    out = warp_images([rgb_image, rgb_image], gray_template.shape, transforms,
+                      workers=2)
+    assert(out.shape == (2, 3) + gray_template.shape)
+    for pixels, t in zip(out, transforms):
+        assert_allclose(pixels,
+                        rgb_image.warp_to_shape(gray_template.shape,
+                                                t).pixels)
+
+
+def test_warp_images_non_affine_out():
+    src = PointCloud(np.array([[0., 0.], [0., 50.], [50., 0.], [50., 50.]]))
+    tps = ThinPlateSplines(src, src.copy())
+    out = np.empty((3, 1, 20, 30))
+    result = warp_images([gray_image] * 3, (20, 30), [tps] * 3, out=out)
+    assert(result is out)
+    assert_allclose(out[1], gray_image.warp_to_shape((20, 30), tps).pixels)
+
+
+def test_warp_images_to_mask():
+    mask = BooleanImage.init_blank(gray_template.shape)
+    mask.pixels[0, :10] = False
+    image = gray_image.copy()
+    image.landmarks['test'] = bounding_box([80, 40], [120, 80])
+    t = Affine.init_identity(2).from_vector(initial_params)
+    warped = warp_images([image, image], mask, [t, t], workers=1)
+    expected = image.warp_to_mask(mask, t)
+    for w in warped:
+        assert(type(w) == MaskedImage)
+        assert(w.mask is mask)
+        assert_allclose(w.pixels, expected.pixels)
+        assert_allclose(w.landmarks['test'].points,
+                        expected.landmarks['test'].points)
+    # The pixels of every image are views on to the same array
+    assert(warped[0].pixels.base is warped[1].pixels.base)
+
+
+@raises(ValueError)
+def test_warp_images_transforms_mismatch_raises():
+    warp_images([gray_image, gray_image], (10, 10), [UniformScale(1, 2)])
+
+
+def test_warp_to_mask_plan_pwa():
+    template = bounding_box([0, 0], [40, 40])
+    mask = BooleanImage.init_blank((40, 40))
+    mask.pixels[0, :5, :5] = False
+    for target in (bounding_box([70, 30], [150, 110]),
+                   PointCloud(np.array([[80., 40.], [160., 30.],
+                                        [150., 110.], [60., 100.]]))):
+        plan = WarpPlan(mask, PiecewiseAffine(template, target))
+        pwa = PiecewiseAffine(template, target)
+        assert_allclose(
+            rgb_image.warp_to_mask(mask, pwa, warp_landmarks=False,
+                                   plan=plan).pixels,
+            rgb_image.warp_to_mask(mask, pwa, warp_landmarks=False).pixels)
+
+
+def test_warp_to_mask_plan_non_pwa():
+    plan = WarpPlan(template_mask)
+    t = Affine.init_identity(2).from_vector(initial_params)
+    warped_im = gray_image.warp_to_mask(template_mask, t, plan=plan)
+    assert_allclose(warped_im.pixels, gray_template.pixels)
+
+
+@raises(ValueError)
+def test_warp_to_mask_plan_wrong_shape_raises():
+    plan = WarpPlan((10, 10))
+    gray_image.warp_to_mask(template_mask, UniformScale(1, 2), plan=plan)
+
+
+@raises(ValueError)
+def test_warp_to_mask_plan_other_mask_raises():
+    mask = template_mask.copy()
+    mask.pixels[0, 0, 0] = False
+    plan = WarpPlan(template_mask)
+    gray_image.warp_to_mask(mask, UniformScale(1, 2), plan=plan)
+
+
+@raises(ValueError)
+def test_warp_to_mask_plan_from_shape_raises():
+    mask = template_mask.copy()
+    mask.pixels[0, 0, 0] = False
+    plan = WarpPlan(mask.shape)
+    gray_image.warp_to_mask(mask, UniformScale(1, 2), plan=plan)
+
+
+def test_cython_point_interpolation_matches_scipy():
+    rng = np.random.RandomState(0)
+    points = rng.uniform(-3, 23, size=(500, 2))
+    points[:3] = [[0, 0], [19, 29], [0.5, 0.5]]
+    for dtype in (np.float32, np.float64, np.uint8, np.uint16):
+        pixels = (rng.rand(3, 20, 30) * 200).astype(dtype)
+        for order in (0, 1):
+            for mode in ('constant', 'nearest'):
+                sampled = cython_point_interpolation(pixels, points,
+                                                     order=order, mode=mode,
+                                                     cval=7)
+                expected = scipy_interpolation(pixels, points, order=order,
+                                               mode=mode, cval=7)
+                assert(sampled.dtype == expected.dtype)
+                assert_allclose(sampled, expected, rtol=1e-5)
+
+
+def test_cython_point_interpolation_workers():
+    rng = np.random.RandomState(0)
+    pixels = rng.rand(2, 50, 50)
+    points = rng.uniform(0, 49, size=(2 ** 16, 2))
+    assert_allclose(cython_point_interpolation(pixels, points, workers=4),
+                    scipy_interpolation(pixels, points))
+
+
+def test_warp_to_mask_workers():
+    from mock import patch
+    from menpo.base import _worker_pool
+    mask = BooleanImage.init_blank((300, 300))
+    mask.pixels[0, :10] = False
+    t = Affine.init_identity(2).from_vector(initial_params)
+    with patch('menpo.image.interpolation._worker_pool',
+               wraps=_worker_pool) as worker_pool:
+        warped = rgb_image.warp_to_mask(mask, t, warp_landmarks=False,
+                                        workers=4)
+    assert worker_pool.call_count == 1
+    assert_allclose(warped.pixels,
+                    rgb_image.warp_to_mask(mask, t,
+                                           warp_landmarks=False).pixels)
+
+
+def test_cython_point_interpolation_boolean():
+    pixels = np.zeros((1, 5, 5), dtype=np.bool)
+    pixels[0, 2:, 2:] = True
+    points = np.array([[2.4, 2.4], [1.6, 1.6], [10., 10.]])
+    sampled = cython_point_interpolation(pixels, points, order=0, cval=3)
+    assert(sampled.dtype == np.bool)
+    assert_allclose(sampled, [[True, True, True]])
+    assert(sampled.view(np.uint8).max() == 1)
+
+
+def test_cython_interpolation_workers():
+    pixels = np.random.rand(3, 200, 200).astype(np.float32)
+    t = Affine.init_identity(2).from_vector(initial_params)
+    sampled = cython_interpolation(pixels, (300, 300), t, workers=4)
+    assert(sampled.dtype == np.float32)
+    assert(sampled.shape == (3, 300 * 300))
+    assert_allclose(sampled, cython_interpolation(pixels, (300, 300), t,
+                                                  workers=1))
+
+
+def test_rescale_workers():
+    from mock import patch
+    from menpo.base import _worker_pool
+    with patch('menpo.image.interpolation._worker_pool',
+               wraps=_worker_pool) as worker_pool:
+        rescaled = rgb_image.rescale(2.5, workers=4)
+    assert worker_pool.call_count == 1
+    expected = rgb_image.rescale(2.5)
+    assert_allclose(rescaled.pixels, expected.pixels)
+    assert_allclose(rescaled.landmarks['PTS'].points,
+                    expected.landmarks['PTS'].points)
+
+
+def test_cython_interpolation_boolean():
+    pixels = np.zeros((2, 10, 10), dtype=np.bool)
+    pixels[:, 5:, 5:] = True
+    sampled = cython_interpolation(pixels, (10, 10), UniformScale(2, 2),
+                                   order=0, cval=5)
+    assert(sampled.dtype == np.bool)
+    assert(sampled.view(np.uint8).max() == 1)
+    assert(sampled.reshape(2, 10, 10)[:, 3:, 3:].all())
+
+
+@raises(ValueError)
+def test_cython_interpolation_invalid_order_raises():
+    cython_interpolation(np.zeros((1, 5, 5)), (5, 5), UniformScale(1, 2),
+                         order=4)
@@ -0,0 +1,274 @@
+from multiprocessing import cpu_count
+
+import numpy as np
+
+from menpo.base import _worker_pool
+from menpo.transform import Affine
+from menpo.transform.piecewiseaffine.base import AbstractPWA
+
+from .base import indices_for_image_of_shape
+from .boolean import BooleanImage
+from .interpolation import cython_interpolation
+from .masked import MaskedImage
+
+
+class WarpPlan(object):
+    r"""
+    The template side of a warp, computed once so that many images can be
+    warped on to the same template cheaply.
+
+    The plan stores the coordinates of the template pixels. If built with a
+    piecewise affine transform, the containing triangle and barycentric
+    coordinates of every template pixel are also stored. As these only
+    depend on the source (template) shape of the transform, warping with any
+    other piecewise affine transform that shares the same source only needs
+    to recompute the (cheap) affine combination of its target vertices.
+
+    Pass the plan to :meth:`Image.warp_to_mask` via ``plan=``.
+
+    Parameters
+    ----------
+    template : :map:`BooleanImage` or `tuple`
+        The template mask (only the ``True`` pixels are sampled) or the
+        template shape (every pixel is sampled).
+    transform : :map:`Transform`, optional
+        A representative transform of the family that will be used with this
+        plan. If it is a piecewise affine transform, its triangle containment
+        of the template points is cached.
+
+    Raises
+    ------
+    TriangleContainmentError
+        If ``transform`` is piecewise affine and a template point is not
+        contained in any of its source triangles.
+    """
+    def __init__(self, template, transform=None):
+        if isinstance(template, BooleanImage):
+            self.template_shape = template.shape
+            self.template_points = template.true_indices()
+            self._mask = template.pixels[0].copy()
+        else:
+            self.template_shape = tuple(int(s) for s in template)
+            self.template_points = indices_for_image_of_shape(
+                self.template_shape)
+            self._mask = None
+        self._pwa_source, self._pwa_trilist, self._iab = None, None, None
+        if isinstance(transform, AbstractPWA):
+            self._iab = transform.index_alpha_beta(self.template_points)
+            self._pwa_source = transform.source.points.copy()
+            self._pwa_trilist = transform.trilist.copy()
+
+    @property
+    def n_points(self):
+        r"""
+        The number of template points that are sampled.
+
+        :type: `int`
+        """
+        return self.template_points.shape[0]
+
+    def _fits_mask(self, template_mask):
+        r"""
+        Whether this plan samples exactly the ``True`` pixels of
+        ``template_mask``.
+        """
+        if self.template_shape != template_mask.shape:
+            return False
+        if self._mask is None:
+            return template_mask.all_true()
+        return np.array_equal(self._mask, template_mask.pixels[0])
+
+    def _is_cached(self, transform):
+        r"""
+        Whether ``transform`` is a piecewise affine transform that shares the
+        source shape that this plan was built with.
+        """
+        return (self._iab is not None and
+                isinstance(transform, AbstractPWA) and
+                np.array_equal(transform.trilist, self._pwa_trilist) and
+                np.array_equal(transform.source.points, self._pwa_source))
+
+    def apply(self, transform, batch_size=None):
+        r"""
+        Map the template points through ``transform``.
+
+        Parameters
+        ----------
+        transform : :map:`Transform`
+            Transform **from the template space back to the image**.
+        batch_size : `int` or ``None``, optional
+            How many points should be transformed at a time. Ignored when the
+            cached piecewise affine data is used.
+
+        Returns
+        -------
+        points : ``(n_points, n_dims)`` `ndarray`
+            The points to sample from the image.
+        """
+        if self._is_cached(transform):
+            return transform._apply_index_alpha_beta(*self._iab)
+        return transform.apply(self.template_points, batch_size=batch_size)
+
+
+def _sample_for_warp(image, transform, template_shape, plan, order, mode,
+                     cval, batch_size):
+    r"""
+    The pixels of ``image`` sampled at every template point, as a
+    ``(n_channels, n_template_points)`` array. Mirrors the sampling performed
+    by :meth:`Image.warp_to_shape` and :meth:`Image.warp_to_mask`. If no
+    ``plan`` is provided, ``transform`` must be a 2D affine transform.
+    """
+    if image.n_dims != transform.n_dims:
+        raise ValueError(
+            "Trying to warp a {}D image with a {}D transform "
+            "(they must match)".format(image.n_dims, transform.n_dims))
+    if plan is None:
+        # Whole image affine warps are faster in Cython. The images are
+        # already warped in parallel, so each warp is on a single thread.
+        sampled = cython_interpolation(image.pixels, template_shape,
+                                       transform, order=order, mode=mode,
+                                       cval=cval, workers=1)
+    else:
+        points_to_sample = plan.apply(transform, batch_size=batch_size)
+        sampled = image.sample(points_to_sample, order=order, mode=mode,
+                               cval=cval, workers=1)
+    # set any nan values to 0
+    sampled[np.isnan(sampled)] = 0
+    return sampled
+
+
+def warp_images(images, template, transforms, out=None, workers=None,
+                order=1, mode='constant', cval=0.0, batch_size=None,
+                warp_landmarks=True):
+    r"""
+    Warp a collection of images, each with its own transform, into the same
+    reference space.
+
+    This is equivalent to calling :meth:`Image.warp_to_shape` (or
+    :meth:`Image.warp_to_mask`) on every image, but the template coordinates
+    are only computed once (see :map:`WarpPlan`), the result is written
+    straight into a single preallocated ``(n_images, n_channels) +
+    template_shape`` array and the images are warped in parallel on a pool
+    of threads. If ``images`` is a :map:`LazyList`, each image is also loaded
+    by the thread that warps it.
+
+    Parameters
+    ----------
+    images : `list` or :map:`LazyList` of :map:`Image`
+        The images to warp. All images must have the same number of channels.
+    template : `tuple` or :map:`BooleanImage`
+        If a shape, every pixel of the template is sampled and the array of
+        warped pixels is returned. If a mask, only the ``True`` pixels are
+        sampled and a list of :map:`MaskedImage` that all share the template
+        mask is returned.
+    transforms : `list` of :map:`Transform`
+        One transform per image, **from the template space back to the
+        image**.
+    out : ``(n_images, n_channels) + template_shape`` `ndarray`, optional
+        The array to write the warped pixels in to. If ``None``, a new array
+        is allocated, with the dtype the image pixels are sampled as. Note
+        that when warping to a mask the pixels outside of the mask are left
+        untouched.
+    workers : `int`, optional
+        The number of threads to warp with. If ``None``, the number of CPUs
+        is used.
+    order : `int`, optional
+        The order of interpolation. The order has to be in the range [0,5].
+        See :meth:`Image.warp_to_shape` for more information.
+    mode : ``{constant, nearest, reflect, wrap}``, optional
+        Points outside the boundaries of the input are filled according
+        to the given mode.
+    cval : `float`, optional
+        Used in conjunction with mode ``constant``, the value outside
+        the image boundaries.
+    batch_size : `int` or ``None``, optional
+        How many points of each image should be warped at a time. See
+        :meth:`Image.warp_to_shape` for more information.
+    warp_landmarks : `bool`, optional
+        Only used when warping to a mask. If ``True``, each warped image will
+        have the landmarks of its source image, updated to the warped
+        position.
+
+    Returns
+    -------
+    warped : ``(n_images, n_channels) + template_shape`` `ndarray` or `list` of :map:`MaskedImage`
+        The warped pixels if ``template`` is a shape, otherwise the warped
+        images, whose pixels are views on to ``out``.
+
+    Raises
+    ------
+    ValueError
+        If there is not exactly one transform per image, no images are
+        provided or ``out`` is of the wrong shape.
+    """
+    n_images = len(images)
+    if len(transforms) != n_images:
+        raise ValueError('One transform is required per image ({} images, '
+                         '{} transforms provided)'.format(n_images,
+                                                          len(transforms)))
+    if n_images == 0:
+        raise ValueError('At least one image must be provided.')
+    if workers is None:
+        workers = cpu_count()
+
+    if isinstance(template, BooleanImage):
+        mask = template
+        template_shape = template.shape
+        plan = WarpPlan(template, transforms[0])
+    else:
+        mask = None
+        template_shape = tuple(int(s) for s in template)
+        plan = None
+        if not (len(template_shape) == 2 and order in range(4) and
+                all(isinstance(t, Affine) and t.n_dims == 2
+                    for t in transforms)):
+            # Not every warp can take the affine fast path, so build the
+            # template points once rather than once per image
+            plan = WarpPlan(template_shape, transforms[0])
+
+    def warp_one(i):
+        image = images[i]
+        sampled = _sample_for_warp(image, transforms[i], template_shape, plan,
+                                   order, mode, cval, batch_size)
+        return image, sampled
+
+    def write(i, image, sampled):
+        if mask is None:
+            out[i] = sampled.reshape(out.shape[1:])
+            return None
+        out[i][:, mask.pixels[0]] = sampled
+        warped_image = MaskedImage(out[i], mask=mask, copy=False)
+        if warp_landmarks and image.has_landmarks:
+            warped_image.landmarks = image.landmarks
+            transforms[i].pseudoinverse()._apply_inplace(
+                warped_image.landmarks)
+        if hasattr(image, 'path'):
+            warped_image.path = image.path
+        return warped_image
+
+    # Warp the first image up front to find the shape and dtype of the output
+    image, sampled = warp_one(0)
+    out_shape = (n_images, sampled.shape[0]) + template_shape
+    if out is None:
+        out = np.zeros(out_shape, dtype=sampled.dtype)
+    elif out.shape != out_shape:
+        raise ValueError('out must be of shape {} ({} '
+                         'provided)'.format(out_shape, out.shape))
+    warped = [write(0, image, sampled)]
+
+    def warp_and_write(i):
+        image, sampled = warp_one(i)
+        if sampled.shape[0] != out_shape[1]:
+            raise ValueError('Image {} has {} channels but expected '
+                             '{}'.format(i, sampled.shape[0], out_shape[1]))
+        return write(i, image, sampled)
+
+    if workers == 1:
+        warped.extend(warp_and_write(i) for i in range(1, n_images))
+    else:
+        pool = _worker_pool(workers)
+        try:
+            warped.extend(pool.map(warp_and_write, range(1, n_images)))
+        finally:
+            pool.terminate()
+    return out if mask is None else warped
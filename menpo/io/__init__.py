@@ -1,12 +1,21 @@
-from .input import (
-    import_image, import_images, image_paths,
-    import_video, import_videos, video_paths,
-    import_landmark_file, import_landmark_files, landmark_file_paths,
-    import_pickle, import_pickles, pickle_paths,
-    import_builtin_asset, data_dir_path, data_path_to, ls_builtin_assets,
-    register_image_importer, register_landmark_importer,
-    register_pickle_importer, register_video_importer
-)
-from .output import (export_image, export_video,
-                     export_landmark_file, export_pickle)
-from .exceptions import OverwriteError
+from menpo.base import _lazy_module_attributes
+
+_lazy_module_attributes(__name__, dict(
+    [(name, ('.input', name)) for name in (
+        'import_image', 'import_images', 'image_paths', 'image_metadata',
+        'import_video', 'import_videos', 'video_paths',
+        'import_landmark_file', 'import_landmark_files',
+        'landmark_file_paths',
+        'import_pickle', 'import_pickles', 'pickle_paths',
+        'import_image_pack',
+        'import_builtin_asset', 'data_dir_path', 'data_path_to',
+        'ls_builtin_assets',
+        'register_image_importer', 'register_landmark_importer',
+        'register_pickle_importer', 'register_video_importer')] +
+    [(name, ('.output', name)) for name in (
+        'export_image', 'export_images', 'export_video',
+        'export_landmark_file', 'export_landmark_files', 'export_pickle',
+        'export_image_pack', 'VideoWriter')] +
+    [('OverwriteError', ('.exceptions', 'OverwriteError'))] +
+    [(name, ('.cache', name)) for name in (
+        'set_import_cache', 'get_import_cache', 'ImportCache')]))
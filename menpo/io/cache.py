@@ -0,0 +1,244 @@
+from collections import OrderedDict
+import hashlib
+import os
+import threading
+try:
+    import cPickle as pickle  # request cPickle manually on Py2
+except ImportError:  # Py3
+    import pickle
+
+import menpo
+from menpo.base import LazyList, name_of_callable
+
+from .utils import _norm_path
+
+# Formats that are memory mapped on import and so are never cached
+_UNCACHED_EXTENSIONS = {'.mpkl'}
+
+# os.replace is atomic on every platform but is only available on Python 3
+_replace = getattr(os, 'replace', os.rename)
+
+
+class ImportCache(object):
+    r"""
+    A persistent, on-disk cache of imported assets.
+
+    Each entry is keyed by the path, modification time and size of the
+    source file, the importer used and the keyword arguments passed to it
+    (e.g. ``normalize``), as well as the version of menpo and the pickle
+    protocol, so a changed file, a different set of importer options or an
+    upgrade never produces a stale hit. An entry that can not be loaded is
+    treated as a miss and removed. Entries are stored as binary pickles
+    (in which NumPy arrays are written as raw buffers) and the least
+    recently used entries are evicted to keep the cache within a byte budget.
+
+    The cache is safe to share between threads, and between processes using
+    the same directory (although the byte budget is then only enforced on a
+    per-process basis).
+
+    Parameters
+    ----------
+    directory : `pathlib.Path` or `str`
+        The directory to store the cache in. Created if it does not exist.
+    max_bytes : `int`, optional
+        The maximum total size of the entries in the cache.
+    """
+    def __init__(self, directory, max_bytes=2 ** 30):
+        if max_bytes <= 0:
+            raise ValueError('max_bytes must be positive '
+                             '({} provided)'.format(max_bytes))
+        self.directory = _norm_path(directory)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        if not self.directory.is_dir():
+            self.directory.mkdir(parents=True)
+        # Rebuild the LRU order of any existing entries from their mtimes -
+        # the mtime is bumped every time an entry is used.
+        entries = [(p.stat().st_mtime, p.name, p.stat().st_size)
+                   for p in self.directory.glob('*.pkl')]
+        self._entries = OrderedDict((name, size)
+                                    for _, name, size in sorted(entries))
+        self.n_bytes = sum(self._entries.values())
+
+    def __str__(self):
+        return '{}: {} entries, {}/{} bytes ({} hits, {} misses)'.format(
+            type(self).__name__, len(self._entries), self.n_bytes,
+            self.max_bytes, self.hits, self.misses)
+
+    @staticmethod
+    def _key(path, importer_callable, asset, importer_kwargs):
+        stat = path.stat()
+        # Some importers (e.g. ASF) use the asset to scale their output
+        asset_key = None if asset is None else asset.shape
+        key = repr((str(path), stat.st_mtime, stat.st_size,
+                    name_of_callable(importer_callable), asset_key,
+                    sorted(importer_kwargs.items()), menpo.__version__,
+                    pickle.HIGHEST_PROTOCOL))
+        return hashlib.sha1(key.encode('utf8')).hexdigest() + '.pkl'
+
+    def _discard(self, name):
+        with self._lock:
+            self.n_bytes -= self._entries.pop(name, 0)
+        try:
+            os.remove(str(self.directory / name))
+        except OSError:
+            pass  # Already removed (e.g. by another process)
+
+    def _evict(self, max_bytes):
+        # Drop the least recently used entries until we are under budget
+        while self.n_bytes > max_bytes and self._entries:
+            name, size = self._entries.popitem(last=False)
+            self.n_bytes -= size
+            try:
+                os.remove(str(self.directory / name))
+            except OSError:
+                pass  # Already removed (e.g. by another process)
+
+    def import_asset(self, importer_callable, path, asset=None,
+                     importer_kwargs=None):
+        r"""
+        Return the asset at ``path`` from the cache if possible, otherwise
+        invoke the importer and store the result.
+
+        Parameters
+        ----------
+        importer_callable : `callable`
+            The importer to invoke on a miss.
+        path : `pathlib.Path`
+            The normalized path of the file to import.
+        asset : `object`, optional
+            Passed through to the importer.
+        importer_kwargs : `dict`, optional
+            Passed through to the importer.
+
+        Returns
+        -------
+        asset : `object`
+            The imported asset(s).
+        """
+        if importer_kwargs is None:
+            importer_kwargs = {}
+        if path.suffix.lower() in _UNCACHED_EXTENSIONS:
+            # Memory mapped formats are already faster than the cache
+            return importer_callable(path, asset=asset, **importer_kwargs)
+        if asset is not None and not hasattr(asset, 'shape'):
+            # We can't key on an arbitrary asset - bypass the cache
+            return importer_callable(path, asset=asset, **importer_kwargs)
+
+        name = self._key(path, importer_callable, asset, importer_kwargs)
+        entry_path = self.directory / name
+        try:
+            with open(str(entry_path), 'rb') as f:
+                built_objects = pickle.load(f)
+        except (IOError, OSError):
+            pass  # Not in the cache
+        except Exception:
+            # A corrupt entry, or one that refers to classes that no longer
+            # exist - treat it as a miss
+            self._discard(name)
+        else:
+            with self._lock:
+                self.hits += 1
+                if name in self._entries:
+                    self._entries[name] = self._entries.pop(name)
+            try:
+                os.utime(str(entry_path), None)
+            except OSError:
+                pass
+            return built_objects
+
+        built_objects = importer_callable(path, asset=asset, **importer_kwargs)
+        with self._lock:
+            self.misses += 1
+        if isinstance(built_objects, LazyList):
+            # Lazy assets (e.g. videos) wrap open readers - never cache these
+            return built_objects
+        try:
+            data = pickle.dumps(built_objects, protocol=pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, TypeError, AttributeError):
+            return built_objects
+        if len(data) > self.max_bytes:
+            return built_objects
+
+        # Write to a temporary file and rename so that readers (possibly in
+        # other processes) never see a partially written entry.
+        tmp_path = self.directory / '{}.{}.{}.tmp'.format(
+            name, os.getpid(), threading.current_thread().ident)
+        try:
+            try:
+                with open(str(tmp_path), 'wb') as f:
+                    f.write(data)
+                _replace(str(tmp_path), str(entry_path))
+            finally:
+                try:
+                    os.remove(str(tmp_path))
+                except OSError:
+                    pass  # Renamed in to place
+        except (IOError, OSError):
+            # e.g. the disk is full - the asset is simply not cached
+            return built_objects
+        with self._lock:
+            self.n_bytes += len(data) - self._entries.pop(name, 0)
+            self._entries[name] = len(data)
+            self._evict(self.max_bytes)
+        return built_objects
+
+    def clear(self):
+        r"""
+        Remove every entry from the cache.
+        """
+        with self._lock:
+            self._evict(-1)
+
+
+_IMPORT_CACHE = None
+
+
+def set_import_cache(directory, max_bytes=2 ** 30):
+    r"""
+    Enable (or disable) the persistent import cache.
+
+    When enabled, every asset imported through :map:`import_image`,
+    :map:`import_images`, :map:`import_landmark_file`,
+    :map:`import_landmark_files`, :map:`import_pickle` and
+    :map:`import_pickles` (and the landmarks attached to images) is stored in
+    a binary form in ``directory``. Subsequent imports of an unchanged file
+    with the same options skip decoding entirely. The least recently used
+    entries are evicted to keep the cache under ``max_bytes``.
+
+    Note that lazily imported assets such as videos are never cached.
+
+    Parameters
+    ----------
+    directory : `pathlib.Path` or `str` or ``None``
+        The directory to store the cache in. If ``None``, the cache is
+        disabled.
+    max_bytes : `int`, optional
+        The maximum size of the cache on disk, in bytes.
+
+    Returns
+    -------
+    cache : :map:`ImportCache` or ``None``
+        The now active cache.
+    """
+    global _IMPORT_CACHE
+    if directory is None:
+        _IMPORT_CACHE = None
+    else:
+        _IMPORT_CACHE = ImportCache(directory, max_bytes=max_bytes)
+    return _IMPORT_CACHE
+
+
+def get_import_cache():
+    r"""
+    The currently active import cache, if any (see
+    :map:`set_import_cache`).
+
+    Returns
+    -------
+    cache : :map:`ImportCache` or ``None``
+        The active cache or ``None`` if caching is disabled.
+    """
+    return _IMPORT_CACHE
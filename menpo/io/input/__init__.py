@@ -1,13 +1,14 @@
 from .base import (
-    import_image, import_images, image_paths,
+    import_image, import_images, image_paths, image_metadata,
     import_video, import_videos, video_paths,
     import_landmark_file, import_landmark_files, landmark_file_paths,
     import_pickle, import_pickles, pickle_paths,
+    import_image_pack,
     import_builtin_asset,
     menpo_data_path_to as data_path_to,
     menpo_data_dir_path as data_dir_path,
     menpo_ls_builtin_assets as ls_builtin_assets,
     register_image_importer, register_landmark_importer,
     register_pickle_importer, register_video_importer,
-    same_name, same_name_video
+    same_name, same_name_indexed, same_name_video, landmark_stem_index
 )
@@ -1,18 +1,38 @@
+import fnmatch
+import heapq
+import json
 import warnings
 from functools import partial
 import os
+try:
+    from os import scandir
+except ImportError:  # Py2 - use the backport if it is available
+    try:
+        from scandir import scandir
+    except ImportError:
+        scandir = None
 from pathlib import Path
 import random
+import re
+
+import numpy as np
 
 from menpo.base import (menpo_src_dir_path, LazyList, partial_doc,
-                        MenpoDeprecationWarning)
+                        MenpoDeprecationWarning, prefetch_callables,
+                        _worker_pool)
 from menpo.compatibility import basestring
 from menpo.visualize import print_progress
 
+from ..cache import get_import_cache
 from ..utils import (_norm_path, _possible_extensions_from_filepath,
                      _normalize_extension)
 from .extensions import (image_landmark_types, image_types, pickle_types,
-                         ffmpeg_video_types)
+                         ffmpeg_video_types, image_metadata_readers)
+from .landmark import asf_importer
+from .pack import image_pack_importer
+
+# The name of the optional file listing the assets below a directory
+_MANIFEST_NAME = '.menpo_manifest'
 
 
 # TODO: Remove once deprecated
@@ -205,6 +225,199 @@ def same_name(path, paths_callable=landmark_file_paths):
     return {p.suffix[1:].upper(): p for p in paths_callable(pattern)}
 
 
+def same_name_indexed(path, index):
+    r"""
+    Indexed image landmark resolver. Returns the same result as
+    :map:`same_name` but looks the landmarks up in a precomputed index of the
+    directory (see :map:`landmark_stem_index`) rather than globbing the
+    file system once per asset.
+
+    If the directory of the asset is not present in the index, this falls
+    back to :map:`same_name`.
+    """
+    try:
+        stems = index[path.parent]
+    except KeyError:
+        return same_name(path)
+    # Mirrors the '.*' pattern of same_name - key is the final extension
+    return {p.suffix[1:].upper(): p for p in stems.get(path.stem, [])}
+
+
+# The landmark stem index of a worker process (see _set_worker_stem_index)
+_worker_stem_index = None
+
+
+def _set_worker_stem_index(index):
+    r"""
+    Initializer of prefetching worker processes - stores the landmark stem
+    index once per process, rather than pickling it with every importer.
+    """
+    global _worker_stem_index
+    _worker_stem_index = index
+
+
+def _same_name_worker_indexed(path):
+    r"""
+    :map:`same_name_indexed` against the index of this worker process.
+    """
+    if _worker_stem_index is None:
+        return same_name(path)
+    return same_name_indexed(path, _worker_stem_index)
+
+
+def landmark_stem_index(filepaths, extensions_map=image_landmark_types):
+    r"""
+    Build an index of all the landmark files that live alongside the
+    given filepaths. Each directory is listed exactly once, so the cost is
+    linear in the number of files rather than one glob per asset.
+
+    Every landmark file is indexed against each possible stem that a
+    ``stem.*`` glob would have matched, i.e. ``'a.b.pts'`` is indexed under
+    both ``'a'`` and ``'a.b'``.
+
+    Parameters
+    ----------
+    filepaths : `iterable` of `pathlib.Path`
+        The asset paths whose directories should be indexed.
+    extensions_map : `dict` (`str`, `callable`), optional
+        The landmark extensions that are considered importable.
+
+    Returns
+    -------
+    index : `dict` of `pathlib.Path` -> `dict` of `str` -> `list` of `Path`
+        For each directory, a mapping from stem to the (sorted) landmark
+        filepaths sharing that stem.
+    """
+    index = {}
+    for parent in set(p.parent for p in filepaths):
+        stems = {}
+        for name in sorted(os.listdir(str(parent))):
+            path = parent / name
+            possible_exts = _possible_extensions_from_filepath(path)
+            if not any(ext in extensions_map for ext in possible_exts):
+                continue
+            for i, c in enumerate(name):
+                if c == '.':
+                    stems.setdefault(name[:i], []).append(path)
+        index[parent] = stems
+    return index
+
+
+def _image_metadata(path, landmark_resolver=None):
+    importer_callable = importer_for_filepath(path, image_types)
+    metadata_callable = image_metadata_readers.get(importer_callable)
+    if metadata_callable is None:
+        # No header reader (e.g. a user registered importer) - fully import,
+        # normalised as import_image does, so the channels agree with it
+        image = importer_callable(path, normalize=True)
+        if isinstance(image, LazyList):
+            # e.g. a .gif, which is imported as a video - every frame has
+            # the same shape
+            image = image[0]
+        metadata = image.shape, image.n_channels, '', image.pixels.dtype
+    else:
+        metadata = metadata_callable(path)
+    groups = ()
+    if landmark_resolver is not None:
+        groups = tuple((landmark_resolver(path) or {}).keys())
+    return metadata + (groups,)
+
+
+def image_metadata(pattern, landmark_resolver=same_name, workers=4,
+                   verbose=False):
+    r"""
+    Return the metadata of every image that Menpo can import that matches the
+    glob pattern, reading only the header of each file.
+
+    This is much cheaper than importing the images and so can be used to
+    filter large collections (e.g. by resolution or number of channels)
+    before importing them. The result is a structured array with one row per
+    image (sorted by path) and the following fields:
+
+    ==============  ==========================================================
+    ``path``        The path of the image
+    ``shape``       The ``(height, width)`` of the image
+    ``n_channels``  The number of channels of the imported image
+    ``mode``        The PIL mode of the image (empty if unknown)
+    ``dtype``       The dtype of the stored pixels (before normalisation).
+                    For formats whose header cannot be read, the dtype of
+                    the imported pixels
+    ``landmarks``   A boolean per landmark group found for any image,
+                    e.g. ``metadata['landmarks']['PTS']``
+    ==============  ==========================================================
+
+    Parameters
+    ----------
+    pattern : `str`
+        A glob path pattern to search for images. See :map:`image_paths`.
+    landmark_resolver : `function` or `None`, optional
+        The function used to find the landmarks of each image (see
+        :map:`import_images`). Landmark files are only found, never read. If
+        ``None``, no landmark groups are reported.
+    workers : positive `int`, optional
+        The number of threads used to read the headers.
+    verbose : `bool`, optional
+        If ``True`` progress of the scan will be dynamically reported with a
+        progress bar.
+
+    Returns
+    -------
+    metadata : ``(n_images,)`` structured `ndarray`
+        The metadata of each image.
+
+    Raises
+    ------
+    ValueError
+        If no images are found at the provided glob.
+
+    Examples
+    --------
+    Import only the colour images with at least 500 rows:
+
+    >>> metadata = menpo.io.image_metadata('./massive_image_db/*')
+    >>> keep = (metadata['n_channels'] == 3) & (metadata['shape'][:, 0] >= 500)
+    >>> images = [menpo.io.import_image(p) for p in metadata['path'][keep]]
+    """
+    filepaths = list(image_paths(pattern))
+    if len(filepaths) == 0:
+        raise ValueError('The glob {} yields no assets'.format(pattern))
+    if landmark_resolver is same_name:
+        landmark_resolver = partial(
+            same_name_indexed,
+            index=landmark_stem_index(filepaths, image_landmark_types))
+
+    pool = _worker_pool(workers)
+    try:
+        rows = pool.imap(partial(_image_metadata,
+                                 landmark_resolver=landmark_resolver),
+                         filepaths)
+        if verbose:
+            rows = print_progress(rows, prefix='Reading metadata',
+                                  n_items=len(filepaths))
+        rows = list(rows)
+    finally:
+        pool.terminate()
+
+    paths = [str(p) for p in filepaths]
+    groups = sorted(set(g for row in rows for g in row[4]))
+    dtype = np.dtype([
+        ('path', 'U{}'.format(max(len(p) for p in paths))),
+        ('shape', np.int64, (2,)),
+        ('n_channels', np.int64),
+        ('mode', 'U8'),
+        ('dtype', 'U16'),
+        ('landmarks', [(g, np.bool) for g in groups])])
+    metadata = np.zeros(len(rows), dtype=dtype)
+    metadata['path'] = paths
+    metadata['shape'] = [row[0] for row in rows]
+    metadata['n_channels'] = [row[1] for row in rows]
+    metadata['mode'] = [row[2] for row in rows]
+    metadata['dtype'] = [np.dtype(row[3]).name for row in rows]
+    for g in groups:
+        metadata['landmarks'][g] = [g in row[4] for row in rows]
+    return metadata
+
+
 def same_name_video(path, frame_number,
                     paths_callable=landmark_file_paths):
     r"""
@@ -218,7 +431,7 @@ def same_name_video(path, frame_number,
 
 
 def import_image(filepath, landmark_resolver=same_name, normalize=None,
-                 normalise=None):
+                 normalise=None, scale_hint=None):
     r"""Single image (and associated landmarks) importer.
 
     If an image file is found at `filepath`, returns an :map:`Image` or
@@ -248,6 +461,13 @@ def import_image(filepath, landmark_resolver=same_name, normalize=None,
         useful to save on memory usage if you only wish to view or crop images.
     normalise: `bool`, optional
         Deprecated version of normalize. Please use the normalize arg.
+    scale_hint : `float` in ``(0, 1]``, optional
+        If not ``None``, the scale the image is going to be rescaled by after
+        importing. Where the format supports it (JPEG), the image is decoded
+        directly at the smallest reduced resolution that is at least this
+        scale, which is much faster than a full decode. The scale actually
+        applied is stored as ``image.draft_scale`` and any attached
+        landmarks are scaled to match.
 
     Returns
     -------
@@ -256,6 +476,8 @@ def import_image(filepath, landmark_resolver=same_name, normalize=None,
     """
     normalize = _parse_deprecated_normalise(normalise, normalize)
     kwargs = {'normalize': normalize}
+    if scale_hint is not None:
+        kwargs['scale_hint'] = scale_hint
     return _import(filepath, image_types,
                    landmark_ext_map=image_landmark_types,
                    landmark_resolver=landmark_resolver,
@@ -265,7 +487,8 @@ def import_image(filepath, landmark_resolver=same_name, normalize=None,
 
 def import_video(filepath, landmark_resolver=same_name_video, normalize=None,
                  normalise=None, importer_method='ffmpeg',
-                 exact_frame_count=True):
+                 exact_frame_count=True, seek_index=False, shape=None,
+                 crop=None, greyscale=False, fps=None):
     r"""Single video (and associated landmarks) importer.
 
     If a video file is found at `filepath`, returns an :map:`LazyList` wrapping
@@ -312,6 +535,24 @@ def import_video(filepath, landmark_resolver=same_name_video, normalize=None,
     exact_frame_count: `bool`, optional
         If ``True``, the import fails if ffprobe is not available
         (reading from ffmpeg's output returns inexact frame count)
+    seek_index : `bool`, optional
+        If ``True``, an index of the timestamp of every frame and of the
+        keyframes is built with ffprobe (and persisted alongside the video)
+        so that random access seeks are exact and only happen when cheaper
+        than decoding forwards. Recommended for random access to long videos.
+    shape : ``(height, width)`` `tuple` of `int`, optional
+        If not ``None``, every frame is resized to this shape (after
+        cropping) by ffmpeg as it is decoded. Landmarks are resized to match.
+    crop : ``(min_indices, max_indices)``, optional
+        If not ``None``, every frame is cropped by ffmpeg to the region
+        between the ``(y, x)`` indices ``min_indices`` (inclusive) and
+        ``max_indices`` (exclusive) of the original frame. Landmarks are
+        cropped to match.
+    greyscale : `bool`, optional
+        If ``True``, every frame is converted to greyscale by ffmpeg.
+    fps : `float`, optional
+        If not ``None``, the video is resampled to this frame rate by ffmpeg.
+        Landmarks are resolved for the closest original frame.
 
     Returns
     -------
@@ -329,6 +570,10 @@ def import_video(filepath, landmark_resolver=same_name_video, normalize=None,
     normalize = _parse_deprecated_normalise(normalise, normalize)
 
     kwargs = {'normalize': normalize, 'exact_frame_count': exact_frame_count}
+    if seek_index:
+        kwargs['seek_index'] = seek_index
+    kwargs.update(_video_filter_kwargs(shape=shape, crop=crop,
+                                       greyscale=greyscale, fps=fps))
 
     video_importer_methods = {'ffmpeg': ffmpeg_video_types}
     if importer_method not in video_importer_methods:
@@ -342,6 +587,16 @@ def import_video(filepath, landmark_resolver=same_name_video, normalize=None,
                    importer_kwargs=kwargs)
 
 
+def _video_filter_kwargs(shape=None, crop=None, greyscale=False, fps=None):
+    # Only pass the options that are used so that importers that do not
+    # support them are unaffected
+    kwargs = {'shape': shape, 'crop': crop, 'fps': fps}
+    kwargs = {k: v for k, v in kwargs.items() if v is not None}
+    if greyscale:
+        kwargs['greyscale'] = greyscale
+    return kwargs
+
+
 def import_landmark_file(filepath, asset=None):
     r"""Single landmark file importer.
 
@@ -370,12 +625,19 @@ def import_pickle(filepath, **kwargs):
     compressed pickle files - just choose a ``filepath`` ending ``pkl.gz`` and
     gzip compression will automatically be applied. Compression can massively
     reduce the filesize of a pickle file at the cost of longer import and
-    export times.
+    export times. BZ2 (``pkl.bz2``), XZ (``pkl.xz``) and block compressed
+    (``pkl.bgz``, decompressed in parallel) pickles are also supported.
+
+    Memory mappable pickles (``.mpkl``, see :map:`export_pickle`) import
+    near instantly - the data of every large array is a read-only view on to
+    a memory mapping of the file. Pass ``mode='c'`` to map the file
+    copy-on-write instead, which allows the arrays to be modified in memory.
 
     Parameters
     ----------
     filepath : `pathlib.Path` or `str`
-        A relative or absolute filepath to a ``.pkl`` or ``.pkl.gz`` file.
+        A relative or absolute filepath to a ``.pkl``, ``.pkl.gz``,
+        ``.pkl.bz2``, ``.pkl.xz``, ``.pkl.bgz`` or ``.mpkl`` file.
 
     Returns
     -------
@@ -385,8 +647,46 @@ def import_pickle(filepath, **kwargs):
     return _import(filepath, pickle_types, importer_kwargs=kwargs)
 
 
+def import_image_pack(filepath, mode='r'):
+    r"""Import a collection of images from a packed image file.
+
+    Packed image files are written by :map:`export_image_pack` and store the
+    raw pixels of every image contiguously, alongside the landmarks of each
+    image. The file is memory mapped so importing returns immediately and
+    every image is a view on to the file - no decoding or parsing takes place
+    and the operating system page cache is shared between all processes that
+    read the same pack.
+
+    Parameters
+    ----------
+    filepath : `pathlib.Path` or `str`
+        A relative or absolute filepath to a packed image file.
+    mode : ``{'r', 'c'}``, optional
+        The mode the file is mapped with. ``'r'`` gives read-only pixels,
+        ``'c'`` (copy-on-write) allows images to be modified in memory
+        without changing the file.
+
+    Returns
+    -------
+    images : :map:`LazyList`
+        A :map:`LazyList` of the :map:`Image` or :map:`MaskedImage` instances
+        stored in the pack, with their landmarks attached.
+
+    Raises
+    ------
+    ValueError
+        If ``filepath`` is not a file or not a valid image pack.
+    """
+    path = _norm_path(filepath)
+    if not path.is_file():
+        raise ValueError("{} is not a file".format(path))
+    return image_pack_importer(path, mode=mode)
+
+
 def import_pickles(pattern, max_pickles=None, shuffle=False,
-                   as_generator=False, verbose=False, **kwargs):
+                   as_generator=False, verbose=False, prefetch=None,
+                   workers=1, prefetch_backend='thread', manifest=False,
+                   shard=None, shard_by_size=False, seed=None, **kwargs):
     r"""Multiple pickle importer.
 
     Menpo unambiguously uses ``.pkl`` as it's choice of extension for Pickle
@@ -394,7 +694,8 @@ def import_pickles(pattern, max_pickles=None, shuffle=False,
     compressed pickle files - just choose a ``filepath`` ending ``pkl.gz`` and
     gzip compression will automatically be applied. Compression can massively
     reduce the filesize of a pickle file at the cost of longer import and
-    export times.
+    export times. BZ2 (``pkl.bz2``), XZ (``pkl.xz``) and block compressed
+    (``pkl.bgz``, decompressed in parallel) pickles are also supported.
 
     Note that this is a function returns a :map:`LazyList`. Therefore, the
     function will return immediately and indexing into the returned list
@@ -420,6 +721,40 @@ def import_pickles(pattern, max_pickles=None, shuffle=False,
     verbose : `bool`, optional
         If ``True`` progress of the importing will be dynamically reported with
         a progress bar.
+    prefetch : positive `int`, optional
+        Only valid if ``as_generator`` is ``True``. If not ``None``, up to
+        ``prefetch`` pickles are imported ahead of the consumer in the
+        background. The order of the yielded pickles is unchanged and any
+        error raised while importing is re-raised when the failing pickle is
+        reached.
+    workers : positive `int`, optional
+        The number of background workers used when ``prefetch`` is set.
+    prefetch_backend : ``{'thread', 'process'}``, optional
+        Whether the background workers are threads or processes. Threads
+        are sufficient when importing is dominated by decoding, which
+        releases the GIL.
+    manifest : `bool`, optional
+        If ``True``, the files matching the glob are recorded in a
+        ``.menpo_manifest`` file in the directory being searched. Subsequent
+        imports with the same pattern reuse it without listing the
+        directories again, as long as none of them have been modified.
+    shard : ``(index, count)`` `tuple` of `int`, optional
+        If provided, the files are split in to ``count`` disjoint shards and
+        only the files of shard ``index`` are imported. By default, shard
+        ``index`` takes every ``count``-th file from position ``index``.
+        Every process that uses the same pattern (and ``seed``) sees the
+        same partition, so a job can be split across workers or nodes
+        without coordination. A ``seed`` is required to shuffle shards.
+    shard_by_size : `bool`, optional
+        If ``True``, the shards are instead balanced by the total size of
+        their files on disk. The sizes are read from the manifest if
+        ``manifest`` is ``True`` (so every node agrees on them), otherwise
+        each file is stat-ed. If any size cannot be read, the default split
+        is used.
+    seed : `int`, optional
+        The seed of the random number generator used if ``shuffle`` is
+        ``True``, making the shuffled order reproducible. If ``None``, the
+        global random state is used.
 
     Returns
     -------
@@ -438,13 +773,19 @@ def import_pickles(pattern, max_pickles=None, shuffle=False,
         max_assets=max_pickles, shuffle=shuffle,
         as_generator=as_generator,
         verbose=verbose,
+        prefetch=prefetch, workers=workers,
+        prefetch_backend=prefetch_backend, manifest=manifest,
+        shard=shard, shard_by_size=shard_by_size, seed=seed,
         importer_kwargs=kwargs
     )
 
 
 def import_images(pattern, max_images=None, shuffle=False,
                   landmark_resolver=same_name, normalize=None,
-                  normalise=None, as_generator=False, verbose=False):
+                  normalise=None, as_generator=False, verbose=False,
+                  prefetch=None, workers=1, prefetch_backend='thread',
+                  scale_hint=None, manifest=False, shard=None,
+                  shard_by_size=False, seed=None):
     r"""Multiple image (and associated landmarks) importer.
 
     For each image found creates an importer than returns a :map:`Image` or
@@ -494,6 +835,47 @@ def import_images(pattern, max_images=None, shuffle=False,
     verbose : `bool`, optional
         If ``True`` progress of the importing will be dynamically reported with
         a progress bar.
+    prefetch : positive `int`, optional
+        Only valid if ``as_generator`` is ``True``. If not ``None``, up to
+        ``prefetch`` images are imported ahead of the consumer in the
+        background. The order of the yielded images is unchanged and any
+        error raised while importing is re-raised when the failing image is
+        reached.
+    workers : positive `int`, optional
+        The number of background workers used when ``prefetch`` is set.
+    prefetch_backend : ``{'thread', 'process'}``, optional
+        Whether the background workers are threads or processes. Threads
+        are sufficient when importing is dominated by decoding, which
+        releases the GIL.
+    manifest : `bool`, optional
+        If ``True``, the files matching the glob are recorded in a
+        ``.menpo_manifest`` file in the directory being searched. Subsequent
+        imports with the same pattern reuse it without listing the
+        directories again, as long as none of them have been modified.
+    shard : ``(index, count)`` `tuple` of `int`, optional
+        If provided, the files are split in to ``count`` disjoint shards and
+        only the files of shard ``index`` are imported. By default, shard
+        ``index`` takes every ``count``-th file from position ``index``.
+        Every process that uses the same pattern (and ``seed``) sees the
+        same partition, so a job can be split across workers or nodes
+        without coordination. A ``seed`` is required to shuffle shards.
+    shard_by_size : `bool`, optional
+        If ``True``, the shards are instead balanced by the total size of
+        their files on disk. The sizes are read from the manifest if
+        ``manifest`` is ``True`` (so every node agrees on them), otherwise
+        each file is stat-ed. If any size cannot be read, the default split
+        is used.
+    seed : `int`, optional
+        The seed of the random number generator used if ``shuffle`` is
+        ``True``, making the shuffled order reproducible. If ``None``, the
+        global random state is used.
+    scale_hint : `float` in ``(0, 1]``, optional
+        If not ``None``, the scale the images are going to be rescaled by
+        after importing. Where the format supports it (JPEG), each image is
+        decoded directly at the smallest reduced resolution that is at least
+        this scale, which is much faster than a full decode. The scale
+        actually applied is stored as ``image.draft_scale`` and any attached
+        landmarks are scaled to match.
 
     Returns
     -------
@@ -518,6 +900,8 @@ def import_images(pattern, max_images=None, shuffle=False,
     normalize = _parse_deprecated_normalise(normalise, normalize)
 
     kwargs = {'normalize': normalize}
+    if scale_hint is not None:
+        kwargs['scale_hint'] = scale_hint
     return _import_glob_lazy_list(
         pattern, image_types,
         max_assets=max_images, shuffle=shuffle,
@@ -526,6 +910,9 @@ def import_images(pattern, max_images=None, shuffle=False,
         landmark_attach_func=_import_object_attach_landmarks,
         as_generator=as_generator,
         verbose=verbose,
+        prefetch=prefetch, workers=workers,
+        prefetch_backend=prefetch_backend, manifest=manifest,
+        shard=shard, shard_by_size=shard_by_size, seed=seed,
         importer_kwargs=kwargs
     )
 
@@ -533,7 +920,11 @@ def import_images(pattern, max_images=None, shuffle=False,
 def import_videos(pattern, max_videos=None, shuffle=False,
                   landmark_resolver=same_name_video, normalize=None,
                   normalise=None, importer_method='ffmpeg',
-                  exact_frame_count=True, as_generator=False, verbose=False):
+                  exact_frame_count=True, as_generator=False, verbose=False,
+                  prefetch=None, workers=1, prefetch_backend='thread',
+                  shape=None, crop=None, greyscale=False, fps=None,
+                  manifest=False, shard=None, shard_by_size=False,
+                  seed=None):
     r"""Multiple video (and associated landmarks) importer.
 
     For each video found yields a :map:`LazyList`. By default, landmark files
@@ -599,6 +990,52 @@ def import_videos(pattern, max_videos=None, shuffle=False,
     verbose : `bool`, optional
         If ``True`` progress of the importing will be dynamically reported with
         a progress bar.
+    prefetch : positive `int`, optional
+        Only valid if ``as_generator`` is ``True``. If not ``None``, up to
+        ``prefetch`` videos are imported ahead of the consumer in the
+        background. The order of the yielded videos is unchanged and any
+        error raised while importing is re-raised when the failing video is
+        reached.
+    workers : positive `int`, optional
+        The number of background workers used when ``prefetch`` is set.
+    prefetch_backend : ``{'thread'}``, optional
+        The background workers must be threads, as an imported video holds
+        an open decoder that cannot be sent between processes.
+    manifest : `bool`, optional
+        If ``True``, the files matching the glob are recorded in a
+        ``.menpo_manifest`` file in the directory being searched. Subsequent
+        imports with the same pattern reuse it without listing the
+        directories again, as long as none of them have been modified.
+    shard : ``(index, count)`` `tuple` of `int`, optional
+        If provided, the files are split in to ``count`` disjoint shards and
+        only the files of shard ``index`` are imported. By default, shard
+        ``index`` takes every ``count``-th file from position ``index``.
+        Every process that uses the same pattern (and ``seed``) sees the
+        same partition, so a job can be split across workers or nodes
+        without coordination. A ``seed`` is required to shuffle shards.
+    shard_by_size : `bool`, optional
+        If ``True``, the shards are instead balanced by the total size of
+        their files on disk. The sizes are read from the manifest if
+        ``manifest`` is ``True`` (so every node agrees on them), otherwise
+        each file is stat-ed. If any size cannot be read, the default split
+        is used.
+    seed : `int`, optional
+        The seed of the random number generator used if ``shuffle`` is
+        ``True``, making the shuffled order reproducible. If ``None``, the
+        global random state is used.
+    shape : ``(height, width)`` `tuple` of `int`, optional
+        If not ``None``, every frame is resized to this shape (after
+        cropping) by ffmpeg as it is decoded. Landmarks are resized to match.
+    crop : ``(min_indices, max_indices)``, optional
+        If not ``None``, every frame is cropped by ffmpeg to the region
+        between the ``(y, x)`` indices ``min_indices`` (inclusive) and
+        ``max_indices`` (exclusive) of the original frame. Landmarks are
+        cropped to match.
+    greyscale : `bool`, optional
+        If ``True``, every frame is converted to greyscale by ffmpeg.
+    fps : `float`, optional
+        If not ``None``, every video is resampled to this frame rate by
+        ffmpeg. Landmarks are resolved for the closest original frame.
 
     Returns
     -------
@@ -609,7 +1046,8 @@ def import_videos(pattern, max_videos=None, shuffle=False,
     Raises
     ------
     ValueError
-        If no videos are found at the provided glob.
+        If no videos are found at the provided glob or ``prefetch_backend``
+        is not ``'thread'``.
 
     Examples
     --------
@@ -624,8 +1062,15 @@ def import_videos(pattern, max_videos=None, shuffle=False,
     >>>    videos.append(frames)
     """
     normalize = _parse_deprecated_normalise(normalise, normalize)
+    if prefetch_backend != 'thread':
+        raise ValueError("Videos can only be prefetched with the 'thread' "
+                         "backend ({} provided) - an imported video holds an "
+                         "open decoder that cannot be "
+                         "pickled.".format(prefetch_backend))
 
     kwargs = {'normalize': normalize, 'exact_frame_count':exact_frame_count}
+    kwargs.update(_video_filter_kwargs(shape=shape, crop=crop,
+                                       greyscale=greyscale, fps=fps))
     video_importer_methods = {'ffmpeg': ffmpeg_video_types}
     if importer_method not in video_importer_methods:
         raise ValueError('Unsupported importer method requested. Valid values '
@@ -639,12 +1084,18 @@ def import_videos(pattern, max_videos=None, shuffle=False,
         landmark_attach_func=_import_lazylist_attach_landmarks,
         as_generator=as_generator,
         verbose=verbose,
+        prefetch=prefetch, workers=workers,
+        prefetch_backend=prefetch_backend, manifest=manifest,
+        shard=shard, shard_by_size=shard_by_size, seed=seed,
         importer_kwargs=kwargs
     )
 
 
 def import_landmark_files(pattern, max_landmarks=None, shuffle=False,
-                          as_generator=False, verbose=False):
+                          as_generator=False, verbose=False, prefetch=None,
+                          workers=1, prefetch_backend='thread', packed=False,
+                          manifest=False, shard=None, shard_by_size=False,
+                          seed=None):
     r"""Import Multiple landmark files.
 
     For each landmark file found returns an importer then
@@ -674,6 +1125,47 @@ def import_landmark_files(pattern, max_landmarks=None, shuffle=False,
         one after another when the generator is iterated over.
     verbose : `bool`, optional
         If ``True`` progress of the importing will be dynamically reported.
+    prefetch : positive `int`, optional
+        Only valid if ``as_generator`` is ``True``. If not ``None``, up to
+        ``prefetch`` landmark files are imported ahead of the consumer in the
+        background. The order of the yielded landmark files is unchanged and any
+        error raised while importing is re-raised when the failing landmark file is
+        reached.
+    workers : positive `int`, optional
+        The number of background workers used when ``prefetch`` is set.
+    prefetch_backend : ``{'thread', 'process'}``, optional
+        Whether the background workers are threads or processes. Threads
+        are sufficient when importing is dominated by decoding, which
+        releases the GIL.
+    manifest : `bool`, optional
+        If ``True``, the files matching the glob are recorded in a
+        ``.menpo_manifest`` file in the directory being searched. Subsequent
+        imports with the same pattern reuse it without listing the
+        directories again, as long as none of them have been modified.
+    shard : ``(index, count)`` `tuple` of `int`, optional
+        If provided, the files are split in to ``count`` disjoint shards and
+        only the files of shard ``index`` are imported. By default, shard
+        ``index`` takes every ``count``-th file from position ``index``.
+        Every process that uses the same pattern (and ``seed``) sees the
+        same partition, so a job can be split across workers or nodes
+        without coordination. A ``seed`` is required to shuffle shards.
+    shard_by_size : `bool`, optional
+        If ``True``, the shards are instead balanced by the total size of
+        their files on disk. The sizes are read from the manifest if
+        ``manifest`` is ``True`` (so every node agrees on them), otherwise
+        each file is stat-ed. If any size cannot be read, the default split
+        is used.
+    seed : `int`, optional
+        The seed of the random number generator used if ``shuffle`` is
+        ``True``, making the shuffled order reproducible. If ``None``, the
+        global random state is used.
+    packed : `bool`, optional
+        If ``True``, every landmark file is imported immediately and the
+        points are returned as a single ``(n_files, n_points, n_dims)``
+        array, along with the landmarks of the first file as a template
+        for the shared labels and connectivity. The landmarks of file ``i``
+        can be rebuilt with ``template.from_vector(points[i].ravel())``.
+        Requires every file to share the same layout.
 
     Returns
     -------
@@ -681,42 +1173,142 @@ def import_landmark_files(pattern, max_landmarks=None, shuffle=False,
         A :map:`LazyList` or generator yielding :map:`PointCloud` or
         :map:`LabelledPointUndirectedGraph` instances found to match the glob
         pattern provided.
+    (points, template) : ``(n_files, n_points, n_dims)`` `ndarray` and :map:`PointCloud`
+        Returned instead if ``packed`` is ``True``.
 
     Raises
     ------
     ValueError
         If no landmarks are found at the provided glob.
+    ValueError
+        If ``packed`` is ``True`` and the landmark files do not share the
+        same number of points, labels and connectivity.
     """
-    return _import_glob_lazy_list(pattern, image_landmark_types,
-                                  max_assets=max_landmarks, shuffle=shuffle,
-                                  as_generator=as_generator, verbose=verbose)
+    if packed and as_generator:
+        raise ValueError('packed landmarks cannot be returned as a generator')
+    landmarks = _import_glob_lazy_list(pattern, image_landmark_types,
+                                       max_assets=max_landmarks,
+                                       shuffle=shuffle,
+                                       as_generator=as_generator,
+                                       verbose=verbose and not packed,
+                                       prefetch=prefetch, workers=workers,
+                                       prefetch_backend=prefetch_backend,
+                                       manifest=manifest, shard=shard,
+                                       shard_by_size=shard_by_size,
+                                       seed=seed)
+    if packed:
+        return _pack_landmarks(landmarks, verbose=verbose)
+    return landmarks
+
+
+def _same_landmark_layout(a, b):
+    r"""
+    Whether two landmark groups have the same type, number of points, labels
+    and connectivity (and so differ only in their point values).
+    """
+    if type(a) is not type(b) or a.points.shape != b.points.shape:
+        return False
+    if hasattr(a, 'edges') and not np.array_equal(a.edges, b.edges):
+        return False
+    if hasattr(a, '_labels_to_masks'):
+        a_masks, b_masks = a._labels_to_masks, b._labels_to_masks
+        return (list(a_masks.keys()) == list(b_masks.keys()) and
+                all(np.array_equal(a_masks[l], b_masks[l]) for l in a_masks))
+    return True
+
+
+def _pack_landmarks(landmarks, verbose=False):
+    r"""
+    Stack the points of a sequence of landmark groups that share a layout in
+    to a single ``(n_files, n_points, n_dims)`` array. Returns the array and
+    the first landmark group (as the template of the shared layout).
+    """
+    n_files = len(landmarks)
+    if verbose:
+        landmarks = print_progress(landmarks, prefix='Importing landmarks',
+                                   n_items=n_files)
+    template, points = None, None
+    for i, lmarks in enumerate(landmarks):
+        if template is None:
+            template = lmarks
+            points = np.empty((n_files,) + lmarks.points.shape)
+        elif not _same_landmark_layout(template, lmarks):
+            path = getattr(lmarks, 'path', 'landmark file {}'.format(i))
+            raise ValueError('{} does not share the layout of the first '
+                             'landmark file ({} points) - cannot '
+                             'pack.'.format(path, template.n_points))
+        points[i] = lmarks.points
+    return points, template
 
 
 def _import_glob_lazy_list(pattern, extension_map, max_assets=None,
                            landmark_resolver=same_name, shuffle=False,
                            as_generator=False, landmark_ext_map=None,
                            landmark_attach_func=None, importer_kwargs=None,
-                           verbose=False):
-    filepaths = list(glob_with_suffix(pattern, extension_map,
-                                      sort=(not shuffle)))
+                           verbose=False, prefetch=None, workers=1,
+                           prefetch_backend='thread', manifest=False,
+                           shard=None, shard_by_size=False, seed=None):
+    if prefetch is not None and not as_generator:
+        raise ValueError('prefetch is only supported when as_generator is '
+                         'True - index the returned LazyList instead.')
+    if shard is not None and shuffle and seed is None:
+        # Every process would shuffle differently, so the shards would
+        # neither be disjoint nor reproducible
+        raise ValueError('A seed must be provided to shuffle a shard, so '
+                         'that every process shuffles the same way.')
+    # A seeded shuffle is only reproducible from a canonical order
+    filepaths = list(glob_with_suffix(
+        pattern, extension_map, sort=(not shuffle or seed is not None),
+        manifest=manifest))
     if shuffle:
-        random.shuffle(filepaths)
+        if seed is None:
+            random.shuffle(filepaths)
+        else:
+            random.Random(seed).shuffle(filepaths)
     if (max_assets is not None) and max_assets <= 0:
         raise ValueError('Max elements should be positive'
                          ' ({} provided)'.format(max_assets))
     elif max_assets:
         filepaths = filepaths[:max_assets]
+    if shard is not None:
+        sizes = None
+        if shard_by_size:
+            sizes = _file_sizes(filepaths, pattern, manifest=manifest)
+        filepaths = _shard_filepaths(filepaths, shard, sizes=sizes)
 
     n_files = len(filepaths)
-    if n_files == 0:
+    if n_files == 0 and shard is not None:
+        raise ValueError('Shard {} of the glob {} contains no '
+                         'assets'.format(shard, pattern))
+    elif n_files == 0:
         raise ValueError('The glob {} yields no assets'.format(pattern))
 
-    lazy_list = LazyList([partial(_import, f, extension_map,
-                                  landmark_resolver=landmark_resolver,
-                                  landmark_ext_map=landmark_ext_map,
-                                  landmark_attach_func=landmark_attach_func,
-                                  importer_kwargs=importer_kwargs)
-                          for f in filepaths])
+    initializer, initargs = None, ()
+    if landmark_resolver is same_name and landmark_ext_map is not None:
+        # Globbing for landmarks once per asset is quadratic for large flat
+        # directories - index each directory once up front instead.
+        index = landmark_stem_index(filepaths, landmark_ext_map)
+        if prefetch is not None and prefetch_backend == 'process':
+            # Every importer is pickled - send the index to each process once
+            landmark_resolver = _same_name_worker_indexed
+            initializer, initargs = _set_worker_stem_index, (index,)
+        else:
+            landmark_resolver = partial(same_name_indexed, index=index)
+
+    importers = [partial(_import, f, extension_map,
+                         landmark_resolver=landmark_resolver,
+                         landmark_ext_map=landmark_ext_map,
+                         landmark_attach_func=landmark_attach_func,
+                         importer_kwargs=importer_kwargs)
+                 for f in filepaths]
+    if prefetch is not None:
+        # decode ahead of the consumer on a bounded pool of workers
+        lazy_list = prefetch_callables(importers, prefetch, workers=workers,
+                                       backend=prefetch_backend,
+                                       initializer=initializer,
+                                       initargs=initargs)
+    else:
+        lazy_list = LazyList(importers)
 
     if verbose and as_generator:
         # wrap the generator with the progress reporter
@@ -732,6 +1324,86 @@ def _import_glob_lazy_list(pattern, extension_map, max_assets=None,
         return lazy_list
 
 
+def _file_sizes(filepaths, pattern, manifest=False):
+    r"""
+    The size on disk of each of ``filepaths``, read from the manifest of
+    ``pattern`` where it records them. Returns ``None`` if the size of any
+    file cannot be found.
+    """
+    recorded = _manifest_file_sizes(pattern) if manifest else None
+    sizes = []
+    for path in filepaths:
+        size = None if recorded is None else recorded.get(str(path))
+        if size is None:
+            try:
+                size = path.stat().st_size
+            except OSError:
+                return None
+        sizes.append(size)
+    return sizes
+
+
+def _shard_filepaths(filepaths, shard, sizes=None):
+    r"""
+    The filepaths belonging to one shard of a deterministic partition of
+    ``filepaths``. The relative order of the filepaths within the shard is
+    preserved.
+
+    Parameters
+    ----------
+    filepaths : `list` of `pathlib.Path`
+        The filepaths to partition.
+    shard : ``(index, count)`` `tuple` of `int`
+        The index of the shard to return and the total number of shards.
+    sizes : `list` of `int`, optional
+        The size of each filepath. If provided, the shards are balanced to
+        have (approximately) equal total size, otherwise every ``count``-th
+        filepath is taken.
+
+    Returns
+    -------
+    filepaths : `list` of `pathlib.Path`
+        The filepaths of the shard ``index``.
+
+    Raises
+    ------
+    ValueError
+        If ``shard`` is not a valid ``(index, count)`` pair.
+    """
+    try:
+        index, count = shard
+    except (TypeError, ValueError):
+        raise ValueError('shard must be an (index, count) tuple '
+                         '({} provided)'.format(shard))
+    if count < 1 or not 0 <= index < count:
+        raise ValueError('shard index must be in [0, {}) and count must be '
+                         'positive ({} provided)'.format(count, shard))
+    if sizes is None:
+        return filepaths[index::count]
+    # Greedily assign the largest remaining file to the lightest shard - ties
+    # are broken by position and shard index, so every process agrees.
+    totals = [(0, k) for k in range(count)]
+    selected = []
+    for neg_size, i in sorted((-size, i) for i, size in enumerate(sizes)):
+        total, k = heapq.heappop(totals)
+        if k == index:
+            selected.append(i)
+        heapq.heappush(totals, (total - neg_size, k))
+    return [filepaths[i] for i in sorted(selected)]
+
+
+# Landmark importers that scale their points by the shape of the asset, and
+# so are already correct for an image that was decoded at reduced resolution.
+_asset_relative_landmark_importers = {asf_importer}
+
+
+def _is_asset_relative(lm_path, landmark_ext_map):
+    importer = importer_for_filepath(_norm_path(lm_path), landmark_ext_map)
+    # Image landmark importers are partials of the plain landmark importers
+    return getattr(importer, 'func', importer) in \
+        _asset_relative_landmark_importers
+
+
 def _import_object_attach_landmarks(built_objects, landmark_resolver,
                                     landmark_ext_map=None):
     # handle landmarks
@@ -740,9 +1412,15 @@ def _import_object_attach_landmarks(built_objects, landmark_resolver,
             lm_paths = landmark_resolver(x.path)
             if lm_paths is None:
                 continue
+            # Set by importers that decoded at a reduced resolution
+            draft_scale = getattr(x, 'draft_scale', None)
             for group_name, lm_path in lm_paths.items():
                 lms = _import(lm_path, landmark_ext_map, asset=x)
                 if x.n_dims == lms.n_dims:
+                    if draft_scale is not None and not _is_asset_relative(
+                            lm_path, landmark_ext_map):
+                        from menpo.transform import Scale
+                        lms = Scale(draft_scale).apply(lms)
                     x.landmarks[group_name] = lms
 
 
@@ -753,25 +1431,45 @@ def _import_lazylist_attach_landmarks(built_objects, landmark_resolver,
         for k, x in enumerate(built_objects):
             # Use the users function to find landmarks - builds a list
             # of functions that we will map against the frames in order to
-            # attach a landmark per frame.
-            lm_resolvers = [partial(landmark_resolver, x.path, i)
-                            for i in range(len(x))]
-
-            def wrap_landmarks(lm_resolver, obj):
+            # attach a landmark per frame. Resampled videos are annotated
+            # with the frame numbers of the original video.
+            source_frames = getattr(x, 'source_frame_indices', None)
+            if source_frames is None:
+                source_frames = range(len(x))
+            lm_resolvers = [partial(landmark_resolver, x.path, int(i))
+                            for i in source_frames]
+            # Set by importers that crop or resize the frames
+            frame_transform = getattr(x, 'frame_transform', None)
+
+            def wrap_landmarks(lm_resolver, obj,
+                               frame_transform=frame_transform):
                 lm_paths = lm_resolver()
                 for group_name, lm_path in lm_paths.items():
                     lms = _import(lm_path, landmark_ext_map, asset=obj)
                     if obj.n_dims == lms.n_dims:
+                        if frame_transform is not None and \
+                                not _is_asset_relative(lm_path,
+                                                       landmark_ext_map):
+                            lms = frame_transform.apply(lms)
                         obj.landmarks[group_name] = lms
                 return obj
 
             # Provide the lm_resolver for each wrap_landmarks function and then
             # lazily map against the underlying importers.
-            new_ll = x.map([partial(wrap_landmarks, lmr)
-                            for lmr in lm_resolvers])
+            wrappers = [partial(wrap_landmarks, lmr) for lmr in lm_resolvers]
+            new_ll = x.map(wrappers)
+            if hasattr(x, 'iter_parallel'):
+                new_ll.iter_parallel = partial(_iter_parallel_attach_landmarks,
+                                               x.iter_parallel, wrappers)
             built_objects[k] = new_ll
 
 
+def _iter_parallel_attach_landmarks(iter_parallel, wrappers, *args, **kwargs):
+    # Attach the landmarks of each frame yielded by a parallel video iterator
+    for frame, wrap_landmarks in zip(iter_parallel(*args, **kwargs), wrappers):
+        yield wrap_landmarks(frame)
+
+
 def _import(filepath, extensions_map, landmark_resolver=same_name,
             landmark_ext_map=None, landmark_attach_func=None,
             asset=None, importer_kwargs=None):
@@ -817,7 +1515,14 @@ def _import(filepath, extensions_map, landmark_resolver=same_name,
     importer_callable = importer_for_filepath(path, extensions_map)
     if importer_kwargs is None:
         importer_kwargs = {}
-    built_objects = importer_callable(path, asset=asset, **importer_kwargs)
+    cache = get_import_cache()
+    if cache is not None:
+        built_objects = cache.import_asset(importer_callable, path,
+                                           asset=asset,
+                                           importer_kwargs=importer_kwargs)
+    else:
+        built_objects = importer_callable(path, asset=asset,
+                                          **importer_kwargs)
 
     # landmarks are iterable so check for list precisely
     if not isinstance(built_objects, list):
@@ -841,24 +1546,10 @@ def _import(filepath, extensions_map, landmark_resolver=same_name,
     return built_objects
 
 
-def _pathlib_glob_for_pattern(pattern, sort=True):
-    r"""Generator for glob matching a string path pattern
-
-    Splits the provided ``pattern`` into a root path for pathlib and a
-    subsequent glob pattern to be applied.
-
-    Parameters
-    ----------
-    pattern : `str`
-        Path including glob patterns. If no glob patterns are present and the
-        pattern is a dir, a '**/*' pattern will be automatically added.
-    sort : `bool`, optional
-        If True, the returned paths will be sorted. If False, no guarantees are
-        made about the ordering of the results.
-
-    Yields
-    ------
-    Path : A path to a file matching the provided pattern.
+def _split_glob_pattern(pattern):
+    r"""
+    Split a string path pattern into a root directory and the subsequent
+    glob pattern (relative to the root) to be applied.
 
     Raises
     ------
@@ -884,14 +1575,225 @@ def _pathlib_glob_for_pattern(pattern, sort=True):
         # to the nearest dir and add the reminder to the pattern
         preglob, pattern_prefix = os.path.split(preglob)
         pattern = pattern_prefix + pattern
-    p = Path(preglob)
-    paths = p.glob(str(pattern))
-    if sort:
-        paths = sorted(paths)
+    return preglob, pattern
+
+
+def _compile_glob_parts(pattern):
+    r"""
+    Compile each path segment of a relative glob pattern in to a name
+    matching callable. Recursive ``'**'`` segments are represented by
+    ``None``.
+    """
+    separators = '[{}]'.format(re.escape(os.sep + (os.altsep or '')))
+    return [None if part == '**' else
+            re.compile(fnmatch.translate(os.path.normcase(part))).match
+            for part in re.split(separators, pattern) if part]
+
+
+def _scan_dir(directory):
+    r"""
+    List a directory as ``(name, is_dir)`` pairs, using the type information
+    cached by ``scandir`` to avoid a ``stat`` per entry where possible.
+    """
+    if scandir is None:
+        return [(name, os.path.isdir(os.path.join(directory, name)))
+                for name in os.listdir(directory)]
+    return [(e.name, e.is_dir()) for e in scandir(directory)]
+
+
+def _walk_glob(root, parts, sort=True, name_filter=None, dir_mtimes=None):
+    r"""
+    Generator walking the directory tree below ``root``, yielding the path
+    of each file that matches the compiled glob ``parts``. Each directory is
+    listed at most once and only descended in to if it can lead to a match.
+
+    Sorting is performed per directory, so results are yielded in the same
+    order as sorting the full list of paths without it ever being
+    materialised. If ``dir_mtimes`` is provided, the modification time of
+    every directory listed is recorded in to it.
+    """
+    n_parts = len(parts)
+
+    def closure(states):
+        # a '**' segment may also match zero directories
+        stack = list(states)
+        while stack:
+            i = stack.pop()
+            if i < n_parts and parts[i] is None and i + 1 not in states:
+                states.add(i + 1)
+                stack.append(i + 1)
+        return states
+
+    def walk(directory, states):
+        try:
+            # stat before listing - a change during the listing then
+            # invalidates any manifest built from it
+            mtime = os.stat(directory).st_mtime if dir_mtimes is not None \
+                else None
+            entries = _scan_dir(directory)
+        except OSError:
+            return
+        if dir_mtimes is not None:
+            dir_mtimes[directory] = mtime
+        if sort:
+            entries.sort()
+        for name, is_dir in entries:
+            norm_name = os.path.normcase(name)
+            next_states = set()
+            for i in states:
+                if i == n_parts:
+                    continue
+                elif parts[i] is None:
+                    if is_dir:
+                        next_states.add(i)
+                elif parts[i](norm_name):
+                    next_states.add(i + 1)
+            if not next_states:
+                continue
+            next_states = closure(next_states)
+            path = os.path.join(directory, name)
+            if is_dir:
+                next_states.discard(n_parts)
+                if next_states:
+                    for p in walk(path, next_states):
+                        yield p
+            elif n_parts in next_states and (name_filter is None or
+                                             name_filter(name)):
+                yield path
+
+    return walk(root, closure({0}))
+
+
+def _load_manifest(manifest_path):
+    try:
+        with open(manifest_path, 'r') as f:
+            return json.load(f)
+    except (IOError, OSError, ValueError):
+        return {}
+
+
+def _manifest_is_valid(root, entry):
+    for directory, mtime in entry['dirs'].items():
+        try:
+            if os.stat(os.path.join(root, directory)).st_mtime != mtime:
+                return False
+        except OSError:
+            return False
+    return True
+
+
+def _manifest_glob(root, pattern, parts):
+    r"""
+    The (sorted) paths matching ``pattern`` below ``root``, as recorded in the
+    ``.menpo_manifest`` file of ``root``. The manifest is only trusted if the
+    modification time of every directory that was listed to build it is
+    unchanged, otherwise the directories are walked again and the manifest is
+    rewritten (if possible).
+    """
+    manifest_path = os.path.join(root, _MANIFEST_NAME)
+    manifest = _load_manifest(manifest_path)
+    entry = manifest.get(pattern)
+    if entry is not None and _manifest_is_valid(root, entry):
+        return [os.path.join(root, f) for f in entry['files']]
+
+    try:
+        # Creating the manifest modifies the root directory, so make sure it
+        # exists before the walk. Afterwards it is rewritten in place, which
+        # leaves the modification time of the directory unchanged.
+        if not os.path.exists(manifest_path):
+            open(manifest_path, 'a').close()
+        writable = True
+    except (IOError, OSError):
+        writable = False  # e.g. a read-only dataset
+    dir_mtimes = {}
+    paths = [p for p in _walk_glob(root, parts, dir_mtimes=dir_mtimes)
+             if os.path.basename(p) != _MANIFEST_NAME]
+    if writable:
+        entry = {'dirs': {os.path.relpath(d, root): m
+                          for d, m in dir_mtimes.items()},
+                 'files': [os.path.relpath(p, root) for p in paths]}
+        try:
+            # Recorded once here so that sharding by size needs no stats
+            entry['sizes'] = [os.stat(p).st_size for p in paths]
+        except OSError:
+            pass
+        manifest[pattern] = entry
+        try:
+            with open(manifest_path, 'w') as f:
+                json.dump(manifest, f)
+        except (IOError, OSError):
+            pass
     return paths
 
 
-def glob_with_suffix(pattern, extensions_map, sort=True):
+def _manifest_file_sizes(pattern):
+    r"""
+    The file sizes recorded in the ``.menpo_manifest`` entry of ``pattern``,
+    as a `dict` from path to size, or ``None`` if the entry is missing, stale
+    or has no sizes.
+    """
+    root, pattern = _split_glob_pattern(pattern)
+    entry = _load_manifest(os.path.join(root, _MANIFEST_NAME)).get(pattern)
+    if (entry is None or 'sizes' not in entry or
+            not _manifest_is_valid(root, entry)):
+        return None
+    return {str(Path(os.path.join(root, f))): size
+            for f, size in zip(entry['files'], entry['sizes'])}
+
+
+def _glob_for_pattern(pattern, sort=True, name_filter=None, manifest=False):
+    r"""Generator for glob matching a string path pattern
+
+    Splits the provided ``pattern`` into a root path and a subsequent glob
+    pattern which is matched by walking the directories below the root.
+
+    Parameters
+    ----------
+    pattern : `str`
+        Path including glob patterns. If no glob patterns are present and the
+        pattern is a dir, a '*' pattern will be automatically added.
+    sort : `bool`, optional
+        If True, the returned paths will be sorted. If False, no guarantees are
+        made about the ordering of the results.
+    name_filter : `callable`, optional
+        If provided, only files whose name passes ``name_filter(name)`` are
+        yielded. Applied during the walk.
+    manifest : `bool`, optional
+        If ``True``, the matches are read from (and recorded in) a
+        ``.menpo_manifest`` file in the root directory, which is validated
+        against the modification times of the directories that were listed.
+
+    Yields
+    ------
+    Path : A path to a file matching the provided pattern.
+
+    Raises
+    ------
+    ValueError
+        If the pattern doesn't contain a '*' wildcard and is not a directory
+    """
+    root, pattern = _split_glob_pattern(pattern)
+    parts = _compile_glob_parts(pattern)
+    if manifest:
+        paths = _manifest_glob(root, pattern, parts)
+        if name_filter is not None:
+            paths = [p for p in paths if name_filter(os.path.basename(p))]
+    else:
+        paths = _walk_glob(root, parts, sort=sort, name_filter=name_filter)
+    for p in paths:
+        yield Path(p)
+
+
+def _possible_extensions_from_name(name):
+    r"""
+    The equivalent of :func:`_possible_extensions_from_filepath` for a file
+    name, without the cost of building a `Path`.
+    """
+    name = name.lstrip('.').lower()
+    return [name[i:] for i, c in enumerate(name) if c == '.']
+
+
+def glob_with_suffix(pattern, extensions_map, sort=True, manifest=False):
     r"""
     Filters the results from the glob pattern passed in to only those files
     that have an importer given in `extensions_map`.
@@ -907,16 +1809,22 @@ def glob_with_suffix(pattern, extensions_map, sort=True):
     sort : `bool`, optional
         If True, the returned paths will be sorted. If False, no guarantees are
         made about the ordering of the results.
+    manifest : `bool`, optional
+        If ``True``, reuse (or create) a ``.menpo_manifest`` file recording
+        the matches of the pattern, so that repeated globs of an unchanged
+        directory tree skip listing it.
 
     Yields
     ------
     filepaths : list of string
         The list of filepaths that have valid extensions.
     """
-    for path in _pathlib_glob_for_pattern(pattern, sort=sort):
-        possible_exts = _possible_extensions_from_filepath(path)
-        if any([ext in extensions_map for ext in possible_exts]):
-            yield path
+    def has_importer(name):
+        return any([ext in extensions_map
+                    for ext in _possible_extensions_from_name(name)])
+
+    return _glob_for_pattern(pattern, sort=sort, name_filter=has_importer,
+                             manifest=manifest)
 
 
 def importer_for_filepath(filepath, extensions_map):
@@ -1,8 +1,10 @@
 from .landmark import lm2_importer, ljson_importer
-from .image import pillow_importer, abs_importer, flo_importer
+from .image import (pillow_importer, abs_importer, flo_importer,
+                    pillow_metadata, abs_metadata, flo_metadata)
 from .video import ffmpeg_types, ffmpeg_importer
 from .landmark_image import asf_image_importer, pts_image_importer
-from .pickle import pickle_importer, pickle_gzip_importer
+from .pickle import (pickle_importer, pickle_gzip_importer, pickle_bz2_importer,
+                     pickle_xz_importer, pickle_bgz_importer, mpkl_importer)
 
 
 image_types = {'.bmp': pillow_importer,
@@ -31,6 +33,13 @@ image_types = {'.bmp': pillow_importer,
                '.abs': abs_importer,
                '.flo': flo_importer}
 
+# Header-only readers for the importers above (see image_metadata). They are
+# keyed by importer, so an extension that is registered with another importer
+# is never read by the header reader of the default one.
+image_metadata_readers = {pillow_importer: pillow_metadata,
+                          abs_importer: abs_metadata,
+                          flo_importer: flo_metadata}
+
 
 ffmpeg_video_types = ffmpeg_types()
 ffmpeg_video_types['.gif'] = ffmpeg_importer
@@ -42,4 +51,8 @@ image_landmark_types = {'.asf': asf_image_importer,
                         '.ljson': ljson_importer}
 
 pickle_types = {'.pkl': pickle_importer,
-                '.pkl.gz': pickle_gzip_importer}
+                '.pkl.gz': pickle_gzip_importer,
+                '.pkl.bz2': pickle_bz2_importer,
+                '.pkl.xz': pickle_xz_importer,
+                '.pkl.bgz': pickle_bgz_importer,
+                '.mpkl': mpkl_importer}
@@ -4,11 +4,10 @@ import numpy as np
 from pathlib import Path
 
 from menpo.base import LazyList
-from menpo.image import Image, MaskedImage, BooleanImage
-from menpo.image.base import normalize_pixels_range, channels_to_front
 
 
 def _pil_to_numpy(pil_image, normalize, convert=None):
+    from menpo.image.base import normalize_pixels_range
     p = pil_image.convert(convert) if convert else pil_image
     p = np.asarray(p)
     if normalize:
@@ -17,7 +16,31 @@ def _pil_to_numpy(pil_image, normalize, convert=None):
         return p
 
 
-def pillow_importer(filepath, asset=None, normalize=True, **kwargs):
+def _pil_draft(pil_image, scale_hint):
+    r"""
+    Ask Pillow to decode at a reduced resolution that is at least
+    ``scale_hint`` times the size of the image. For JPEG images, this uses
+    draft mode to perform the reduction in the DCT domain (by a factor of
+    2, 4 or 8), which is considerably faster than decoding at full resolution
+    and rescaling. All other formats are left untouched.
+
+    Returns the ``(y, x)`` scale that was actually applied, or ``None`` if
+    the image will be decoded at full resolution.
+    """
+    if scale_hint is None or pil_image.format != 'JPEG':
+        return None
+    width, height = pil_image.size
+    requested = (int(np.ceil(width * scale_hint)),
+                 int(np.ceil(height * scale_hint)))
+    pil_image.draft(pil_image.mode, requested)
+    draft_width, draft_height = pil_image.size
+    if (draft_width, draft_height) == (width, height):
+        return None
+    return np.array([draft_height / float(height), draft_width / float(width)])
+
+
+def pillow_importer(filepath, asset=None, normalize=True, scale_hint=None,
+                    **kwargs):
     r"""
     Imports an image using PIL/pillow.
 
@@ -44,6 +67,14 @@ def pillow_importer(filepath, asset=None, normalize=True, **kwargs):
         If ``True``, normalize between 0.0 and 1.0 and convert to float. If
         ``False`` just pass whatever PIL imports back (according
         to types rules outlined in constructor).
+    scale_hint : `float` in ``(0, 1]``, optional
+        If not ``None``, the scale that the image is going to be rescaled by
+        after importing. JPEG images are then decoded directly at the
+        smallest reduced resolution (1/2, 1/4 or 1/8) that is still at least
+        this scale, which is much faster and uses much less memory than
+        decoding at full resolution. The exact scale that was applied is
+        recorded so that landmarks can be rescaled consistently. Other
+        formats are always decoded at full resolution.
     \**kwargs : `dict`, optional
         Any other keyword arguments.
 
@@ -51,12 +82,24 @@ def pillow_importer(filepath, asset=None, normalize=True, **kwargs):
     -------
     image : :map:`Image` or subclass
         The imported image.
+
+    Raises
+    ------
+    ValueError
+        If ``scale_hint`` is not in the range ``(0, 1]``.
     """
     import PIL.Image as PILImage
+    from menpo.image import Image, MaskedImage, BooleanImage
+    if scale_hint is not None and not 0 < scale_hint <= 1:
+        raise ValueError('scale_hint must be in the range (0, 1] '
+                         '({} provided)'.format(scale_hint))
     if isinstance(filepath, Path):
         filepath = str(filepath)
     pil_image = PILImage.open(filepath)
+    draft_scale = _pil_draft(pil_image, scale_hint)
     mode = pil_image.mode
+    if mode not in _PIL_MODE_N_CHANNELS:
+        raise ValueError('Unexpected mode for PIL: {}'.format(mode))
     if mode == 'RGBA':
         # If normalize is False, then we return the alpha as an extra
         # channel, which can be useful if the alpha channel has semantic
@@ -87,11 +130,87 @@ def pillow_importer(filepath, asset=None, normalize=True, **kwargs):
         # Don't normalize as we don't know the scale
         image = Image.init_from_channels_at_back(
             _pil_to_numpy(pil_image, False))
-    else:
-        raise ValueError('Unexpected mode for PIL: {}'.format(mode))
+    if draft_scale is not None:
+        # Duck-typed on (like path) so landmarks can be scaled to match
+        image.draft_scale = draft_scale
     return image
 
 
+# The number of channels of the image that pillow_importer returns for each
+# supported PIL mode (with normalisation - alpha is split in to the mask)
+_PIL_MODE_N_CHANNELS = {'1': 1, 'L': 1, 'I': 1, 'F': 1, 'P': 3, 'RGB': 3,
+                        'RGBA': 3}
+
+
+# The dtype of the pixels of each PIL mode (before any normalisation)
+_PIL_MODE_DTYPES = {'1': np.bool, 'L': np.uint8, 'LA': np.uint8,
+                    'P': np.uint8, 'RGB': np.uint8, 'RGBA': np.uint8,
+                    'CMYK': np.uint8, 'YCbCr': np.uint8, 'I': np.int32,
+                    'I;16': np.uint16, 'F': np.float32}
+
+
+def pillow_metadata(filepath):
+    r"""
+    Read the metadata of an image using PIL/pillow. Only the header of the
+    file is read - the pixels are never decoded.
+
+    Parameters
+    ----------
+    filepath : `Path`
+        Absolute filepath of image
+
+    Returns
+    -------
+    shape : `tuple` of `int`
+        The ``(height, width)`` of the image.
+    n_channels : `int`
+        The number of channels of the image returned by
+        :func:`pillow_importer` (with ``normalize=True``). For modes that
+        cannot be imported, the number of bands stored in the file.
+    mode : `str`
+        The PIL mode of the image (e.g. ``'RGB'``).
+    dtype : `np.dtype`
+        The dtype of the pixels stored in the file.
+    """
+    import PIL.Image as PILImage
+    pil_image = PILImage.open(str(filepath))
+    try:
+        width, height = pil_image.size
+        mode = pil_image.mode
+        n_channels = _PIL_MODE_N_CHANNELS.get(mode,
+                                              len(pil_image.getbands()))
+    finally:
+        if hasattr(pil_image, 'close'):
+            pil_image.close()
+    return ((height, width), n_channels, mode,
+            np.dtype(_PIL_MODE_DTYPES.get(mode, np.uint8)))
+
+
+def abs_metadata(filepath):
+    r"""
+    Read the metadata of an ABS file from its header. See
+    :func:`pillow_metadata` for the returned values.
+    """
+    import re
+
+    with open(str(filepath), 'r') as f:
+        n_rows = int(re.findall(u'([0-9]+) rows', f.readline())[0])
+        n_cols = int(re.findall(u'([0-9]+) columns', f.readline())[0])
+    return (n_rows, n_cols), 3, 'F', np.dtype(np.float64)
+
+
+def flo_metadata(filepath):
+    r"""
+    Read the metadata of a FLO file from its header. See
+    :func:`pillow_metadata` for the returned values.
+    """
+    with open(str(filepath), 'rb') as f:
+        if f.read(4) != b'PIEH':
+            raise ValueError('Invalid FLO file.')
+        width, height = np.fromfile(f, dtype=np.uint32, count=2)
+    return (int(height), int(width)), 2, 'F', np.dtype(np.float32)
+
+
 def abs_importer(filepath, asset=None, **kwargs):
     r"""
     Allows importing the ABS file format from the FRGC dataset.
@@ -114,6 +233,7 @@ def abs_importer(filepath, asset=None, **kwargs):
         The imported image.
     """
     import re
+    from menpo.image import MaskedImage
 
     with open(str(filepath), 'r') as f:
         # Currently these are unused, but they are in the format
@@ -158,6 +278,8 @@ def flo_importer(filepath, asset=None, **kwargs):
     image : :map:`Image` or subclass
         The imported image.
     """
+    from menpo.image import Image
+
     with open(str(filepath), 'rb') as f:
         fingerprint = f.read(4)
         if fingerprint != b'PIEH':
@@ -201,6 +323,8 @@ def imageio_importer(filepath, asset=None, normalize=True, **kwargs):
         The imported image.
     """
     import imageio
+    from menpo.image import Image, MaskedImage
+    from menpo.image.base import normalize_pixels_range, channels_to_front
 
     pixels = imageio.imread(str(filepath))
     pixels = channels_to_front(pixels)
@@ -250,6 +374,8 @@ def imageio_gif_importer(filepath, asset=None, normalize=True, **kwargs):
         of the GIF.
     """
     import imageio
+    from menpo.image import Image, MaskedImage
+    from menpo.image.base import normalize_pixels_range, channels_to_front
 
     reader = imageio.get_reader(str(filepath), format='gif', mode='I')
 
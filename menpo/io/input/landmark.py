@@ -109,6 +109,32 @@ def asf_importer(filepath, asset=None, **kwargs):
                                                         labels_to_masks)
 
 
+def _parse_pts_points(text):
+    r"""
+    Parse the points between the braces of a PTS file in to an
+    ``(n_points, 2)`` array of ``(x, y)`` coordinates, exactly as they appear
+    in the file.
+    """
+    start = text.find('{')
+    end = text.rfind('}')
+    if start < 0 or end < start:
+        raise ValueError('PTS landmarks are incorrectly formatted. Expected '
+                         'the points to be enclosed in braces.')
+    body = text[start + 1:end]
+    rows = [l.split() for l in body.splitlines() if l.strip()]
+    n_columns = len(rows[0]) if rows else 2
+    if all(len(r) == n_columns for r in rows):
+        # The common case - every row is just the same number of values
+        try:
+            values = np.array(body.split(), dtype=np.float)
+        except ValueError:
+            pass  # Non-numeric annotations - handled row by row below
+        else:
+            return values.reshape(len(rows), n_columns)[:, :2].copy()
+    # Ragged rows (e.g. trailing annotations), fall back to row by row
+    return np.array([r[:2] for r in rows], dtype=np.float).reshape(-1, 2)
+
+
 def pts_importer(filepath, asset=None, image_origin=True, **kwargs):
     r"""
     Importer for the PTS file format. Assumes version 1 of the format.
@@ -155,24 +181,14 @@ def pts_importer(filepath, asset=None, image_origin=True, **kwargs):
     landmarks : :map:`PointCloud`
         The landmarks including appropriate labels if available.
     """
-    f = open(str(filepath), 'r')
-    for line in f:
-        if line.split()[0] == '{':
-            break
-    xs = []
-    ys = []
-    for line in f:
-        if line.split()[0] != '}':
-            xpos, ypos = line.split()[0:2]
-            xs.append(xpos)
-            ys.append(ypos)
-    xs = np.array(xs, dtype=np.float).reshape((-1, 1))
-    ys = np.array(ys, dtype=np.float).reshape((-1, 1))
+    with open(str(filepath), 'r') as f:
+        xy = _parse_pts_points(f.read())
     # PTS landmarks are 1-based, need to convert to 0-based (subtract 1)
+    xy -= 1
     if image_origin:
-        points = np.hstack([ys - 1, xs - 1])
+        points = xy[:, ::-1].copy()
     else:
-        points = np.hstack([xs - 1, ys - 1])
+        points = xy
 
     return PointCloud(points, copy=False)
 
@@ -259,23 +275,15 @@ def lm2_importer(filepath, asset=None, **kwargs):
                          "Expected a list of coordinates beginning with "
                          "'2D Image coordinates:' "
                          "but found '{0}'".format(coords_str))
-    xs = []
-    ys = []
-    for i in range(num_points):
-        p = landmark_text.pop(0).split()
-        xs.append(float(p[0]))
-        ys.append(float(p[1]))
-
-    xs = np.array(xs, dtype=np.float).reshape((-1, 1))
-    ys = np.array(ys, dtype=np.float).reshape((-1, 1))
+    coords = landmark_text[:num_points]
+    xy = np.array([l.split()[:2] for l in coords],
+                  dtype=np.float).reshape(-1, 2)
 
     # Flip the x and y
-    points = np.hstack([ys, xs])
+    points = xy[:, ::-1].copy()
     # Create the mask whereby there is one landmark per label
     # (identity matrix)
-    masks = np.eye(num_points).astype(np.bool)
-    masks = np.vsplit(masks, num_points)
-    masks = [np.squeeze(m) for m in masks]
+    masks = np.eye(num_points, dtype=np.bool)
     labels_to_masks = OrderedDict(zip(labels, masks))
 
     empty_adj_matrix = csr_matrix((num_points, num_points))
@@ -283,10 +291,9 @@ def lm2_importer(filepath, asset=None, **kwargs):
 
 
 def _ljson_parse_null_values(points_list):
-    filtered_points = [np.nan if x is None else x
-                       for x in itertools.chain(*points_list)]
-    return np.array(filtered_points,
-                    dtype=np.float).reshape([-1, len(points_list[0])])
+    # NumPy maps None (JSON null) to NaN when building a float array
+    points = np.array(points_list, dtype=np.float)
+    return points.reshape([len(points_list), -1])
 
 
 def _parse_ljson_v1(lms_dict):
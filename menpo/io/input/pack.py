@@ -0,0 +1,177 @@
+import struct
+try:
+    import cPickle as pickle  # request cPickle manually on Py2
+except ImportError:  # Py3
+    import pickle
+from pathlib import Path
+
+import numpy as np
+
+from menpo.base import LazyList
+
+from ..utils import _PACK_MAGIC, _PACK_PREAMBLE
+
+
+class ImagePackReader(object):
+    r"""
+    Random access to the images stored in a packed image file (see
+    :map:`export_image_pack`). The file is memory mapped, so the pixels of
+    each returned image are a view on to the file - no copy is made and the
+    operating system page cache is shared between every process that reads
+    the same pack.
+
+    The reader can be pickled (for instance to send to a worker process), in
+    which case the file is simply mapped again when first indexed.
+
+    Parameters
+    ----------
+    filepath : `Path`
+        Absolute path to the pack.
+    mode : ``{'r', 'c'}``, optional
+        The mode the file is mapped with. ``'r'`` gives read-only pixels,
+        ``'c'`` (copy-on-write) allows images to be modified in memory
+        without changing the file.
+    """
+    def __init__(self, filepath, mode='r'):
+        if mode not in ('r', 'c'):
+            raise ValueError("mode must be one of 'r' or 'c' "
+                             "({} provided)".format(mode))
+        self.filepath = Path(filepath)
+        self.mode = mode
+        with open(str(self.filepath), 'rb') as f:
+            preamble = f.read(_PACK_PREAMBLE)
+            if preamble[:len(_PACK_MAGIC)] != _PACK_MAGIC:
+                raise ValueError('{} is not a valid image '
+                                 'pack.'.format(self.filepath))
+            offset, length = struct.unpack('<QQ',
+                                           preamble[len(_PACK_MAGIC):])
+            f.seek(offset)
+            header = pickle.loads(f.read(length))
+        self.dtype = (None if header['dtype'] is None
+                      else np.dtype(header['dtype']))
+        self._images = header['images']
+        self._landmarks = header['landmarks']
+        # per group, map image index -> (first_point, n_points, template)
+        self._landmark_index = {
+            group: {int(i): (int(s), int(n), int(t))
+                    for i, s, n, t in g['images']}
+            for group, g in self._landmarks.items()}
+        self._templates = {
+            group: [pickle.loads(t) for t in g['templates']]
+            for group, g in self._landmarks.items()}
+        self._buffer = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        # Never pickle the mapped memory - just map it again on demand
+        state['_buffer'] = None
+        return state
+
+    def __len__(self):
+        return len(self._images)
+
+    @property
+    def buffer(self):
+        r"""The whole pack mapped in to memory.
+
+        :type: ``(n_bytes,)`` `uint8` `np.memmap`
+        """
+        if self._buffer is None:
+            self._buffer = np.memmap(str(self.filepath), dtype=np.uint8,
+                                     mode=self.mode)
+        return self._buffer
+
+    def _view(self, offset, dtype, shape):
+        n_bytes = int(np.prod(shape)) * np.dtype(dtype).itemsize
+        return self.buffer[offset:offset + n_bytes].view(dtype).reshape(shape)
+
+    @property
+    def group_labels(self):
+        r"""The landmark groups present in the pack.
+
+        :type: `list` of `str`
+        """
+        return list(self._landmarks.keys())
+
+    def landmark_points(self, group):
+        r"""
+        All of the landmark points of the given group, packed in to a single
+        array that is a view on to the file.
+
+        Parameters
+        ----------
+        group : `str`
+            The landmark group.
+
+        Returns
+        -------
+        points : ``(n_total_points, n_dims)`` `ndarray`
+            The points of every image with the given group, concatenated in
+            image order.
+        """
+        g = self._landmarks[group]
+        n_points = int(g['images'][:, 2].sum()) if len(g['images']) else 0
+        return self._view(g['offset'], np.float64, (n_points, g['n_dims']))
+
+    def _landmarks_for_image(self, index, group):
+        from menpo.shape import PointCloud
+        first, n_points, t_index = self._landmark_index[group][index]
+        g = self._landmarks[group]
+        points = self._view(g['offset'] + first * 8 * g['n_dims'],
+                            np.float64, (n_points, g['n_dims']))
+        if t_index < 0:
+            return PointCloud(points, copy=False)
+        lmarks = self._templates[group][t_index].copy()
+        lmarks.points = points
+        return lmarks
+
+    def __getitem__(self, index):
+        r"""
+        Build the image at the given index.
+        """
+        from menpo.image import Image, MaskedImage
+        shape, offset, mask_offset, path = self._images[index]
+        if index < 0:
+            index += len(self)
+        pixels = self._view(offset, self.dtype, shape)
+        if mask_offset is None:
+            image = Image(pixels, copy=False)
+        else:
+            mask = self._view(mask_offset, np.bool, shape[1:])
+            image = MaskedImage(pixels, mask=mask, copy=False)
+        for group, index_map in self._landmark_index.items():
+            if index in index_map:
+                image.landmarks[group] = self._landmarks_for_image(index,
+                                                                   group)
+        if path is not None:
+            image.path = Path(path)
+        return image
+
+
+def image_pack_importer(filepath, asset=None, mode='r', **kwargs):
+    r"""
+    Import a packed image file written by :map:`export_image_pack`. Returns
+    a :map:`LazyList` of the images, each of which is a view on to a memory
+    mapping of the file.
+
+    Parameters
+    ----------
+    filepath : `Path`
+        Absolute filepath of the pack.
+    asset : `object`, optional
+        An optional asset that may help with loading. This is unused for this
+        implementation.
+    mode : ``{'r', 'c'}``, optional
+        The mode the file is mapped with. ``'r'`` gives read-only pixels,
+        ``'c'`` (copy-on-write) allows images to be modified in memory
+        without changing the file.
+    \**kwargs : `dict`, optional
+        Any other keyword arguments.
+
+    Returns
+    -------
+    images : :map:`LazyList`
+        A :map:`LazyList` of :map:`Image` or :map:`MaskedImage`.
+    """
+    reader = ImagePackReader(filepath, mode=mode)
+    return LazyList.init_from_index_callable(reader.__getitem__, len(reader))
@@ -1,9 +1,19 @@
+from io import BytesIO
+from multiprocessing import cpu_count
+import struct
 import sys
 try:
     import cPickle as pickle
 except ImportError:
     import pickle
+import bz2
 import gzip
+import zlib
+
+import numpy as np
+
+from menpo.base import _worker_pool
+from ..utils import _MPKL_MAGIC, _MPKL_PREAMBLE, _BGZ_HEADER
 
 
 def _unpickle_with_encoding(f, encoding=None):
@@ -58,3 +68,151 @@ def pickle_gzip_importer(filepath, asset=None, **kwargs):
     with gzip.open(str(filepath), 'rb') as f:
         x = _unpickle_with_encoding(f, encoding=kwargs.get('encoding'))
     return x
+
+
+def pickle_bz2_importer(filepath, asset=None, **kwargs):
+    r"""Import a pickle file that has been compressed with BZ2 compression.
+
+    Parameters
+    ----------
+    filepath : `Path`
+        Absolute filepath of the file.
+    asset : `object`, optional
+        An optional asset that may help with loading. This is unused for this
+        implementation.
+    \**kwargs : `dict`, optional
+        Any other keyword arguments.
+
+    Returns
+    -------
+    object : `object`
+        The pickled objects.
+    """
+    with bz2.BZ2File(str(filepath), 'rb') as f:
+        x = _unpickle_with_encoding(f, encoding=kwargs.get('encoding'))
+    return x
+
+
+def pickle_xz_importer(filepath, asset=None, **kwargs):
+    r"""Import a pickle file that has been compressed with XZ (LZMA)
+    compression. Requires Python 3.
+
+    Parameters
+    ----------
+    filepath : `Path`
+        Absolute filepath of the file.
+    asset : `object`, optional
+        An optional asset that may help with loading. This is unused for this
+        implementation.
+    \**kwargs : `dict`, optional
+        Any other keyword arguments.
+
+    Returns
+    -------
+    object : `object`
+        The pickled objects.
+    """
+    import lzma
+    with lzma.open(str(filepath), 'rb') as f:
+        x = _unpickle_with_encoding(f, encoding=kwargs.get('encoding'))
+    return x
+
+
+def _inflate_bgz_member(member):
+    header_size = _BGZ_HEADER.size
+    block = zlib.decompress(member[header_size:-8], -zlib.MAX_WBITS)
+    crc, size = struct.unpack('<II', member[-8:])
+    if (zlib.crc32(block) & 0xffffffff) != crc or len(block) != size:
+        raise ValueError('Corrupt block in block compressed pickle.')
+    return block
+
+
+def pickle_bgz_importer(filepath, asset=None, workers=None, **kwargs):
+    r"""Import a block compressed pickle file (see
+    :func:`menpo.io.output.pickle.pickle_bgz_exporter`). The blocks are
+    decompressed in parallel on a pool of threads.
+
+    Parameters
+    ----------
+    filepath : `Path`
+        Absolute filepath of the file.
+    asset : `object`, optional
+        An optional asset that may help with loading. This is unused for this
+        implementation.
+    workers : `int`, optional
+        The number of threads used to decompress. If ``None``, the number of
+        CPUs.
+    \**kwargs : `dict`, optional
+        Any other keyword arguments.
+
+    Returns
+    -------
+    object : `object`
+        The pickled objects.
+    """
+    members = []
+    with open(str(filepath), 'rb') as f:
+        header = f.read(_BGZ_HEADER.size)
+        while header:
+            fields = _BGZ_HEADER.unpack(header)
+            if fields[:2] != (0x1f, 0x8b) or fields[8] != b'MB':
+                raise ValueError('{} is not a valid block compressed '
+                                 'pickle.'.format(filepath))
+            members.append(header + f.read(fields[10] - _BGZ_HEADER.size))
+            header = f.read(_BGZ_HEADER.size)
+    pool = _worker_pool(cpu_count() if workers is None else workers)
+    try:
+        blocks = pool.map(_inflate_bgz_member, members)
+    finally:
+        pool.terminate()
+    return _unpickle_with_encoding(BytesIO(b''.join(blocks)),
+                                   encoding=kwargs.get('encoding'))
+
+
+def mpkl_importer(filepath, asset=None, mode='r', **kwargs):
+    r"""Import a memory mappable pickle (``.mpkl``) file.
+
+    The file is memory mapped and every out-of-band buffer (e.g. the data of
+    each large NumPy array) is a view on to the mapping, so importing is near
+    instant and no copy of the data is made.
+
+    Parameters
+    ----------
+    filepath : `Path`
+        Absolute filepath of the file.
+    asset : `object`, optional
+        An optional asset that may help with loading. This is unused for this
+        implementation.
+    mode : ``{'r', 'c'}``, optional
+        The mode the file is mapped with. ``'r'`` gives read-only arrays,
+        ``'c'`` (copy-on-write) allows arrays to be modified in memory
+        without changing the file.
+    \**kwargs : `dict`, optional
+        Any other keyword arguments.
+
+    Returns
+    -------
+    object : `object`
+        The pickled objects.
+    """
+    from menpo.io.output.pickle import _pickle5
+    if mode not in ('r', 'c'):
+        raise ValueError("mode must be one of 'r' or 'c' "
+                         "({} provided)".format(mode))
+    pickle5 = _pickle5()
+    with open(str(filepath), 'rb') as f:
+        preamble = f.read(_MPKL_PREAMBLE)
+        if preamble[:len(_MPKL_MAGIC)] != _MPKL_MAGIC:
+            raise ValueError('{} is not a valid mpkl file.'.format(filepath))
+        data_offset, data_length, table_offset, n_buffers = struct.unpack(
+            '<QQQQ', preamble[len(_MPKL_MAGIC):])
+        f.seek(data_offset)
+        data = f.read(data_length)
+        f.seek(table_offset)
+        table = np.frombuffer(f.read(n_buffers * 16),
+                              dtype='<u8').reshape(-1, 2)
+    buffers = []
+    if n_buffers:
+        mapped = np.memmap(str(filepath), dtype=np.uint8, mode=mode)
+        buffers = [mapped[o:o + n] for o, n in table]
+    return pickle5.loads(data, buffers=buffers)
@@ -1,12 +1,13 @@
+from collections import OrderedDict, deque
 import warnings
 import os
 import numpy as np
 import subprocess as sp
 import re
+import threading
+from functools import partial
+import zipfile
 from pathlib import Path
-
-from menpo.image.base import normalize_pixels_range, channels_to_front
-from menpo.image import Image
 from menpo.base import LazyList
 
 from ..utils import DEVNULL, _call_subprocess
@@ -16,7 +17,9 @@ _FFMPEG_CMD = lambda: str(Path(os.environ.get('MENPO_FFMPEG_CMD', 'ffmpeg')))
 _FFPROBE_CMD = lambda: str(Path(os.environ.get('MENPO_FFPROBE_CMD', 'ffprobe')))
 
 
-def ffmpeg_importer(filepath, normalize=True, exact_frame_count=True, **kwargs):
+def ffmpeg_importer(filepath, normalize=True, exact_frame_count=True,
+                    seek_index=False, cache_size=8, shape=None, crop=None,
+                    greyscale=False, fps=None, **kwargs):
     r"""
     Imports videos by streaming frames from a pipe using FFMPEG. Returns a
     :map:`LazyList` that gives lazy access to the video on a per-frame basis.
@@ -41,6 +44,22 @@ def ffmpeg_importer(filepath, normalize=True, exact_frame_count=True, **kwargs):
     exact_frame_count: `bool`, optional
         If ``True``, the import fails if ffprobe is not available
         (reading from ffmpeg's output returns inexact frame count)
+    seek_index : `bool`, optional
+        If ``True``, a keyframe/timestamp index of the video is used for
+        random access (see :func:`video_seek_index`). Requires ffprobe.
+    cache_size : `int`, optional
+        The number of recently decoded frames to keep in memory.
+    shape : ``(height, width)`` `tuple` of `int`, optional
+        If not ``None``, ffmpeg resizes every frame to this shape (after
+        cropping).
+    crop : ``(min_indices, max_indices)``, optional
+        If not ``None``, ffmpeg crops every frame to the region between the
+        ``(y, x)`` indices ``min_indices`` (inclusive) and ``max_indices``
+        (exclusive) of the original frame.
+    greyscale : `bool`, optional
+        If ``True``, ffmpeg converts every frame to a single channel.
+    fps : `float`, optional
+        If not ``None``, ffmpeg resamples the video to this frame rate.
     \**kwargs : `dict`, optional
         Any other keyword arguments.
 
@@ -48,15 +67,42 @@ def ffmpeg_importer(filepath, normalize=True, exact_frame_count=True, **kwargs):
     -------
     image : :map:`LazyList`
         A :map:`LazyList` containing :map:`Image` or subclasses per frame
-        of the video.
+        of the video. If the frames are cropped or resized, the transform
+        from the coordinates of the original frames is attached as
+        ``frame_transform``. If the video is resampled, the index of the
+        closest original frame to each frame is attached as
+        ``source_frame_indices``.
     """
-    reader = FFMpegVideoReader(filepath, normalize=normalize, exact_frame_count=exact_frame_count)
+    from menpo.image import Image
+    reader = FFMpegVideoReader(filepath, normalize=normalize,
+                               exact_frame_count=exact_frame_count,
+                               seek_index=seek_index, cache_size=cache_size,
+                               shape=shape, crop=crop, greyscale=greyscale,
+                               fps=fps)
     ll = LazyList.init_from_index_callable(lambda x: Image.init_from_channels_at_back(reader[x]), len(reader))
     ll.fps = reader.fps
+    ll.iter_parallel = partial(_iter_images_parallel, reader)
+    transform = reader.frame_transform
+    if transform is not None:
+        ll.frame_transform = transform
+    if fps is not None:
+        ll.source_frame_indices = reader.source_frame_indices()
 
     return ll
 
 
+def _iter_images_parallel(reader, workers, chunk_size=16, max_bytes=2**29):
+    r"""
+    Iterate over every frame of a video in order as :map:`Image` instances,
+    decoding ``workers`` ranges of the video in parallel. See
+    :meth:`FFMpegVideoReader.iter_parallel`.
+    """
+    from menpo.image import Image
+    for frame in reader.iter_parallel(workers, chunk_size=chunk_size,
+                                      max_bytes=max_bytes):
+        yield Image.init_from_channels_at_back(frame)
+
+
 def ffmpeg_types():
     r"""The supported FFMPEG types.
 
@@ -74,6 +120,11 @@ class FFMpegVideoReader(object):
     """
     Read a video using ffmpeg and handle state to allow seeking.
 
+    The most recently decoded frames are kept in a small cache, so that
+    stepping backwards a few frames (or re-reading a frame) never reopens the
+    pipe. Frames that are skipped over when reading forwards are also added
+    to the cache.
+
     Parameters
     ----------
     filepath : `Path`
@@ -84,12 +135,47 @@ class FFMpegVideoReader(object):
     exact_frame_count : `bool`, optional
         If True, the import fails if ffmprobe is not available
         (reading from ffmpeg's output returns inexact frame count)
+    seek_index : `bool`, optional
+        If ``True``, the timestamp of every frame and the position of every
+        keyframe is loaded (or built and persisted, see
+        :func:`video_seek_index`). Seeks then use the exact timestamp of the
+        requested frame and jumping forwards only reopens the pipe if a
+        keyframe is skipped over - otherwise decoding on from the current
+        position is cheaper.
+    cache_size : `int`, optional
+        The number of recently decoded frames to keep in memory.
+    shape : ``(height, width)`` `tuple` of `int`, optional
+        If not ``None``, ffmpeg resizes every frame to this shape (after
+        cropping).
+    crop : ``(min_indices, max_indices)``, optional
+        If not ``None``, ffmpeg crops every frame to the region between the
+        ``(y, x)`` indices ``min_indices`` (inclusive) and ``max_indices``
+        (exclusive) of the original frame.
+    greyscale : `bool`, optional
+        If ``True``, ffmpeg converts every frame to a single channel.
+    fps : `float`, optional
+        If not ``None``, ffmpeg resamples the video to this frame rate. If
+        ``exact_frame_count`` is ``True``, the frames of the resampled video
+        are counted (see :func:`video_resampled_n_frames`), otherwise their
+        number is estimated from the number of frames at the original frame
+        rate.
     """
-    def __init__(self, filepath, normalize=False, exact_frame_count=True):
+    def __init__(self, filepath, normalize=False, exact_frame_count=True,
+                 seek_index=False, cache_size=8, shape=None, crop=None,
+                 greyscale=False, fps=None):
+        if cache_size < 0:
+            raise ValueError('cache_size must be non-negative '
+                             '({} provided)'.format(cache_size))
+        if fps is not None and fps <= 0:
+            raise ValueError('fps must be positive ({} provided)'.format(fps))
         self.filepath = filepath
         self.normalize = normalize
         self.exact_frame_count = exact_frame_count
+        self.cache_size = cache_size
+        self.greyscale = greyscale
+        self.n_channels = 1 if greyscale else 3
         self._pipe = None
+        self._cache = OrderedDict()
         if self.exact_frame_count:
             try:
                 infos = video_infos_ffprobe(self.filepath)
@@ -102,14 +188,66 @@ class FFMpegVideoReader(object):
         else:
             infos = video_infos_ffmpeg(self.filepath)
         self.duration = infos['duration']
-        self.width = infos['width']
-        self.height = infos['height']
-        self.n_frames = infos['n_frames']
-        self.fps = infos['fps']
+        self.source_width = infos['width']
+        self.source_height = infos['height']
+        self.source_n_frames = infos['n_frames']
+        self.source_fps = infos['fps']
+        self.crop = None
+        height, width = self.source_height, self.source_width
+        if crop is not None:
+            min_indices, max_indices = (np.asarray(crop[0], dtype=np.int),
+                                        np.asarray(crop[1], dtype=np.int))
+            if (np.any(min_indices < 0) or
+                    np.any(max_indices > (height, width)) or
+                    np.any(max_indices <= min_indices)):
+                raise ValueError('crop {} is not a valid region of a {} '
+                                 'frame'.format(crop, (height, width)))
+            self.crop = min_indices, max_indices
+            height, width = max_indices - min_indices
+        self.shape = None
+        if shape is not None:
+            self.shape = tuple(int(d) for d in shape)
+            height, width = self.shape
+        self.height, self.width = int(height), int(width)
+
+        if fps is None:
+            self.fps = self.source_fps
+            self.n_frames = self.source_n_frames
+        else:
+            self.fps = fps
+            if self.exact_frame_count:
+                self.n_frames = video_resampled_n_frames(self.filepath, fps)
+            else:
+                self.n_frames = int(round(self.source_n_frames * fps /
+                                          float(self.source_fps)))
+        self.pts = None
+        self.keyframes = None
+        if seek_index:
+            self._load_seek_index()
         # contains the index of the last read frame
         # the index is updated in _open_pipe, _read_one_frame and _trash_frames
         self.index = -1
 
+    def _load_seek_index(self):
+        r"""
+        Load the seek index of the video (see :func:`video_seek_index`),
+        setting ``pts`` and ``keyframes``. The index is not used if it does
+        not match the number of frames of the video.
+        """
+        pts, keyframes = video_seek_index(self.filepath)
+        if len(pts) != self.source_n_frames:
+            warnings.warn('The seek index of {} has {} frames but {} '
+                          'were expected - it will not be '
+                          'used.'.format(self.filepath, len(pts),
+                                         self.source_n_frames))
+        elif self.fps != self.source_fps:
+            # Move the keyframes on to the resampled timeline
+            times = pts[keyframes] - pts[0]
+            self.keyframes = np.unique(
+                np.ceil(times * self.fps - 1e-6).astype(np.int64))
+        else:
+            self.pts, self.keyframes = pts, keyframes
+
     def _shutdown_pipe(self):
         if self._pipe is not None:
             if self._pipe.stdout:
@@ -129,6 +267,64 @@ class FFMpegVideoReader(object):
     def __len__(self):
         return self.n_frames
 
+    @property
+    def frame_transform(self):
+        r"""
+        The transform from the coordinates of the original frames of the
+        video to the coordinates of the returned frames, or ``None`` if they
+        are neither cropped nor resized.
+
+        :type: :map:`Homogeneous` or ``None``
+        """
+        from menpo.transform import Translation, Scale
+        if self.crop is None and self.shape is None:
+            return None
+        min_indices = np.zeros(2) if self.crop is None else self.crop[0]
+        crop_shape = ((self.source_height, self.source_width)
+                      if self.crop is None
+                      else self.crop[1] - self.crop[0])
+        scale = np.array((self.height, self.width), dtype=np.float) / crop_shape
+        return Translation(-min_indices).compose_before(Scale(scale))
+
+    def source_frame_indices(self):
+        r"""
+        The index of the closest original frame to each returned frame. Only
+        differs from ``arange(n_frames)`` if the video is resampled.
+
+        Returns
+        -------
+        indices : ``(n_frames,)`` `int` `ndarray`
+            The index of each frame in the original video.
+        """
+        indices = np.round(np.arange(self.n_frames) * self.source_fps /
+                           float(self.fps)).astype(np.int)
+        return np.minimum(indices, self.source_n_frames - 1)
+
+    def _output_args(self):
+        r"""
+        The ffmpeg output options that give the requested frames.
+        """
+        filters = []
+        if self.fps != self.source_fps:
+            filters.append('fps={}'.format(repr(float(self.fps))))
+        if self.crop is not None:
+            (y, x), (h, w) = self.crop[0], self.crop[1] - self.crop[0]
+            filters.append('crop={}:{}:{}:{}'.format(w, h, x, y))
+        if self.shape is not None:
+            filters.append('scale={}:{}'.format(self.width, self.height))
+        args = ['-vf', ','.join(filters)] if filters else []
+        return args + ['-f', 'image2pipe',
+                       '-pix_fmt', 'gray' if self.greyscale else 'rgb24',
+                       '-vcodec', 'rawvideo', '-']
+
+    def _seek_time(self, frame):
+        if self.pts is None:
+            return frame / float(self.fps)
+        # Aim half way between the previous frame and the requested one so
+        # that rounding can never cause the wrong frame to be returned
+        prev = self.pts[frame - 1]
+        return (prev + (self.pts[frame] - prev) / 2.0) - self.pts[0]
+
     def _open_pipe(self, frame=None):
         r"""
         Open a pipe at the time just before the specified frame
@@ -143,29 +339,44 @@ class FFMpegVideoReader(object):
         ----
         Since v.2.1 of ffmpeg, this is frame-accurate
         """
-        if frame is not None and frame > 0:
-            time = str(frame / float(self.fps))
-            command = [_FFMPEG_CMD(),
-                       '-ss', time,
-                       '-i', str(self.filepath),
-                       '-f', 'image2pipe',
-                       '-pix_fmt', 'rgb24',
-                       '-vcodec', 'rawvideo', '-']
-        else:
-            command = [_FFMPEG_CMD(),
-                       '-i', str(self.filepath),
-                       '-f', 'image2pipe',
-                       '-pix_fmt', 'rgb24',
-                       '-vcodec', 'rawvideo', '-']
+        if frame is None:
             frame = 0
-
         self._shutdown_pipe()
-        self._pipe = sp.Popen(command, stdout=sp.PIPE, stdin=DEVNULL,
-                              stderr=DEVNULL,
-                              bufsize=10**8)  # Is this buffer the correct size?
+        self._pipe = self._spawn(frame)
         # We have not yet read the specified frame
         self.index = frame - 1
 
+    def _spawn(self, frame):
+        r"""
+        Start an ffmpeg process that outputs raw frames from ``frame``
+        onwards.
+        """
+        if frame > 0:
+            command = [_FFMPEG_CMD(),
+                       '-ss', repr(self._seek_time(frame)),
+                       '-i', str(self.filepath)] + self._output_args()
+        else:
+            command = [_FFMPEG_CMD(),
+                       '-i', str(self.filepath)] + self._output_args()
+        return sp.Popen(command, stdout=sp.PIPE, stdin=DEVNULL,
+                        stderr=DEVNULL,
+                        bufsize=10**8)  # Is this buffer the correct size?
+
+    def _should_reopen(self, index):
+        r"""
+        Whether reaching ``index`` requires (re)opening the pipe, rather than
+        reading forwards from the current position.
+        """
+        if (self._pipe is None or self._pipe.poll() is not None or
+                index <= self.index):
+            return True
+        if self.keyframes is None:
+            return False
+        # Seeking has to decode from the keyframe preceding the requested
+        # frame - only worth it if that keyframe is past where we are now
+        k = np.searchsorted(self.keyframes, index, side='right') - 1
+        return k >= 0 and self.keyframes[k] > self.index + 1
+
     def __iter__(self):
         r"""
         Iterate through all frames of the video in order
@@ -176,48 +387,257 @@ class FFMpegVideoReader(object):
         for index in range(self.n_frames):
             yield self[index]
 
+    def iter_parallel(self, workers, chunk_size=16, max_bytes=2**29):
+        r"""
+        Iterate over every frame of the video in order, decoding contiguous
+        ranges of the video on ``workers`` threads in parallel.
+
+        The video is split in to ranges that start on a keyframe and are at
+        least ``chunk_size`` frames long, so that no frame is ever decoded
+        twice. If the reader has no seek index (see ``seek_index``), it is
+        loaded first (see :func:`video_seek_index`) and kept for seeking.
+        If the seek index can not be used, the video is instead split in to ``workers`` ranges of
+        equal length.
+
+        Every range is decoded by a single ffmpeg process, which passes the
+        frames on in blocks of ``chunk_size`` frames, so a long range is
+        never held in memory at once. Ranges run ahead of the consumer until
+        the decoded blocks that have not yet been consumed reach
+        ``max_bytes``, after which only the range that is being consumed
+        continues. At most ``max_bytes`` plus one block are therefore held
+        in memory.
+
+        Neither the frame cache nor the open pipe of the reader are affected.
+
+        Parameters
+        ----------
+        workers : `int`
+            The number of ranges to decode in parallel.
+        chunk_size : `int`, optional
+            The minimum number of frames in a keyframe aligned range, and the
+            number of frames in each block passed on by a range.
+        max_bytes : `int`, optional
+            The number of bytes of decoded frames that may be held ahead of
+            the consumer.
+
+        Yields
+        ------
+        frame : ``(height, width, n_channels)`` `ndarray`
+            Each frame of the video, as returned by indexing.
+
+        Raises
+        ------
+        ValueError
+            If ``workers``, ``chunk_size`` or ``max_bytes`` are not positive,
+            or if ffmpeg returns fewer frames than the video is expected to
+            have.
+        """
+        from menpo.image.base import normalize_pixels_range
+        if workers < 1:
+            raise ValueError('The number of workers must be positive '
+                             '({} provided)'.format(workers))
+        if chunk_size < 1:
+            raise ValueError('chunk_size must be positive '
+                             '({} provided)'.format(chunk_size))
+        if max_bytes < 1:
+            raise ValueError('max_bytes must be positive '
+                             '({} provided)'.format(max_bytes))
+        if self.keyframes is None:
+            try:
+                self._load_seek_index()
+            except (IOError, OSError, ValueError):
+                pass  # e.g. ffprobe is not available
+        if self.keyframes is not None:
+            starts = [0]
+            for k in self.keyframes:
+                if k < self.n_frames and k - starts[-1] >= chunk_size:
+                    starts.append(int(k))
+        else:
+            starts = sorted(set(self.n_frames * k // workers
+                                for k in range(workers)))
+        ends = starts[1:] + [self.n_frames]
+        blocks = self._iter_ranges(list(zip(starts, ends)), workers,
+                                   chunk_size, max_bytes)
+        for block in blocks:
+            for frame in block:
+                if self.normalize:
+                    frame = normalize_pixels_range(frame)
+                yield frame
+
+    def _iter_ranges(self, ranges, workers, chunk_size, max_bytes):
+        r"""
+        Yield the frames of the ``(start, end)`` ``ranges`` in order, in
+        blocks of up to ``chunk_size`` frames, decoding the ranges on
+        ``workers`` threads. See :meth:`iter_parallel`.
+        """
+        condition = threading.Condition()
+        # The blocks of every range that have not yet been consumed
+        pending = [deque() for _ in ranges]
+        state = {'next': 0, 'head': 0, 'n_bytes': 0, 'stop': False}
+
+        def put(i, item, n_bytes=0):
+            with condition:
+                # Only the range that is being consumed may exceed the budget,
+                # and then only by a single block
+                while not (state['stop'] or n_bytes == 0 or
+                           state['n_bytes'] + n_bytes <= max_bytes or
+                           (i == state['head'] and not pending[i])):
+                    condition.wait()
+                if state['stop']:
+                    return False
+                pending[i].append(item)
+                state['n_bytes'] += n_bytes
+                condition.notify_all()
+                return True
+
+        def work():
+            while True:
+                with condition:
+                    if state['stop'] or state['next'] == len(ranges):
+                        return
+                    i = state['next']
+                    state['next'] += 1
+                start, end = ranges[i]
+                try:
+                    if not self._stream_range(start, end, chunk_size,
+                                              partial(put, i)):
+                        return
+                except Exception as e:
+                    put(i, e)
+                    return
+                put(i, None)
+
+        threads = [threading.Thread(target=work)
+                   for _ in range(min(workers, len(ranges)))]
+        for t in threads:
+            t.daemon = True
+            t.start()
+        try:
+            for i in range(len(ranges)):
+                with condition:
+                    state['head'] = i
+                    condition.notify_all()
+                while True:
+                    with condition:
+                        while not pending[i]:
+                            condition.wait()
+                        block = pending[i].popleft()
+                        if isinstance(block, np.ndarray):
+                            state['n_bytes'] -= block.nbytes
+                            condition.notify_all()
+                    if block is None:
+                        break
+                    if isinstance(block, Exception):
+                        raise block
+                    yield block
+        finally:
+            # Stops every range that is still running and kills its ffmpeg
+            with condition:
+                state['stop'] = True
+                condition.notify_all()
+            for t in threads:
+                t.join()
+
+    def _stream_range(self, start, end, chunk_size, put):
+        r"""
+        Decode the frames ``[start, end)`` with a single ffmpeg process,
+        passing blocks of up to ``chunk_size`` frames, along with their size
+        in bytes, to ``put``. Returns ``False`` if ``put`` does, which stops
+        the decoding early.
+        """
+        n_bytes = self.height * self.width * self.n_channels
+        with _call_subprocess(self._spawn(start)) as pipe:
+            try:
+                for block_start in range(start, end, chunk_size):
+                    n_frames = min(chunk_size, end - block_start)
+                    raw_data = pipe.stdout.read(n_bytes * n_frames)
+                    if len(raw_data) != n_bytes * n_frames:
+                        raise ValueError(
+                            'ffmpeg only returned {} of the {} frames '
+                            'starting at frame {} of {}'.format(
+                                block_start - start +
+                                len(raw_data) // n_bytes, end - start,
+                                start, self.filepath))
+                    frames = np.fromstring(raw_data, dtype=np.uint8)
+                    frames = frames.reshape((n_frames, self.height,
+                                             self.width, self.n_channels))
+                    if not put(frames, frames.nbytes):
+                        return False
+            finally:
+                # ffmpeg would otherwise decode on to the end of the video
+                try:
+                    pipe.kill()
+                except OSError:
+                    pass  # Already exited
+        return True
+
     def __getitem__(self, index):
         r"""
         Get a specific frame from the video
         """
-        # If the user is reading consecutive frames, or a frame later in the
-        # video, do not reopen a pipe
-        if self._pipe is None or self._pipe.poll() is not None or index <= self.index:
-            self._open_pipe(frame=index)
+        frame = self._cache.get(index)
+        if frame is None:
+            # If the user is reading consecutive frames, or a frame later in
+            # the video, do not reopen a pipe
+            if self._should_reopen(index):
+                self._open_pipe(frame=index)
+            else:
+                to_trash = index - self.index - 1
+                if to_trash > 0:
+                    self._trash_frames(to_trash)
+            frame = self._read_one_frame()
         else:
-            to_trash = index - self.index - 1
-            if to_trash > 0:
-                self._trash_frames(to_trash)
+            # Mark as most recently used
+            self._cache[index] = self._cache.pop(index)
 
-        return self._read_one_frame()
+        if self.normalize:
+            from menpo.image.base import normalize_pixels_range
+            return normalize_pixels_range(frame)
+        else:
+            return frame.copy()
+
+    def _cache_frame(self, index, frame):
+        if self.cache_size > 0:
+            self._cache[index] = frame
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
 
     def _trash_frames(self, n_frames):
         r"""
-        Reads and trashes the data corresponding to ``n_frames``
+        Reads the data corresponding to ``n_frames``, only keeping the last
+        ``cache_size`` of them in the cache.
         """
-        _ = self._pipe.stdout.read(self.height*self.width*3*n_frames)
+        n_bytes = self.height * self.width * self.n_channels
+        n_skip = max(n_frames - self.cache_size, 0)
+        if n_skip > 0:
+            _ = self._pipe.stdout.read(n_bytes * n_skip)
+            self.index += n_skip
+        for _ in range(n_frames - n_skip):
+            self._read_one_frame()
         self._pipe.stdout.flush()
-        self.index += n_frames
 
     def _read_one_frame(self):
         r"""
-        Reads one frame from the opened ``self._pipe`` and converts it to
-        a numpy array
+        Reads one frame from the opened ``self._pipe``, converts it to
+        a numpy array and caches it
 
         Returns
         -------
-        image : :map:`Image`
-            Image of shape ``(self.height, self.width, 3)``
+        frame : ``(self.height, self.width, self.n_channels)`` `uint8` `ndarray`
+            The raw frame.
         """
-        raw_data = self._pipe.stdout.read(self.height*self.width*3)
+        n_bytes = self.height * self.width * self.n_channels
+        raw_data = self._pipe.stdout.read(n_bytes)
+        if len(raw_data) != n_bytes:
+            raise IndexError('ffmpeg returned no frame {} of {} - the video '
+                             'has fewer than the {} frames it is expected to '
+                             'have'.format(self.index + 1, self.filepath,
+                                           self.n_frames))
         frame = np.fromstring(raw_data, dtype=np.uint8)
-        frame = frame.reshape((self.height, self.width, 3))
+        frame = frame.reshape((self.height, self.width, self.n_channels))
         self._pipe.stdout.flush()
         self.index += 1
-
-        if self.normalize:
-            frame = normalize_pixels_range(frame)
-
+        self._cache_frame(self.index, frame)
         return frame
 
 
@@ -284,6 +704,45 @@ def video_infos_ffmpeg(filepath):
     return infos
 
 
+def video_resampled_n_frames(filepath, fps):
+    r"""
+    Count the frames of a video once it is resampled to the frame rate
+    ``fps``, by decoding it through the same ``fps`` filter that is used to
+    read the frames. This can differ by a frame from the number of frames at
+    the original frame rate scaled to ``fps``, as ffmpeg rounds the
+    timestamp of every frame to the new frame rate.
+
+    Parameters
+    ----------
+    filepath : `Path`
+        Absolute path to the video file.
+    fps : `float`
+        The frame rate to resample the video to.
+
+    Returns
+    -------
+    n_frames : `int`
+        The number of frames of the resampled video.
+
+    Raises
+    ------
+    ValueError
+        If ffmpeg does not report the number of frames.
+    """
+    command = [_FFMPEG_CMD(), '-i', str(filepath), '-an',
+               '-vf', 'fps={}'.format(repr(float(fps))), '-f', 'null', '-']
+    with _call_subprocess(sp.Popen(command, stdout=DEVNULL,
+                                   stderr=sp.PIPE)) as pipe:
+        raw_infos = pipe.stderr.read().decode()
+
+    # ffmpeg reports its progress as 'frame=  N' - the last is the total
+    n_frames = re.findall(r'frame=\s*(\d+)', raw_infos)
+    if not n_frames:
+        raise ValueError('Unable to count the frames of {} at {} '
+                         'fps.'.format(filepath, fps))
+    return int(n_frames[-1])
+
+
 def video_infos_ffprobe(filepath):
     """
     Parses the information from a video using ffprobe
@@ -344,3 +803,103 @@ def video_infos_ffprobe(filepath):
         kv_dict['fps'] = None
 
     return kv_dict
+
+
+def video_seek_index_ffprobe(filepath):
+    r"""
+    Build the seek index of a video using ffprobe. Only the packets of the
+    first video stream are listed, so no decoding takes place.
+
+    Parameters
+    ----------
+    filepath : `Path`
+        Absolute path to the video file.
+
+    Returns
+    -------
+    pts : ``(n_frames,)`` `float64` `ndarray`
+        The presentation timestamp of every frame (in seconds), in
+        presentation order.
+    keyframes : ``(n_keyframes,)`` `int64` `ndarray`
+        The (sorted) indices of the frames that are keyframes.
+    """
+    p = sp.Popen(
+        [_FFPROBE_CMD(), '-v', 'quiet',
+         '-select_streams', 'v:0',             # Only the first stream
+         '-show_entries', 'packet=pts_time,flags',
+         '-of', 'csv=print_section=0',         # Output 'pts_time,flags'
+         str(filepath)],
+        stdin=sp.PIPE,
+        stdout=sp.PIPE,
+        stderr=sp.PIPE,
+    )
+    with _call_subprocess(p) as pipe:
+        stdout_output = pipe.stdout.readlines()
+    del p
+
+    pts, is_key = [], []
+    for line in stdout_output:
+        line = line.decode().strip()
+        if not line:
+            continue
+        pts_time, flags = line.split(',')[:2]
+        if pts_time == 'N/A':
+            raise ValueError('{} has packets without a presentation '
+                             'timestamp - unable to build a seek '
+                             'index.'.format(filepath))
+        pts.append(float(pts_time))
+        is_key.append('K' in flags)
+
+    # Packets are listed in decoding order - sort in to presentation order
+    pts = np.array(pts, dtype=np.float64)
+    order = np.argsort(pts, kind='mergesort')
+    keyframes = np.nonzero(np.array(is_key, dtype=np.bool)[order])[0]
+    return pts[order], keyframes.astype(np.int64)
+
+
+def _seek_index_path(filepath):
+    return filepath.with_name('.{}.menpo_seek.npz'.format(filepath.name))
+
+
+def video_seek_index(filepath):
+    r"""
+    The seek index of a video - the timestamp of every frame and the
+    indices of the keyframes.
+
+    The index is persisted alongside the video (as a hidden ``.npz`` file)
+    so that it only has to be built once. It is rebuilt whenever the video
+    is modified. If the directory is not writeable, the index is simply
+    rebuilt on every call.
+
+    Parameters
+    ----------
+    filepath : `Path`
+        Absolute path to the video file.
+
+    Returns
+    -------
+    pts : ``(n_frames,)`` `float64` `ndarray`
+        The presentation timestamp of every frame (in seconds), in
+        presentation order.
+    keyframes : ``(n_keyframes,)`` `int64` `ndarray`
+        The (sorted) indices of the frames that are keyframes.
+    """
+    filepath = Path(filepath)
+    stat = filepath.stat()
+    signature = np.array([stat.st_mtime, stat.st_size], dtype=np.float64)
+    index_path = _seek_index_path(filepath)
+    try:
+        with open(str(index_path), 'rb') as f:
+            index = np.load(f)
+            if np.array_equal(index['signature'], signature):
+                return index['pts'], index['keyframes']
+    except (IOError, OSError, KeyError, ValueError, zipfile.BadZipfile):
+        pass
+
+    pts, keyframes = video_seek_index_ffprobe(filepath)
+    try:
+        with open(str(index_path), 'wb') as f:
+            np.savez(f, signature=signature, pts=pts, keyframes=keyframes)
+    except (IOError, OSError):
+        pass  # e.g. read only directory - just rebuild next time
+    return pts, keyframes
@@ -1,2 +1,4 @@
-from .base import (export_landmark_file, export_image, export_pickle,
-                   export_video)
+from .base import (export_landmark_file, export_landmark_files,
+                   export_image, export_images, export_pickle,
+                   export_video, export_image_pack)
+from .video import VideoWriter
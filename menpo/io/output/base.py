@@ -1,10 +1,14 @@
 import gzip
+import itertools
 import warnings
 from functools import partial
 from pathlib import Path
 
+from menpo.base import prefetch_callables
 from menpo.compatibility import basestring, str
+from menpo.visualize import print_progress
 from .extensions import landmark_types, image_types, pickle_types, video_types
+from .pack import image_pack_exporter
 from ..exceptions import OverwriteError
 from ..utils import (_norm_path, _possible_extensions_from_filepath,
                      _normalize_extension)
@@ -13,6 +17,27 @@ from ..utils import (_norm_path, _possible_extensions_from_filepath,
 gzip_open = partial(gzip.open, compresslevel=3)
 
 
+def _pickle_opener(extension, compression_level=None):
+    r"""
+    The callable used to open a pickle file of the given extension for
+    writing, compressing at ``compression_level`` (if applicable).
+    """
+    if extension.endswith('.gz'):
+        if compression_level is None:
+            return gzip_open
+        return partial(gzip.open, compresslevel=compression_level)
+    elif extension.endswith('.bz2'):
+        import bz2
+        return partial(bz2.BZ2File, compresslevel=(
+            9 if compression_level is None else compression_level))
+    elif extension.endswith('.xz'):
+        import lzma
+        return partial(lzma.open, preset=compression_level)
+    else:
+        # Uncompressed, or compressed by the exporter itself (.pkl.bgz)
+        return open
+
+
 def export_landmark_file(pointcloud, fp, extension=None, overwrite=False):
     r"""
     Exports a given shape. The ``fp`` argument can be either or a `str` or
@@ -95,6 +120,110 @@ def export_image(image, fp, extension=None, overwrite=False):
     _export(image, fp, image_types, extension, overwrite)
 
 
+def export_landmark_files(landmarks, path_template, extension=None,
+                          overwrite=False, workers=4, backend='thread',
+                          raise_errors=True, verbose=False):
+    r"""
+    Exports a collection of shapes, each to its own file. The exporter is
+    resolved once for the whole collection and the files are written on a
+    pool of workers.
+
+    Parameters
+    ----------
+    landmarks : `iterable` of :map:`PointCloud` or subclass
+        The landmarks to export (e.g. a :map:`LazyList`).
+    path_template : `str` or `callable`
+        Either a format string that is formatted with the index of each shape
+        to give its path (e.g. ``'/data/{:06d}.pts'``), or a callable
+        ``(index, pointcloud) -> path``.
+    extension : `str` or None, optional
+        The extension to use, this must match the file paths.
+    overwrite : `bool`, optional
+        Whether or not to overwrite files that already exist.
+    workers : positive `int`, optional
+        The number of workers writing files in parallel.
+    backend : ``{'thread', 'process'}``, optional
+        Whether the workers are threads or processes.
+    raise_errors : `bool`, optional
+        If ``True``, the first error raised while exporting is re-raised. If
+        ``False``, every item is attempted and the error raised by each
+        failing item is returned in place of its path.
+    verbose : `bool`, optional
+        If ``True``, print a progress bar (if the number of shapes is known).
+
+    Returns
+    -------
+    paths : `list` of `Path` or `Exception`
+        The path that each shape was written to (or the error raised
+        exporting it, if ``raise_errors`` is ``False``).
+
+    Raises
+    ------
+    ValueError
+        The provided extension does not match the file paths or an existing
+        exporter type (the output type is not supported).
+    OverwriteError
+        A file already exists and ``overwrite`` != ``True``
+    """
+    return _export_many(landmarks, path_template, landmark_types, extension,
+                        overwrite, workers=workers, backend=backend,
+                        raise_errors=raise_errors, verbose=verbose,
+                        prefix='Exporting landmarks')
+
+
+def export_images(images, path_template, extension=None, overwrite=False,
+                  workers=4, backend='thread', raise_errors=True,
+                  verbose=False):
+    r"""
+    Exports a collection of images, each to its own file. The exporter is
+    resolved once for the whole collection and the images are encoded on a
+    pool of workers - the encoders release the GIL, so threads are usually
+    sufficient.
+
+    Parameters
+    ----------
+    images : `iterable` of :map:`Image`
+        The images to export (e.g. a :map:`LazyList`). Only a few images
+        ahead of those being written are held in memory at a time.
+    path_template : `str` or `callable`
+        Either a format string that is formatted with the index of each image
+        to give its path (e.g. ``'/data/{:06d}.png'``), or a callable
+        ``(index, image) -> path``.
+    extension : `str` or None, optional
+        The extension to use, this must match the file paths.
+    overwrite : `bool`, optional
+        Whether or not to overwrite files that already exist.
+    workers : positive `int`, optional
+        The number of workers encoding images in parallel.
+    backend : ``{'thread', 'process'}``, optional
+        Whether the workers are threads or processes.
+    raise_errors : `bool`, optional
+        If ``True``, the first error raised while exporting is re-raised. If
+        ``False``, every image is attempted and the error raised by each
+        failing image is returned in place of its path.
+    verbose : `bool`, optional
+        If ``True``, print a progress bar (if the number of images is known).
+
+    Returns
+    -------
+    paths : `list` of `Path` or `Exception`
+        The path that each image was written to (or the error raised
+        exporting it, if ``raise_errors`` is ``False``).
+
+    Raises
+    ------
+    ValueError
+        The provided extension does not match the file paths or an existing
+        exporter type (the output type is not supported).
+    OverwriteError
+        A file already exists and ``overwrite`` != ``True``
+    """
+    return _export_many(images, path_template, image_types, extension,
+                        overwrite, workers=workers, backend=backend,
+                        raise_errors=raise_errors, verbose=verbose,
+                        prefix='Exporting images')
+
+
 def export_video(images, file_path, overwrite=False, fps=30, **kwargs):
     r"""
     Exports a given list of images as a video. Ensure that all the images
@@ -142,7 +271,8 @@ def export_video(images, file_path, overwrite=False, fps=30, **kwargs):
                        exporter_kwargs=exporter_kwargs)
 
 
-def export_pickle(obj, fp, overwrite=False, protocol=2):
+def export_pickle(obj, fp, overwrite=False, protocol=2,
+                  compression_level=None, workers=None):
     r"""
     Exports a given collection of Python objects with Pickle.
 
@@ -151,7 +281,17 @@ def export_pickle(obj, fp, overwrite=False, protocol=2):
     If ``fp`` is a path, it must have the suffix `.pkl` or `.pkl.gz`. If
     `.pkl`, the object will be pickled using the selected Pickle protocol.
     If `.pkl.gz` the object will be pickled using the selected Pickle
-    protocol with gzip compression (at a fixed compression level of 3).
+    protocol with gzip compression (at a default compression level of 3).
+    Similarly, `.pkl.bz2` and `.pkl.xz` (Python 3 only) files are compressed
+    with BZ2 and XZ (LZMA) compression respectively. For large objects,
+    `.pkl.bgz` is recommended - the pickle is split in to blocks that are
+    compressed in parallel (and are decompressed in parallel on import).
+    The resulting file is still a valid gzip file.
+    If `.mpkl`, the object will be pickled with protocol 5 and every large
+    buffer (e.g. the data of each NumPy array) is written out-of-band as an
+    aligned raw segment, so that :map:`import_pickle` can memory map the
+    arrays rather than copying them (the ``protocol`` is ignored). This
+    requires Python 3.8 or the ``pickle5`` package.
 
     Note that a special exception is made for `pathlib.Path` objects - they
     are pickled down as a `pathlib.PurePath` so that pickles can be easily
@@ -181,6 +321,15 @@ def export_pickle(obj, fp, overwrite=False, protocol=2):
         3         Support for byte objects, compatible with python >= 3.0.
         4         Support for large objects, compatible with python >= 3.4.
         ========= =========================================================
+    compression_level : `int`, optional
+        The compression level of compressed pickles. For `.pkl.gz`,
+        `.pkl.bz2` and `.pkl.bgz` this is in the range ``[0, 9]`` and for
+        `.pkl.xz` this is the preset in the range ``[0, 9]``. If ``None``,
+        the default level of each codec is used (3 for `.pkl.gz`).
+    workers : `int`, optional
+        The number of threads used to compress `.pkl.bgz` files. If ``None``,
+        the number of CPUs.
+
     Raises
     ------
     ValueError
@@ -196,11 +345,14 @@ def export_pickle(obj, fp, overwrite=False, protocol=2):
     if isinstance(fp, basestring):
         fp = Path(fp)  # cheeky conversion to Path to reuse existing code
     if isinstance(fp, Path):
-        # user provided a path - if it ended .gz we will compress
+        # user provided a path - the extension selects the compression
         path_filepath = _validate_filepath(fp, overwrite)
         extension = _parse_and_validate_extension(path_filepath, None,
                                                   pickle_types)
-        o = gzip_open if extension[-3:] == '.gz' else open
+        if extension.endswith('.bgz'):
+            exporter_kwargs.update({'compression_level': compression_level,
+                                    'workers': workers})
+        o = _pickle_opener(extension, compression_level=compression_level)
         with o(str(path_filepath), 'wb') as f:
             # force overwrite as True we've already done the check above
             _export(obj, f, pickle_types, extension, True,
@@ -210,6 +362,48 @@ def export_pickle(obj, fp, overwrite=False, protocol=2):
                 exporter_kwargs=exporter_kwargs)
 
 
+def export_image_pack(images, file_path, overwrite=False, verbose=False):
+    r"""
+    Exports a collection of images, and their landmarks, as a single packed
+    image file that can be imported with :map:`import_image_pack`.
+
+    The raw pixels of every image are written contiguously to the file,
+    each aligned to a 64 byte boundary, with an index of offsets and the
+    landmark groups stored as packed arrays. Importing a pack is therefore
+    near instant, requiring no decoding or parsing, and provides zero-copy
+    random access to the images through a memory map.
+
+    All images must share a common pixel dtype. Both :map:`Image` and
+    :map:`MaskedImage` instances are supported. As the index is written at
+    the end of the file, ``images`` may be a generator (e.g. the result of
+    :map:`import_images` with ``as_generator=True``).
+
+    Parameters
+    ----------
+    images : `iterable` of :map:`Image`
+        The images to export.
+    file_path : `Path` or `str`
+        The Path to save the pack at. File buffers are not supported.
+    overwrite : `bool`, optional
+        Whether or not to overwrite a file if it already exists.
+    verbose : `bool`, optional
+        If ``True``, print a progress bar.
+
+    Raises
+    ------
+    ValueError
+        File already exists and ``overwrite`` != ``True``
+    ValueError
+        The input is a buffer and not a valid `Path`
+    ValueError
+        The images do not share a common dtype.
+    """
+    file_path = _enforce_only_paths_supported(file_path, 'image pack')
+    file_path = _validate_filepath(Path(file_path), overwrite)
+    with file_path.open('wb') as file_handle:
+        image_pack_exporter(images, file_handle, verbose=verbose)
+
+
 def _extension_to_export_function(extension, extensions_map):
     r"""
     Simple function that wraps the extensions map indexing and raises
@@ -497,3 +691,66 @@ def _export(obj, fp, extensions_map, extension, overwrite,
                                                             extensions_map)
 
         export_function(obj, fp, extension=extension, **exporter_kwargs)
+
+
+def _export_item(export_function, extension, overwrite, file_path, obj):
+    r"""
+    Export a single item of a bulk export with an already resolved
+    ``export_function``, returning the path written to.
+    """
+    file_path = _validate_filepath(Path(file_path), overwrite)
+    if not file_path.name.lower().endswith(extension):
+        raise ValueError('The file path extension must match the '
+                         'requested file extension: {} != {}'.format(
+                             file_path.name, extension))
+    with file_path.open('wb') as file_handle:
+        export_function(obj, file_handle, extension=extension)
+    return file_path
+
+
+def _export_item_or_error(*args):
+    try:
+        return _export_item(*args)
+    except Exception as e:
+        return e
+
+
+def _export_many(objs, path_template, extensions_map, extension, overwrite,
+                 workers=4, backend='thread', raise_errors=True,
+                 verbose=False, prefix='Exporting'):
+    r"""
+    The shared bulk export function. The exporter is resolved from the first
+    path and then each item is validated and written on a pool of
+    ``workers``, with only a bounded number of items in flight at once.
+    """
+    if isinstance(path_template, basestring):
+        path_for = lambda i, obj: path_template.format(i)
+    else:
+        path_for = path_template
+    try:
+        n_items = len(objs)
+    except TypeError:
+        n_items = None
+
+    export_item = _export_item if raise_errors else _export_item_or_error
+    objs = iter(objs)
+    try:
+        first = next(objs)
+    except StopIteration:
+        return []
+    first_path = _norm_path(path_for(0, first))
+    extension = _parse_and_validate_extension(first_path, extension,
+                                              extensions_map)
+    export_function = _extension_to_export_function(extension,
+                                                    extensions_map)
+
+    def callables():
+        for i, obj in enumerate(itertools.chain([first], objs)):
+            yield partial(export_item, export_function, extension, overwrite,
+                          path_for(i, obj), obj)
+
+    results = prefetch_callables(callables(), 2 * workers, workers=workers,
+                                 backend=backend)
+    if verbose and n_items is not None:
+        results = print_progress(results, prefix=prefix, n_items=n_items)
+    return list(results)
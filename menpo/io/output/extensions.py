@@ -3,7 +3,7 @@ from functools import partial
 from .landmark import ljson_exporter, pts_exporter
 from .image import pil_exporter
 from .video import ffmpeg_video_exporter
-from .pickle import pickle_exporter
+from .pickle import pickle_exporter, pickle_bgz_exporter, mpkl_exporter
 
 
 landmark_types = {
@@ -40,6 +40,10 @@ image_types = {
 pickle_types = {
     '.pkl': pickle_exporter,
     '.pkl.gz': pickle_exporter,
+    '.pkl.bz2': pickle_exporter,
+    '.pkl.xz': pickle_exporter,
+    '.pkl.bgz': pickle_bgz_exporter,
+    '.mpkl': mpkl_exporter,
 }
 
 
@@ -1,5 +1,4 @@
 import json
-import itertools
 import numpy as np
 
 
@@ -28,30 +27,12 @@ def ljson_exporter(pointcloud, file_handle, **kwargs):
     file_handle : `file`-like object
         The file to write in to
     """
+    # tojson writes the points straight from the float array, with nan
+    # coordinates as None so that json correctly maps them to 'null'
     lg_json = pointcloud.tojson()
     # Add version string
     lg_json['version'] = 2
 
-    # Convert nan values to None so that json correctly maps them to 'null'
-    points = lg_json['landmarks']['points']
-    # Flatten list
-    try:
-        ndim = len(points[0])
-    except IndexError:
-        ndim = 0
-    filtered_points = [None if np.isnan(x) else x
-                       for x in itertools.chain(*points)]
-    # Recreate tuples
-    if ndim == 2:
-        lg_json['landmarks']['points'] = list(zip(filtered_points[::2],
-                                                  filtered_points[1::2]))
-    elif ndim == 3:
-        lg_json['landmarks']['points'] = list(zip(filtered_points[::3],
-                                                  filtered_points[1::3],
-                                                  filtered_points[2::3]))
-    else:
-        lg_json['landmarks']['points'] = []
-
     return json.dump(lg_json, file_handle, indent=4, separators=(',', ': '),
                      sort_keys=True, allow_nan=False, cls=_UTF8Encoder)
 
@@ -0,0 +1,151 @@
+import struct
+try:
+    import cPickle as pickle  # request cPickle manually on Py2
+except ImportError:  # Py3
+    import pickle
+
+import numpy as np
+
+from menpo.visualize import print_progress
+from ..utils import _PACK_MAGIC, _PACK_ALIGN, _PACK_PREAMBLE
+
+
+def _write_aligned(file_handle, array):
+    r"""
+    Pad the file so that the next write is aligned to ``_PACK_ALIGN`` bytes
+    and then write the raw bytes of ``array``. Returns the (absolute) offset
+    that the array was written at.
+    """
+    offset = file_handle.tell()
+    padding = -offset % _PACK_ALIGN
+    if padding:
+        file_handle.write(b'\0' * padding)
+        offset += padding
+    file_handle.write(np.ascontiguousarray(array).tobytes())
+    return offset
+
+
+def _landmark_template(lmarks):
+    r"""
+    The pickled structure of a landmark group without its points. Plain
+    :map:`PointCloud` instances need no template and so ``None`` is returned.
+    """
+    from menpo.shape import PointCloud
+    if type(lmarks) is PointCloud:
+        return None
+    template = lmarks.copy()
+    template.points = np.empty((0, lmarks.n_dims))
+    # Drop the per-instance state (e.g. the path of the landmark file) so
+    # that groups that share a layout share a template
+    template.__dict__.pop('path', None)
+    template._landmarks = None
+    return pickle.dumps(template, protocol=2)
+
+
+def image_pack_exporter(images, file_handle, verbose=False, **kwargs):
+    r"""
+    Given a file handle to write in to (which should be a seekable binary
+    file), write out a collection of images in the packed image format. No
+    value is returned.
+
+    The format consists of a small fixed preamble, followed by the raw pixels
+    (and masks) of every image, each aligned to a 64 byte boundary. The
+    landmark points of each group are written as a single packed
+    ``(n_total_points, n_dims)`` array and finally a pickled header stores
+    the offsets, shapes and landmark structure required to rebuild each
+    image. As the header is written last, ``images`` can be a generator of
+    unknown length.
+
+    Parameters
+    ----------
+    images : `iterable` of :map:`Image` or :map:`MaskedImage`
+        The images to write out. All images must share the same pixel dtype.
+    file_handle : `file`-like object
+        The seekable binary file to write in to.
+    verbose : `bool`, optional
+        If ``True``, print a progress bar.
+
+    Raises
+    ------
+    ValueError
+        If the images do not share a common dtype, or a landmark group does
+        not have a consistent dimensionality.
+    """
+    from menpo.image import MaskedImage
+    if verbose:
+        images = print_progress(images, prefix='Packing images')
+
+    # Placeholder preamble - rewritten once the header location is known
+    start = file_handle.tell()
+    file_handle.write(b'\0' * _PACK_PREAMBLE)
+
+    dtype = None
+    entries = []
+    # group -> list of points arrays, starts, counts and template indices
+    groups = {}
+    for i, image in enumerate(images):
+        if dtype is None:
+            dtype = image.pixels.dtype
+        elif image.pixels.dtype != dtype:
+            raise ValueError('All images must share a common dtype - image {} '
+                             'is {} but expected {}'.format(
+                                 i, image.pixels.dtype, dtype))
+        offset = _write_aligned(file_handle, image.pixels) - start
+        mask_offset = None
+        if isinstance(image, MaskedImage):
+            mask_offset = _write_aligned(file_handle,
+                                         image.mask.pixels[0]) - start
+        path = str(image.path) if hasattr(image, 'path') else None
+        entries.append((image.pixels.shape, offset, mask_offset, path))
+
+        if image.has_landmarks:
+            for group, lmarks in image.landmarks.items():
+                g = groups.get(group)
+                if g is None:
+                    g = {'n_dims': lmarks.n_dims, 'points': [], 'n_points': 0,
+                         'index': {}, 'templates': [], 'images': []}
+                    groups[group] = g
+                if lmarks.n_dims != g['n_dims']:
+                    raise ValueError("Landmark group '{}' of image {} is {}D "
+                                     "but expected {}D".format(
+                                         group, i, lmarks.n_dims,
+                                         g['n_dims']))
+                template = _landmark_template(lmarks)
+                t_index = -1
+                if template is not None:
+                    # Deduplicate the structure - commonly all groups share
+                    # the same labels and connectivity
+                    t_index = g['index'].get(template)
+                    if t_index is None:
+                        t_index = len(g['templates'])
+                        g['index'][template] = t_index
+                        g['templates'].append(template)
+                g['images'].append((i, g['n_points'], lmarks.n_points,
+                                    t_index))
+                g['points'].append(lmarks.points)
+                g['n_points'] += lmarks.n_points
+
+    landmarks = {}
+    for group, g in groups.items():
+        points = (np.concatenate(g['points'], axis=0) if g['points']
+                  else np.empty((0, g['n_dims'])))
+        offset = _write_aligned(file_handle,
+                                points.astype(np.float64)) - start
+        # (image_index, first_point, n_points, template_index) per image
+        landmarks[group] = {'offset': offset, 'n_dims': g['n_dims'],
+                            'images': np.array(g['images'], dtype=np.int64),
+                            'templates': g['templates']}
+
+    header = {'version': 1,
+              'dtype': None if dtype is None else dtype.str,
+              'images': entries,
+              'landmarks': landmarks}
+    header_offset = file_handle.tell() - start
+    header_bytes = pickle.dumps(header, protocol=2)
+    file_handle.write(header_bytes)
+    end = file_handle.tell()
+
+    file_handle.seek(start)
+    file_handle.write(_PACK_MAGIC + struct.pack('<QQ', header_offset,
+                                                len(header_bytes)))
+    file_handle.seek(end)
@@ -1,10 +1,21 @@
 from contextlib import contextmanager
+from functools import partial
+from multiprocessing import cpu_count
 from pathlib import Path, PurePath
+import struct
+import sys
+import zlib
 try:
     import cPickle as pickle  # request cPickle manually on Py2
 except ImportError:  # Py3
     import pickle
 
+import numpy as np
+
+from menpo.base import _worker_pool
+from ..utils import (_MPKL_MAGIC, _MPKL_PREAMBLE, _PACK_ALIGN,
+                     _BGZ_HEADER, _BGZ_BLOCK_SIZE)
+
 
 # -------------- Custom pickle behavior for pathlib.Path objects ------------ #
 #
@@ -53,3 +64,118 @@ def pickle_paths_as_pure():
 def pickle_exporter(obj, file_handle, protocol=2, **kwargs):
     with pickle_paths_as_pure():
         pickle.dump(obj, file_handle, protocol=protocol)
+
+
+def _bgz_member(block, level=6):
+    r"""
+    Compress a block as a complete gzip member, recording the size of the
+    member in the header (as a 'MB' extra subfield) so that the members of a
+    file can be located without decompressing them.
+    """
+    deflate = zlib.compressobj(level, zlib.DEFLATED, -zlib.MAX_WBITS)
+    data = deflate.compress(block) + deflate.flush()
+    size = _BGZ_HEADER.size + len(data) + 8
+    # ID1, ID2, CM (deflate), FLG (FEXTRA), MTIME, XFL, OS (unknown), XLEN,
+    # followed by the extra subfield 'MB' of length 4 holding the member size
+    header = _BGZ_HEADER.pack(0x1f, 0x8b, 8, 4, 0, 0, 255, 8, b'MB', 4, size)
+    trailer = struct.pack('<II', zlib.crc32(block) & 0xffffffff,
+                          len(block) & 0xffffffff)
+    return header + data + trailer
+
+
+def pickle_bgz_exporter(obj, file_handle, protocol=2, compression_level=None,
+                        workers=None, **kwargs):
+    r"""
+    Write an object as a block compressed pickle (``.pkl.bgz``). The pickle is
+    split in to independent blocks which are compressed in parallel on a pool
+    of threads. Each block is a complete gzip member, so the file is also a
+    valid gzip file.
+
+    Parameters
+    ----------
+    obj : `object`
+        The object to export.
+    file_handle : `file`-like object
+        The binary file to write in to.
+    protocol : `int`, optional
+        The pickle protocol.
+    compression_level : `int` in ``[0, 9]``, optional
+        The zlib compression level. If ``None``, 6 is used.
+    workers : `int`, optional
+        The number of threads used to compress. If ``None``, the number of
+        CPUs.
+    """
+    level = 6 if compression_level is None else compression_level
+    with pickle_paths_as_pure():
+        data = pickle.dumps(obj, protocol=protocol)
+    blocks = [data[i:i + _BGZ_BLOCK_SIZE]
+              for i in range(0, len(data), _BGZ_BLOCK_SIZE)]
+    pool = _worker_pool(cpu_count() if workers is None else workers)
+    try:
+        for member in pool.imap(partial(_bgz_member, level=level), blocks):
+            file_handle.write(member)
+    finally:
+        pool.terminate()
+
+
+def _pickle5():
+    r"""
+    A pickle module that supports protocol 5 (out-of-band buffers), which is
+    built in to Python >= 3.8 and otherwise provided by the pickle5 backport.
+    """
+    if sys.version_info >= (3, 8):
+        return pickle
+    try:
+        import pickle5
+    except ImportError:
+        raise ImportError('The .mpkl format requires Python 3.8 or later, or '
+                          'the pickle5 package to be installed.')
+    return pickle5
+
+
+def mpkl_exporter(obj, file_handle, **kwargs):
+    r"""
+    Write an object to a memory mappable pickle (``.mpkl``). The object is
+    pickled with protocol 5 and every large contiguous buffer (e.g. the data
+    of a NumPy array) is written out-of-band as a raw segment aligned to 64
+    bytes, so that it can be memory mapped on import rather than copied.
+
+    The protocol is always 5, so any ``protocol`` passed is ignored.
+
+    Parameters
+    ----------
+    obj : `object`
+        The object to export.
+    file_handle : `file`-like object
+        The binary file to write in to.
+    """
+    pickle5 = _pickle5()
+    buffers = []
+    with pickle_paths_as_pure():
+        data = pickle5.dumps(obj, protocol=5,
+                             buffer_callback=buffers.append)
+    raws = [b.raw() for b in buffers]
+
+    # Lay out the buffers after the preamble, followed by the pickle stream
+    # and the buffer table - everything is known up front so no seeking is
+    # required.
+    offsets = []
+    position = _MPKL_PREAMBLE
+    for raw in raws:
+        position += -position % _PACK_ALIGN
+        offsets.append(position)
+        position += raw.nbytes
+    data_offset = position
+    table_offset = data_offset + len(data)
+    table = np.array([(o, r.nbytes) for o, r in zip(offsets, raws)],
+                     dtype='<u8').reshape(-1, 2)
+
+    file_handle.write(_MPKL_MAGIC + struct.pack(
+        '<QQQQ', data_offset, len(data), table_offset, len(raws)))
+    position = _MPKL_PREAMBLE
+    for offset, raw in zip(offsets, raws):
+        file_handle.write(b'\0' * (offset - position))
+        file_handle.write(raw)
+        position = offset + raw.nbytes
+    file_handle.write(data)
+    file_handle.write(table.tobytes())
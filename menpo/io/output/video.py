@@ -1,22 +1,294 @@
 import os
 import subprocess as sp
+import threading
 import warnings
+try:
+    from queue import Queue, Empty
+except ImportError:  # Py2
+    from Queue import Queue, Empty
 
 import numpy as np
 from pathlib import Path
 
-from menpo.visualize import print_progress
+from menpo.visualize import print_progress, print_dynamic
 from ..utils import DEVNULL, _call_subprocess
 
 
 _FFMPEG_CMD = lambda: str(Path(os.environ.get('MENPO_FFMPEG_CMD', 'ffmpeg')))
 
 
+def _frames_to_uint8(frames, colour):
+    r"""
+    Convert a batch of ``(channels, height, width)`` pixel arrays to the raw
+    ``uint8`` frames expected by an ffmpeg pipe of the given ``colour``
+    format. Consecutive frames of the same shape and dtype are converted
+    together in a single vectorised operation.
+
+    Returns a list of ``(height, width[, channels])`` `uint8` arrays, one per
+    frame.
+    """
+    from menpo.image.base import denormalize_pixels_range
+    converted = []
+    start = 0
+    while start < len(frames):
+        # Find the run of frames that can be stacked with the first
+        key = (frames[start].shape, frames[start].dtype)
+        end = start + 1
+        while (end < len(frames) and
+               (frames[end].shape, frames[end].dtype) == key):
+            end += 1
+        pixels = np.array(frames[start:end])
+        pixels = denormalize_pixels_range(pixels, out_dtype=np.uint8)
+        # (n, channels, height, width) -> (n, height, width, channels)
+        pixels = np.rollaxis(pixels, 1, pixels.ndim)
+        if pixels.shape[-1] == 1:
+            # Handle the case of a greyscale image amidst colour images
+            if colour == 'rgb24':
+                pixels = pixels.repeat(3, axis=-1)
+            else:
+                pixels = pixels[..., 0]
+        converted.extend(pixels)
+        start = end
+    return converted
+
+
+class VideoWriter(object):
+    r"""
+    Write a video frame by frame using FFMPEG.
+
+    The pixels of each frame are copied as it is written, then converted to
+    ``uint8`` and piped to FFMPEG on a background thread, so producing the
+    next frame (e.g. rendering landmarks) overlaps with both converting and
+    encoding the previous ones. The image passed to :meth:`write` can
+    therefore be modified or reused as soon as :meth:`write` returns. Frames
+    are buffered (in their original dtype) in a bounded queue -
+    :meth:`write` only blocks if the writer falls ``queue_size`` frames
+    behind. Frames are converted to ``uint8`` in batches of up to
+    ``batch_size`` frames.
+
+    The first frame determines the shape and colour of the video. Videos
+    can be written from a generator of unknown length, and the writer can be
+    used as a context manager to ensure that it is closed.
+
+    There are is one important environment variable that can be set to alter
+    the behaviour of this class:
+
+        ================== ======================================
+        ENV Variable       Definition
+        ================== ======================================
+        MENPO_FFMPEG_CMD   The path to the 'ffmpeg' executable.
+        ================== ======================================
+
+    Parameters
+    ----------
+    out_path : `Path`
+        Path to save the video to.
+    fps : `int`, optional
+        The number of frames per second.
+    codec : `str`, optional
+        The video codec to use. Default 'libx264', which represents the
+        widely available mpeg4. Ignored when saving GIF files.
+    preset : `str`, optional
+        The preset FFMPEG compression level.
+        Please check out the documentation for more information:
+        https://trac.ffmpeg.org/wiki/Encode/H.264#a2.Chooseapreset
+    bitrate: `str`, optional
+        The output video bitrate.
+    out_pix_fmt : `str`, optional
+        The output pixel format.
+    queue_size : `int`, optional
+        The maximum number of frames waiting to be written.
+    batch_size : `int`, optional
+        The maximum number of frames converted together.
+    **kwargs : `dict`, optional
+        Extra parameters for advanced video exporting options.
+        They are passed through directly to FFMPEG and they should.
+        be organised in pairs of option/value in a dictionary.
+        For instance: ``{'crf' : '0'} # equivalent to -crf 0 in ffmpeg.``
+        You can find further details in the documentation:
+        https://ffmpeg.org/ffmpeg.html#Options
+
+    Examples
+    --------
+    >>> with VideoWriter(Path('video.mp4'), fps=25) as writer:
+    >>>     for image in images:
+    >>>         writer.write(rasterize_landmarks(image))
+    """
+    def __init__(self, out_path, fps=30, codec='libx264', preset='medium',
+                 bitrate=None, out_pix_fmt='yuv420p', queue_size=32,
+                 batch_size=8, **kwargs):
+        if queue_size < 1 or batch_size < 1:
+            raise ValueError('queue_size and batch_size must be positive '
+                             '({} and {} provided)'.format(queue_size,
+                                                           batch_size))
+        self.out_path = Path(out_path)
+        if self.out_path.suffix.lower() == '.gif':
+            codec = None
+        self.fps = fps
+        self.codec = codec
+        self.preset = preset
+        self.bitrate = bitrate
+        self.out_pix_fmt = out_pix_fmt
+        self.batch_size = batch_size
+        self.ffmpeg_kwargs = kwargs
+        self.n_frames = 0
+        self.frame_shape = None
+        self.colour = None
+        self._queue = Queue(maxsize=queue_size)
+        self._pipe = None
+        self._thread = None
+        self._error = None
+        self._closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            try:
+                self.close()
+            except Exception:
+                pass  # The original error is more useful
+
+    def _command(self):
+        cmd = [_FFMPEG_CMD(), '-y',
+               '-s', '{}x{}'.format(self.frame_shape[1], self.frame_shape[0]),
+               '-r', str(self.fps),
+               '-an',
+               '-pix_fmt', self.colour,
+               '-c:v', 'rawvideo', '-f', 'rawvideo',
+               '-i', '-']
+        if self.codec:
+            cmd.extend(['-vcodec', self.codec])
+        if self.out_pix_fmt:
+            cmd.extend(['-pix_fmt', self.out_pix_fmt])
+        if self.preset:
+            cmd.extend(['-preset', self.preset])
+        if self.bitrate:
+            cmd.extend(['-b', str(self.bitrate)])
+        # add the optional kwargs for FFMPEG options.
+        for key, value in self.ffmpeg_kwargs.items():
+            cmd.extend(['-{}'.format(key), value])
+        cmd.append(str(self.out_path))
+        return cmd
+
+    def _start(self, image):
+        if image.n_channels != 3 and image.n_channels != 1:
+            m = ('Currently only images of 1 or 3 channels are expected, '
+                 'while {} channels were found in the first frame.')
+            raise ValueError(m.format(image.n_channels))
+        self.frame_shape = image.shape
+        # If the first image is gray then all the images will be assumed to
+        # be gray
+        self.colour = 'rgb24' if image.n_channels == 3 else 'gray8'
+        # Pipe stdout to DEVNULL to ignore it
+        self._pipe = sp.Popen(self._command(), stdin=sp.PIPE, stderr=sp.PIPE,
+                              stdout=DEVNULL)
+        self._thread = threading.Thread(target=self._run)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def _run(self):
+        r"""
+        Convert and pipe frames to FFMPEG until ``None`` is received. Run on
+        the background thread.
+        """
+        finished = False
+        while not finished:
+            batch = [self._queue.get()]
+            # Take whatever else is already waiting, up to a full batch
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except Empty:
+                    break
+            if batch[-1] is None:
+                batch.pop()
+                finished = True
+            if self._error is not None or not batch:
+                continue  # Drain the queue so that writers never block
+            try:
+                for frame in _frames_to_uint8(batch, self.colour):
+                    self._pipe.stdin.write(frame.tostring())
+            except IOError:
+                error = ('FFMPEG encountered the following error while '
+                         'writing the video:\n\n{}'.format(
+                    self._pipe.stderr.read().decode()))
+                self._error = IOError(error)
+            except Exception as e:
+                self._error = e
+
+    def _raise_error(self):
+        if self._error is not None:
+            # Re-raise the error for a useful error message
+            raise self._error
+
+    def write(self, image):
+        r"""
+        Queue a copy of the pixels of a frame to be converted and written to
+        the video. The image is not referenced after this returns.
+
+        Parameters
+        ----------
+        image : :map:`Image`
+            The frame. Should have the same shape and number of channels as
+            the first frame.
+
+        Raises
+        ------
+        IOError
+            If FFMPEG failed while writing a previous frame.
+        ValueError
+            If the writer is closed or the first frame does not have 1 or 3
+            channels.
+        """
+        if self._closed:
+            raise ValueError('Cannot write to a closed VideoWriter.')
+        self._raise_error()
+        if self._pipe is None:
+            self._start(image)
+        else:
+            k = self.n_frames
+            if image.n_channels != 1 and self.colour == 'gray8':
+                warnings.warn('Frame {} is non-greyscale and the initial '
+                              'frame was greyscale. This frame will be '
+                              'corrupted.'.format(k))
+            if image.shape != self.frame_shape:  # Valid due to tuple/int
+                warnings.warn('Frame {} is not the same shape as the '
+                              'initial frame and therefore the output '
+                              'may be corrupted.'.format(k))
+        self._queue.put(image.pixels.copy())
+        self.n_frames += 1
+
+    def close(self):
+        r"""
+        Wait for every queued frame to be written and finish the video.
+
+        Raises
+        ------
+        IOError
+            If FFMPEG failed while writing any frame.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        if self._pipe is None:
+            return  # No frames were written
+        self._queue.put(None)
+        self._thread.join()
+        with _call_subprocess(self._pipe):
+            pass  # Close stdin and wait for FFMPEG to finish encoding
+        self._raise_error()
+
+
 def ffmpeg_video_exporter(images, out_path, fps=30, codec='libx264',
                           preset='medium', bitrate=None,
                           out_pix_fmt='yuv420p', verbose=False, **kwargs):
     r"""
-    Uses subprocess PIPE to export the images using FFMPEG.
+    Uses subprocess PIPE to export the images using FFMPEG (see
+    :class:`VideoWriter`).
 
     There are is one important environment variable that can be set to alter
     the behaviour of this function:
@@ -29,8 +301,8 @@ def ffmpeg_video_exporter(images, out_path, fps=30, codec='libx264',
 
     Parameters
     ----------
-    images : `list` of :map:`Image`
-        List of Menpo images to export as a video.
+    images : `iterable` of :map:`Image`
+        Menpo images to export as a video. Can be a generator.
     out_path : `Path`
         Path to save the video to.
     fps : `int`, optional
@@ -48,7 +320,8 @@ def ffmpeg_video_exporter(images, out_path, fps=30, codec='libx264',
     out_pix_fmt : `str`, optional
         The output pixel format.
     verbose : `bool`, optional
-        If ``True``, print a progress bar.
+        If ``True``, print a progress bar. If ``images`` has no length (e.g.
+        is a generator), the number of frames written is printed instead.
     **kwargs : `dict`, optional
         Extra parameters for advanced video exporting options.
         They are passed through directly to FFMPEG and they should.
@@ -61,64 +334,20 @@ def ffmpeg_video_exporter(images, out_path, fps=30, codec='libx264',
     #   https://github.com/Zulko/moviepy/blob/master/moviepy/video/io/ffmpeg_writer.py
     # and is used under the terms of the MIT license which can be found at
     #   https://github.com/Zulko/moviepy/blob/master/LICENCE.txt
-    im = images[0]
-    frame_shape = im.shape
-    if im.n_channels != 3 and im.n_channels != 1:
-        m = ('Currently only images of 1 or 3 channels are expected, '
-             'while {} channels were found in the first frame.')
-        raise ValueError(m.format(im.n_channels))
-    # If the first image is gray then all the images will be assumed to be
-    # gray
-    colour = 'rgb24' if im.n_channels == 3 else 'gray8'
-    cmd = [_FFMPEG_CMD(), '-y',
-           '-s', '{}x{}'.format(frame_shape[1], frame_shape[0]),
-           '-r', str(fps),
-           '-an',
-           '-pix_fmt', colour,
-           '-c:v', 'rawvideo', '-f', 'rawvideo',
-           '-i', '-']
-    if codec:
-        cmd.extend(['-vcodec', codec])
-    if out_pix_fmt:
-        cmd.extend(['-pix_fmt', out_pix_fmt])
-    if preset:
-        cmd.extend(['-preset', preset])
-    if bitrate:
-        cmd.extend(['-b', str(bitrate)])
-    # add the optional kwargs for FFMPEG options.
-    for key, value in kwargs.items():
-        cmd.extend(['-{}'.format(key), value])
-    cmd.append(str(out_path))
-
-    images = (print_progress(images, prefix='Exporting frames') if verbose
-              else images)
-
-    # Pipe stdout to DEVNULL to ignore it
-    with _call_subprocess(sp.Popen(cmd, stdin=sp.PIPE, stderr=sp.PIPE,
-                                   stdout=DEVNULL)) as pipe:
-        for k, image in enumerate(images):
-            try:
-                if image.n_channels != 1 and colour == 'gray8':
-                    warnings.warn('Frame {} is non-greyscale and the initial '
-                                  'frame was greyscale. This frame will be '
-                                  'corrupted.'.format(k))
-                if image.shape != frame_shape:  # Valid due to tuple/int
-                    warnings.warn('Frame {} is not the same shape as the '
-                                  'initial frame and therefore the output '
-                                  'may be corrupted.'.format(k))
-
-                i = image.pixels_with_channels_at_back(out_dtype=np.uint8)
-                # Handle the case of a greyscale image amidst colour images
-                if image.n_channels == 1 and colour == 'rgb24':
-                    # Repeat the channels axis 3 times
-                    i = i.reshape(i.shape + (1,)).repeat(3, axis=2)
-                pipe.stdin.write(i.tostring())
-            except IOError:
-                error = ('FFMPEG encountered the following error while '
-                         'writing the video:\n\n{}'.format(
-                    pipe.stderr.read().decode()))
-                # Re-raise the error for a useful error message
-                raise IOError(error)
+    count_frames = verbose and not hasattr(images, '__len__')
+    if verbose and not count_frames:
+        images = print_progress(images, prefix='Exporting frames')
+
+    with VideoWriter(out_path, fps=fps, codec=codec, preset=preset,
+                     bitrate=bitrate, out_pix_fmt=out_pix_fmt,
+                     **kwargs) as writer:
+        for image in images:
+            writer.write(image)
+            if count_frames:
+                print_dynamic('Exporting frames: {}'.format(writer.n_frames))
+    if count_frames:
+        print_dynamic('Exporting frames: {} - done.'.format(writer.n_frames))
+        print('')
 
 
 def imageio_video_exporter(images, out_path, fps=30, codec='libx264',
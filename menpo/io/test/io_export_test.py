@@ -219,6 +219,27 @@ def test_export_landmark_ljson_nan_values(mock_open, exists):
     assert 'null' in '{}'.format(mock_open.mock_calls)
 
 
+@patch('menpo.io.output.landmark.json.dump')
+@patch('menpo.io.output.base.Path.exists')
+@patch('{}.open'.format(__name__), create=True)
+def test_export_landmark_ljson_nan_points_are_none(mock_open, exists,
+                                                   json_dump):
+    exists.return_value = False
+    fake_path = '/fake/fake.ljson'
+    with open(fake_path) as f:
+        type(f).name = PropertyMock(return_value=fake_path)
+        mio.export_landmark_file(nan_lg, f, extension='ljson')
+
+    json_points = json_dump.call_args[0][0]['landmarks']['points']
+    assert len(json_points) == nan_lg.n_points
+    for point, expected in zip(json_points, nan_lg.points):
+        for x, e in zip(point, expected):
+            if np.isnan(e):
+                assert x is None
+            else:
+                assert type(x) is float and x == e
+
+
 @patch('menpo.io.output.landmark.np.savetxt')
 @patch('menpo.io.output.base.Path.exists')
 @patch('{}.open'.format(__name__), create=True)
@@ -397,3 +418,280 @@ def test_pickle_paths_as_pure_cleans_up_on_exception():
             raise ValueError()
     except ValueError:
         assert prev_reduce == Path.__reduce__  # ensure we clean up
+
+
+def test_export_import_image_pack_round_trip():
+    import shutil
+    import tempfile
+    from menpo.image import MaskedImage
+    images = [mio.import_builtin_asset('takeo.ppm'),
+              mio.import_builtin_asset('lenna.png').as_masked(),
+              colour_test_img]
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        pack_path = Path(tmp_dir) / 'images.pack'
+        mio.export_image_pack(iter(images), pack_path)
+        packed = mio.import_image_pack(pack_path)
+        assert len(packed) == 3
+        for image, p in zip(images, packed):
+            assert_allclose(p.pixels, image.pixels)
+            assert not p.pixels.flags.writeable
+            assert (set(p.landmarks.keys()) ==
+                    set(image.landmarks.keys()))
+            for group in image.landmarks.keys():
+                assert (type(p.landmarks[group]) ==
+                        type(image.landmarks[group]))
+                assert_allclose(p.landmarks[group].points,
+                                image.landmarks[group].points)
+        assert packed[0].path == images[0].path
+        assert isinstance(packed[1], MaskedImage)
+        assert np.all(packed[1].mask.pixels == images[1].mask.pixels)
+        assert packed[1].landmarks['LJSON'].labels == \
+            images[1].landmarks['LJSON'].labels
+    finally:
+        shutil.rmtree(tmp_dir)
+
+
+def test_export_image_pack_shares_landmark_templates():
+    import shutil
+    import tempfile
+    from menpo.io.input.pack import ImagePackReader
+    images = []
+    for i in range(3):
+        image = Image.init_blank((10, 10))
+        image.landmarks['LJSON'] = test_lg
+        image.landmarks['LJSON'].path = Path('/tmp/{}.ljson'.format(i))
+        images.append(image)
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        pack_path = Path(tmp_dir) / 'images.pack'
+        mio.export_image_pack(images, pack_path)
+        packed = ImagePackReader(pack_path)
+        assert len(packed._templates['LJSON']) == 1
+        assert not hasattr(packed[2].landmarks['LJSON'], 'path')
+        assert packed[2].landmarks['LJSON'].labels == test_lg.labels
+    finally:
+        shutil.rmtree(tmp_dir)
+
+
+@raises(ValueError)
+def test_export_image_pack_mixed_dtype():
+    import shutil
+    import tempfile
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        mio.export_image_pack([test_img,
+                               Image(np.zeros([10, 10], dtype=np.uint8))],
+                              Path(tmp_dir) / 'images.pack')
+    finally:
+        shutil.rmtree(tmp_dir)
+
+
+def test_export_images():
+    import shutil
+    import tempfile
+    images = mio.import_images(mio.data_dir_path() / '*.jpg')
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        template = os.path.join(tmp_dir, '{:03d}.png')
+        paths = mio.export_images(images, template, workers=2)
+        assert paths == [_norm_path(template.format(i))
+                         for i in range(len(images))]
+        for image, path in zip(images, paths):
+            exported = mio.import_image(path)
+            assert exported.shape == image.shape
+    finally:
+        shutil.rmtree(tmp_dir)
+
+
+def test_export_images_errors_per_item():
+    import shutil
+    import tempfile
+    from menpo.io.exceptions import OverwriteError
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        template = os.path.join(tmp_dir, '{}.png')
+        mio.export_image(test_img, template.format(1))
+        paths = mio.export_images(iter([test_img, test_img, test_img]),
+                                  template, raise_errors=False)
+        assert paths[0] == _norm_path(template.format(0))
+        assert isinstance(paths[1], OverwriteError)
+        assert paths[2] == _norm_path(template.format(2))
+    finally:
+        shutil.rmtree(tmp_dir)
+
+
+def test_export_landmark_files_process_backend():
+    import shutil
+    import tempfile
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        paths = mio.export_landmark_files(
+            [test_lg, nan_lg], lambda i, lms: os.path.join(
+                tmp_dir, '{}.ljson'.format(i)), backend='process')
+        assert_allclose(mio.import_landmark_file(paths[0]).points,
+                        test_lg.points)
+        assert_allclose(mio.import_landmark_file(paths[1]).points,
+                        nan_lg.points)
+    finally:
+        shutil.rmtree(tmp_dir)
+
+
+@raises(ValueError)
+def test_export_images_unknown_extension():
+    mio.export_images([test_img], '/tmp/{}.fake')
+
+
+@patch('subprocess.Popen')
+@patch('menpo.io.output.base.Path.exists')
+def test_export_video_generator(exists, pipe):
+    exists.return_value = False
+    fake_path = Path('/fake/fake.avi')
+    mio.export_video((test_img for _ in range(5)), fake_path, extension='avi')
+    assert pipe.return_value.stdin.write.call_count == 5
+
+
+@patch('subprocess.Popen')
+def test_video_writer_writes_frames(pipe):
+    writer = mio.VideoWriter(Path('/fake/fake.avi'))
+    with writer:
+        for _ in range(7):
+            writer.write(colour_test_img)
+    assert writer.n_frames == 7
+    assert pipe.call_count == 1
+    assert pipe.return_value.stdin.write.call_count == 7
+    frame = pipe.return_value.stdin.write.mock_calls[-1][1][0]
+    assert np.fromstring(frame, dtype=np.uint8).size == 30000
+
+
+@patch('subprocess.Popen')
+def test_video_writer_converts_in_batches(pipe):
+    from menpo.io.output.video import _frames_to_uint8
+    with patch('menpo.io.output.video._frames_to_uint8',
+               wraps=_frames_to_uint8) as frames_to_uint8:
+        with mio.VideoWriter(Path('/fake/fake.avi'), batch_size=3) as writer:
+            for _ in range(7):
+                writer.write(colour_test_img)
+    batch_sizes = [len(c[1][0]) for c in frames_to_uint8.mock_calls]
+    assert sum(batch_sizes) == 7
+    assert max(batch_sizes) <= 3
+
+
+def test_frames_to_uint8_greyscale_amidst_colour():
+    from menpo.io.output.video import _frames_to_uint8
+    frames = _frames_to_uint8([np.ones((3, 4, 5)), np.zeros((1, 4, 5)),
+                               np.ones((3, 4, 5))], 'rgb24')
+    assert [f.shape for f in frames] == [(4, 5, 3)] * 3
+    assert [f.dtype for f in frames] == [np.uint8] * 3
+    assert [f.max() for f in frames] == [255, 0, 255]
+
+
+@patch('subprocess.Popen')
+def test_video_writer_frame_can_be_reused(pipe):
+    image = Image.init_blank((10, 10), n_channels=3)
+    with mio.VideoWriter(Path('/fake/fake.avi')) as writer:
+        for i in range(5):
+            # Draw every frame in to the same buffer
+            image.pixels[:] = i / 255.
+            writer.write(image)
+    frames = [np.fromstring(c[1][0], dtype=np.uint8)
+              for c in pipe.return_value.stdin.write.mock_calls]
+    assert [f[0] for f in frames] == list(range(5))
+
+
+@patch('subprocess.Popen')
+@patch('menpo.io.output.base.Path.exists')
+def test_export_video_generator_verbose(exists, pipe):
+    exists.return_value = False
+    with patch('sys.stdout') as stdout:
+        mio.export_video((test_img for _ in range(3)), Path('/fake/fake.avi'),
+                         extension='avi', verbose=True)
+    printed = ''.join(c[1][0] for c in stdout.write.mock_calls)
+    assert 'Exporting frames: 3 - done.' in printed
+
+
+@raises(IOError)
+@patch('subprocess.Popen')
+def test_video_writer_forwards_errors(pipe):
+    pipe.return_value.stdin.write.side_effect = IOError
+    pipe.return_value.stderr.read.return_value = b'broken'
+    writer = mio.VideoWriter(Path('/fake/fake.avi'))
+    writer.write(test_img)
+    writer.close()
+
+
+@raises(ValueError)
+@patch('subprocess.Popen')
+def test_video_writer_write_after_close(pipe):
+    writer = mio.VideoWriter(Path('/fake/fake.avi'))
+    writer.write(test_img)
+    writer.close()
+    writer.write(test_img)
+
+
+def test_export_import_mpkl_round_trip():
+    import shutil
+    import tempfile
+    from menpo.io.utils import _PACK_ALIGN
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        path = Path(tmp_dir) / 'objects.mpkl'
+        fortran = np.asfortranarray(np.random.rand(40, 30))
+        obj = {'image': colour_test_img, 'fortran': fortran,
+               'small': [1, 'two'], 'path': Path('/a/b.png')}
+        mio.export_pickle(obj, path)
+        loaded = mio.import_pickle(path)
+        assert loaded['small'] == [1, 'two']
+        assert str(loaded['path']) == str(Path('/a/b.png'))
+        pixels = loaded['image'].pixels
+        assert np.all(pixels == colour_test_img.pixels)
+        # The arrays are read-only, aligned views on to the file
+        assert not pixels.flags.writeable
+        assert pixels.ctypes.data % _PACK_ALIGN == 0
+        assert np.all(loaded['fortran'] == fortran)
+        assert loaded['fortran'].flags.f_contiguous
+        # copy-on-write gives writeable arrays
+        loaded = mio.import_pickle(path, mode='c')
+        loaded['fortran'][0, 0] = -1
+        assert mio.import_pickle(path)['fortran'][0, 0] == fortran[0, 0]
+    finally:
+        shutil.rmtree(tmp_dir)
+
+
+def test_export_import_compressed_pickles_round_trip():
+    import gzip
+    import shutil
+    import tempfile
+    from menpo.io.utils import _BGZ_BLOCK_SIZE
+    obj = {'array': np.random.rand(_BGZ_BLOCK_SIZE // 8 + 100),
+           'lg': test_lg}
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        for ext in ['.pkl.bz2', '.pkl.xz', '.pkl.bgz']:
+            path = Path(tmp_dir) / ('objects' + ext)
+            mio.export_pickle(obj, path, compression_level=1, workers=2)
+            loaded = mio.import_pickle(path)
+            assert np.all(loaded['array'] == obj['array'])
+            assert np.all(loaded['lg'].points == test_lg.points)
+        # Block compressed pickles are valid gzip files
+        with gzip.open(str(Path(tmp_dir) / 'objects.pkl.bgz'), 'rb') as f:
+            loaded = mio.output.pickle.pickle.loads(f.read())
+        assert np.all(loaded['array'] == obj['array'])
+    finally:
+        shutil.rmtree(tmp_dir)
+
+
+@raises(ValueError)
+def test_import_corrupt_bgz_pickle():
+    import shutil
+    import tempfile
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        path = Path(tmp_dir) / 'objects.pkl.bgz'
+        mio.export_pickle(np.arange(100), path)
+        with open(str(path), 'r+b') as f:
+            f.seek(-8, os.SEEK_END)
+            f.write(b'\0' * 4)
+        mio.import_pickle(path)
+    finally:
+        shutil.rmtree(tmp_dir)
@@ -1,6 +1,8 @@
+import os
 import sys
 import warnings
 import numpy as np
+from numpy.testing import assert_allclose
 from mock import patch, MagicMock
 from nose.tools import raises
 from PIL import Image as PILImage
@@ -69,18 +71,18 @@ def test_path():
     assert(img.path.name == 'einstein.jpg')
 
 
-@patch('menpo.io.input.base._pathlib_glob_for_pattern')
-def test_single_suffix_dot_in_path(pathlib_glob):
+@patch('menpo.io.input.base._scan_dir')
+def test_single_suffix_dot_in_path(scan_dir):
     import menpo.io.input.base as mio_base
     from pathlib import Path
 
     fake_path = Path('fake_path.t0.t1.t2')
-    pathlib_glob.return_value = [fake_path]
+    scan_dir.return_value = [(fake_path.name, False)]
     ext_map = MagicMock()
     ext_map.__contains__.side_effect = lambda x: x == '.t2'
 
     ret_val = next(mio_base.glob_with_suffix('*.t0.t1.t2', ext_map))
-    assert (ret_val == fake_path)
+    assert (ret_val.name == fake_path.name)
     ext_map.__contains__.assert_called_with('.t2')
 
 
@@ -93,18 +95,18 @@ def test_upper_extension_mapped_to_lower():
     ext_map.get.assert_called_with('.jpg')
 
 
-@patch('menpo.io.input.base._pathlib_glob_for_pattern')
-def test_double_suffix(pathlib_glob):
+@patch('menpo.io.input.base._scan_dir')
+def test_double_suffix(scan_dir):
     import menpo.io.input.base as mio_base
     from pathlib import Path
 
     fake_path = Path('fake_path.t1.t2')
-    pathlib_glob.return_value = [fake_path]
+    scan_dir.return_value = [(fake_path.name, False)]
     ext_map = MagicMock()
     ext_map.__contains__.side_effect = lambda x: x == '.t1.t2'
 
     ret_val = next(mio_base.glob_with_suffix('*.t1.t2', ext_map))
-    assert (ret_val == fake_path)
+    assert (ret_val.name == fake_path.name)
     ext_map.__contains__.assert_any_call('.t1.t2')
     ext_map.__contains__.assert_any_call('.t2')
 
@@ -163,6 +165,25 @@ def test_import_images_are_ordered_and_unduplicated():
     assert exp_imgs_filenames == imgs_filenames
 
 
+@patch('menpo.io.input.base.landmark_file_paths')
+def test_import_images_landmarks_resolved_from_index(landmark_file_paths):
+    imgs = list(mio.import_images(mio.data_dir_path()))
+    assert not landmark_file_paths.called
+    lms = {i.path.stem: set(i.landmarks.keys()) for i in imgs}
+    assert lms['lenna'] == {'LJSON'}
+    assert lms['takeo'] == {'PTS'}
+    assert lms['menpo_thumbnail'] == set()
+
+
+def test_same_name_indexed_matches_same_name():
+    from menpo.io.input import (same_name, same_name_indexed,
+                                landmark_stem_index)
+    paths = list(mio.image_paths(mio.data_dir_path()))
+    index = landmark_stem_index(paths)
+    for p in paths:
+        assert same_name_indexed(p, index) == same_name(p)
+
+
 def test_lsimgs_filenamess():
     assert(set(mio.ls_builtin_assets()) == {'breakingbad.jpg',
                                             'einstein.jpg', 'einstein.pts',
@@ -188,6 +209,127 @@ def test_import_landmark_files_wrong_path_raises_value_error():
     list(mio.import_landmark_files('asldfjalkgjlaknglkajlekjaltknlaekstjlakj'))
 
 
+def test_import_images_shards_partition():
+    pattern = mio.data_dir_path() / '*'
+    paths = [im.path for im in mio.import_images(pattern)]
+    shards = [[im.path for im in mio.import_images(pattern, shard=(i, 3))]
+              for i in range(3)]
+    assert sorted(p for s in shards for p in s) == sorted(paths)
+    assert all(len(s) > 0 for s in shards)
+    # the order within a shard is preserved and the partition is stable
+    assert all(s == sorted(s) for s in shards)
+    assert shards[1] == [im.path for im in
+                         mio.import_images(pattern, shard=(1, 3))]
+
+
+def test_import_images_shards_by_size_partition():
+    pattern = mio.data_dir_path() / '*'
+    paths = [im.path for im in mio.import_images(pattern)]
+    shards = [[im.path for im in mio.import_images(pattern, shard=(i, 3),
+                                                   shard_by_size=True)]
+              for i in range(3)]
+    assert sorted(p for s in shards for p in s) == sorted(paths)
+    assert all(s == sorted(s) for s in shards)
+
+
+def test_shard_filepaths_falls_back_to_index_split():
+    from pathlib import Path
+    from menpo.io.input.base import _file_sizes, _shard_filepaths
+    paths = [mio.data_path_to('takeo.ppm'), Path('/does/not/exist.png'),
+             mio.data_path_to('lenna.png')]
+    assert _file_sizes(paths, None) is None
+    assert _shard_filepaths(paths, (0, 2)) == [paths[0], paths[2]]
+    assert _shard_filepaths(paths, (1, 2)) == [paths[1]]
+
+
+def test_file_sizes_read_from_manifest():
+    import shutil
+    import tempfile
+    from pathlib import Path
+    from menpo.io.input.base import _file_sizes, _glob_for_pattern
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        for i in range(3):
+            with open(os.path.join(tmp_dir, '{}.pkl'.format(i)), 'wb') as f:
+                f.write(b'0' * (i + 1))
+        pattern = Path(tmp_dir) / '*.pkl'
+        paths = list(_glob_for_pattern(pattern, manifest=True))
+        # Rewriting a file in place leaves the manifest valid
+        with open(str(paths[0]), 'wb') as f:
+            f.write(b'0' * 10)
+        assert _file_sizes(paths, pattern, manifest=True) == [1, 2, 3]
+        assert _file_sizes(paths, pattern) == [10, 2, 3]
+    finally:
+        shutil.rmtree(tmp_dir)
+
+
+def test_import_landmark_files_seeded_shuffle():
+    pattern = mio.data_dir_path() / '*'
+    a = [l.path for l in mio.import_landmark_files(pattern, shuffle=True,
+                                                   seed=1)]
+    b = [l.path for l in mio.import_landmark_files(pattern, shuffle=True,
+                                                   seed=1)]
+    assert a == b
+
+
+def test_import_images_seeded_shuffled_shards_partition():
+    import subprocess
+    pattern = mio.data_dir_path() / '*'
+    code = ('import menpo.io as mio; '
+            'print("\\n".join(str(im.path) for im in mio.import_images('
+            '{!r}, shuffle=True, seed=3, shard=({{}}, 2))))'.format(
+                str(pattern)))
+    # Each shard is imported by a separate process
+    shards = [subprocess.check_output(
+        [sys.executable, '-c', code.format(i)]).decode('utf8').splitlines()
+        for i in range(2)]
+    paths = [str(im.path) for im in mio.import_images(pattern)]
+    assert sorted(shards[0] + shards[1]) == sorted(paths)
+
+
+@raises(ValueError)
+def test_import_images_unseeded_shuffled_shard_raises():
+    mio.import_images(mio.data_dir_path() / '*', shuffle=True, shard=(0, 2))
+
+
+@raises(ValueError)
+def test_import_images_invalid_shard_raises():
+    mio.import_images(mio.data_dir_path() / '*', shard=(3, 3))
+
+
+def test_import_landmark_files_packed():
+    pattern = mio.data_dir_path() / '*.pts'
+    # breakingbad, einstein and takeo all have 68 points
+    points, template = mio.import_landmark_files(pattern, max_landmarks=3,
+                                                 packed=True)
+    lmarks = list(mio.import_landmark_files(pattern, max_landmarks=3))
+    assert points.shape == (3, 68, 2)
+    assert template.n_points == 68
+    for p, l in zip(points, lmarks):
+        assert_allclose(p, l.points)
+    assert_allclose(template.from_vector(points[1].ravel()).points,
+                    lmarks[1].points)
+
+
+@raises(ValueError)
+def test_import_landmark_files_packed_different_layouts_raises():
+    # tongue has a different number of points
+    mio.import_landmark_files(mio.data_dir_path() / '*.pts', packed=True)
+
+
+def test_pts_parse_ragged_rows():
+    from menpo.io.input.landmark import _parse_pts_points
+    text = 'version: 1\nn_points: 2\n{\n1.0 2.0 a\n3.0 4.0\n}\n'
+    assert_allclose(_parse_pts_points(text), [[1, 2], [3, 4]])
+
+
+def test_pts_parse_ragged_rows_matching_total():
+    from menpo.io.input.landmark import _parse_pts_points
+    # 9 values in total, but not 3 per row
+    text = 'version: 1\nn_points: 3\n{\n1 2 3\n4 5\n6 7 8 9\n}\n'
+    assert_allclose(_parse_pts_points(text), [[1, 2], [4, 5], [6, 7]])
+
+
 @patch('PIL.Image.open')
 @patch('menpo.io.input.base.Path.is_file')
 def test_importing_PIL_no_normalize(is_file, mock_image):
@@ -472,6 +614,46 @@ def test_import_as_generator():
     assert isinstance(gen, types.GeneratorType)
 
 
+def test_import_images_prefetch_preserves_order():
+    import types
+    gen = mio.import_images(mio.data_dir_path(), as_generator=True,
+                            prefetch=3, workers=2)
+    assert isinstance(gen, types.GeneratorType)
+    exp = [i.path for i in mio.import_images(mio.data_dir_path())]
+    imgs = list(gen)
+    assert [i.path for i in imgs] == exp
+    assert imgs[0].has_landmarks
+
+
+def test_import_images_prefetch_process_backend():
+    gen = mio.import_images(mio.data_dir_path(), as_generator=True,
+                            prefetch=2, workers=2, prefetch_backend='process')
+    exp = list(mio.import_images(mio.data_dir_path()))
+    imgs = list(gen)
+    assert [i.path for i in imgs] == [i.path for i in exp]
+    assert ([sorted(i.landmarks.keys()) for i in imgs] ==
+            [sorted(i.landmarks.keys()) for i in exp])
+
+
+@raises(ValueError)
+def test_import_videos_prefetch_process_backend_raises():
+    mio.import_videos(mio.data_dir_path(), as_generator=True, prefetch=2,
+                      prefetch_backend='process')
+
+
+@raises(IOError)
+@patch('PIL.Image.open')
+def test_import_images_prefetch_forwards_errors(mock_image):
+    mock_image.side_effect = IOError('decode failed')
+    list(mio.import_images(mio.data_dir_path(), as_generator=True,
+                           prefetch=2))
+
+
+@raises(ValueError)
+def test_import_images_prefetch_requires_generator():
+    mio.import_images(mio.data_dir_path(), prefetch=2)
+
+
 def test_import_lazy_list():
     from menpo.base import LazyList
     data_path = mio.data_dir_path()
@@ -524,14 +706,13 @@ def test_importing_pickle_encoding_ignored_py2(version_info, is_file, mock_open,
 
 @patch('menpo.io.input.pickle.pickle.load')
 @patch('{}.open'.format(builtins_str))
-@patch('menpo.io.input.base.Path.glob')
+@patch('menpo.io.input.base._scan_dir')
 @patch('menpo.io.input.base.Path.is_file')
-def test_importing_pickles(is_file, glob, mock_open, mock_pickle):
-    from pathlib import Path
+def test_importing_pickles(is_file, scan_dir, mock_open, mock_pickle):
     from menpo.base import LazyList
     mock_pickle.return_value = {'test': 1}
     is_file.return_value = True
-    glob.return_value = [Path('mocked1.pkl'), Path('mocked2.pkl')]
+    scan_dir.return_value = [('mocked1.pkl', False), ('mocked2.pkl', False)]
 
     objs = mio.import_pickles('*')
     assert isinstance(objs, LazyList)
@@ -542,14 +723,14 @@ def test_importing_pickles(is_file, glob, mock_open, mock_pickle):
 
 @patch('menpo.io.input.pickle.pickle.load')
 @patch('{}.open'.format(builtins_str))
-@patch('menpo.io.input.base.Path.glob')
+@patch('menpo.io.input.base._scan_dir')
 @patch('menpo.io.input.base.Path.is_file')
-def test_importing_pickles_as_generator(is_file, glob, mock_open, mock_pickle):
-    from pathlib import Path
+def test_importing_pickles_as_generator(is_file, scan_dir, mock_open,
+                                        mock_pickle):
     import types
     mock_pickle.return_value = {'test': 1}
     is_file.return_value = True
-    glob.return_value = [Path('mocked1.pkl'), Path('mocked2.pkl')]
+    scan_dir.return_value = [('mocked1.pkl', False), ('mocked2.pkl', False)]
 
     objs = mio.import_pickles('*', as_generator=True)
     assert isinstance(objs, types.GeneratorType)
@@ -720,3 +901,689 @@ def test_register_no_leading_period():
     mio.input.base._register_importer(ext_map, 'foo', lambda x: x)
     assert '.foo' in ext_map
     assert 'foo' not in ext_map
+
+
+@patch('PIL.Image.open', wraps=PILImage.open)
+def test_import_cache_hit_skips_importer(mock_image):
+    import shutil
+    import tempfile
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        cache = mio.set_import_cache(tmp_dir)
+        img_path = mio.data_path_to('takeo.ppm')
+        im1 = mio.import_image(img_path)
+        assert mock_image.call_count == 1
+        im2 = mio.import_image(img_path)
+        # The pixels and landmarks both came from the cache
+        assert mock_image.call_count == 1
+        assert cache.hits == 2
+        assert np.all(im1.pixels == im2.pixels)
+        assert np.all(im1.landmarks['PTS'].points ==
+                      im2.landmarks['PTS'].points)
+        assert im2.path == img_path
+        # Different importer kwargs are a different entry
+        mio.import_image(img_path, normalize=False)
+        assert mock_image.call_count == 2
+    finally:
+        mio.set_import_cache(None)
+        shutil.rmtree(tmp_dir)
+
+
+@patch('PIL.Image.open', wraps=PILImage.open)
+def test_import_cache_unloadable_entry_is_a_miss(mock_image):
+    import shutil
+    import tempfile
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        cache = mio.set_import_cache(tmp_dir)
+        img_path = mio.data_path_to('takeo.ppm')
+        mio.import_image(img_path, landmark_resolver=None)
+        entry_path, = list(cache.directory.glob('*.pkl'))
+        # e.g. an entry written by a version of menpo with other classes
+        with open(str(entry_path), 'wb') as f:
+            f.write(b'\x80\x02cmenpo.nothing\nNothing\nq\x00.')
+        img = mio.import_image(img_path, landmark_resolver=None)
+        assert mock_image.call_count == 2
+        assert cache.hits == 0
+        assert img.shape == (225, 150)
+        # The entry is replaced by the newly imported image
+        mio.import_image(img_path, landmark_resolver=None)
+        assert mock_image.call_count == 2
+        assert cache.hits == 1
+    finally:
+        mio.set_import_cache(None)
+        shutil.rmtree(tmp_dir)
+
+
+def test_import_cache_key_includes_menpo_version():
+    from pathlib import Path
+    from menpo.io.cache import ImportCache
+    path = Path(mio.data_path_to('takeo.ppm'))
+    key = ImportCache._key(path, mio.import_image, None, {})
+    with patch('menpo.__version__', 'another.version'):
+        assert ImportCache._key(path, mio.import_image, None, {}) != key
+
+
+@patch('menpo.io.cache._replace')
+def test_import_cache_failed_write_leaves_no_tmp(mock_replace):
+    import shutil
+    import tempfile
+    mock_replace.side_effect = OSError('No space left on device')
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        cache = mio.set_import_cache(tmp_dir)
+        img = mio.import_image(mio.data_path_to('takeo.ppm'),
+                               landmark_resolver=None)
+        assert img.shape == (225, 150)
+        assert list(cache.directory.iterdir()) == []
+        assert cache.n_bytes == 0
+    finally:
+        mio.set_import_cache(None)
+        shutil.rmtree(tmp_dir)
+
+
+def test_import_cache_evicts_least_recently_used():
+    import shutil
+    import tempfile
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        cache = mio.set_import_cache(tmp_dir, max_bytes=3 * 10 ** 6)
+        mio.import_image(mio.data_path_to('takeo.ppm'), landmark_resolver=None)
+        mio.import_image(mio.data_path_to('einstein.jpg'),
+                         landmark_resolver=None)
+        mio.import_image(mio.data_path_to('lenna.png'),
+                         landmark_resolver=None)
+        # einstein + lenna alone exceed the budget
+        assert cache.n_bytes <= cache.max_bytes
+        assert len(list(cache.directory.glob('*.pkl'))) == 1
+    finally:
+        mio.set_import_cache(None)
+        shutil.rmtree(tmp_dir)
+
+
+def test_import_image_scale_hint_jpeg():
+    img_path = mio.data_path_to('breakingbad.jpg')
+    full = mio.import_image(img_path)
+    img = mio.import_image(img_path, scale_hint=0.25)
+    assert img.shape == (270, 480)
+    assert np.all(img.draft_scale == 0.25)
+    assert np.allclose(img.landmarks['PTS'].points,
+                       full.landmarks['PTS'].points * 0.25)
+
+
+def _write_asf(path, points, shape):
+    # Write an open path ASF file of image points, normalised by shape
+    lines = [str(len(points))]
+    for i, (y, x) in enumerate(points):
+        lines.append('0 4 {} {} {} {} {} 0.00 0.00 0.00'.format(
+            x / shape[1], y / shape[0], i, max(i - 1, 0),
+            min(i + 1, len(points) - 1)))
+    lines.append('image.jpg')
+    with open(str(path), 'w') as f:
+        f.write('\n'.join(lines))
+
+
+def test_import_image_scale_hint_asf_landmarks():
+    import shutil
+    import tempfile
+    from pathlib import Path
+    tmp_dir = Path(tempfile.mkdtemp())
+    try:
+        img_path = tmp_dir / 'breakingbad.jpg'
+        shutil.copy(str(mio.data_path_to('breakingbad.jpg')), str(img_path))
+        _write_asf(tmp_dir / 'breakingbad.asf',
+                   [[200., 300.], [400., 600.]], (1080, 1920))
+        img = mio.import_image(img_path, scale_hint=0.5)
+        assert img.shape == (540, 960)
+        # ASF landmarks are relative to the decoded image, so are only
+        # scaled once
+        assert_allclose(img.landmarks['ASF'].points,
+                        [[100., 150.], [200., 300.]])
+    finally:
+        shutil.rmtree(str(tmp_dir))
+
+
+def test_import_image_scale_hint_never_below_hint():
+    img = mio.import_image(mio.data_path_to('breakingbad.jpg'),
+                           scale_hint=0.3)
+    # The closest reduction that is at least 30% is 50%
+    assert img.shape == (540, 960)
+
+
+def test_import_image_scale_hint_ignored_for_non_jpeg():
+    img = mio.import_image(mio.data_path_to('takeo.ppm'), scale_hint=0.25)
+    assert img.shape == (225, 150)
+    assert not hasattr(img, 'draft_scale')
+
+
+@raises(ValueError)
+def test_import_image_scale_hint_invalid():
+    mio.import_image(mio.data_path_to('breakingbad.jpg'), scale_hint=2)
+
+
+@raises(ValueError)
+def test_import_image_scale_hint_invalid_non_jpeg():
+    mio.import_image(mio.data_path_to('takeo.ppm'), scale_hint=-1)
+
+
+def test_image_metadata_matches_import():
+    metadata = mio.image_metadata(mio.data_dir_path() / '*.jpg')
+    paths = list(mio.image_paths(mio.data_dir_path() / '*.jpg'))
+    assert len(metadata) == len(paths)
+    assert list(metadata['path']) == [str(p) for p in paths]
+    for row in metadata:
+        img = mio.import_image(row['path'], normalize=False)
+        assert tuple(row['shape']) == img.shape
+        assert row['n_channels'] == img.n_channels
+        assert row['dtype'] == 'uint8'
+        assert row['landmarks']['PTS'] == ('PTS' in img.landmarks)
+
+
+def test_image_metadata_n_channels_matches_import_png():
+    import shutil
+    import tempfile
+    from pathlib import Path
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        pixels = np.random.randint(0, 255, size=(8, 6, 4)).astype(np.uint8)
+        rgba = PILImage.fromarray(pixels, mode='RGBA')
+        images = {'rgba': rgba, 'rgb': rgba.convert('RGB'),
+                  'p': rgba.convert('RGB').convert('P'),
+                  'l': rgba.convert('L'),
+                  'bool': rgba.convert('1')}
+        for name, pil_image in images.items():
+            pil_image.save(str(Path(tmp_dir) / '{}.png'.format(name)))
+        metadata = mio.image_metadata(Path(tmp_dir) / '*.png')
+        assert len(metadata) == len(images)
+        for row in metadata:
+            img = mio.import_image(row['path'])
+            assert row['n_channels'] == img.n_channels
+    finally:
+        shutil.rmtree(tmp_dir)
+
+
+def test_image_metadata_fallback_n_channels_matches_import():
+    import shutil
+    import tempfile
+    from pathlib import Path
+    from menpo.io.input.extensions import image_metadata_readers
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        path = Path(tmp_dir) / 'rgba.png'
+        pixels = np.random.randint(0, 255, size=(8, 6, 4)).astype(np.uint8)
+        PILImage.fromarray(pixels, mode='RGBA').save(str(path))
+        # Without a header reader the image is fully imported
+        with patch.dict(image_metadata_readers, clear=True):
+            metadata = mio.image_metadata(path)
+        img = mio.import_image(path)
+        assert metadata['n_channels'][0] == img.n_channels == 3
+        assert tuple(metadata['shape'][0]) == img.shape
+        assert metadata['mode'][0] == ''
+    finally:
+        shutil.rmtree(tmp_dir)
+
+
+@patch('PIL.Image.open', wraps=PILImage.open)
+def test_image_metadata_registered_importer_is_used(mock_image):
+    from menpo.image import Image
+    from menpo.io.input.extensions import image_types
+    path = mio.data_path_to('takeo.ppm')
+
+    def ppm_importer(filepath, asset=None, normalize=True, **kwargs):
+        return Image.init_blank((7, 5), n_channels=2)
+    with patch.dict(image_types, {'.ppm': ppm_importer}):
+        metadata = mio.image_metadata(path, landmark_resolver=None)
+    # The header of the file is never read by the default reader
+    assert mock_image.call_count == 0
+    assert tuple(metadata['shape'][0]) == (7, 5)
+    assert metadata['n_channels'][0] == 2
+
+
+@patch('menpo.io.input.video.video_infos_ffprobe')
+@patch('subprocess.Popen')
+def test_image_metadata_gif_matches_video_import(pipe, video_infos_ffprobe):
+    import shutil
+    import tempfile
+    from pathlib import Path
+    video_infos_ffprobe.return_value = {'duration': 1, 'width': 6,
+                                        'height': 8, 'n_frames': 2, 'fps': 2}
+    pipe.return_value.poll.return_value = None
+    pipe.return_value.stdout.read.side_effect = lambda n: b'\0' * n
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        path = Path(tmp_dir) / 'animated.gif'
+        with open(str(path), 'wb') as f:
+            f.write(b'GIF89a')
+        metadata = mio.image_metadata(path, landmark_resolver=None)
+        # .gif files are imported as videos by ffmpeg, not read by Pillow
+        assert tuple(metadata['shape'][0]) == (8, 6)
+        assert metadata['n_channels'][0] == 3
+        assert metadata['mode'][0] == ''
+    finally:
+        shutil.rmtree(tmp_dir)
+
+
+def test_image_metadata_no_landmark_resolver():
+    metadata = mio.image_metadata(mio.data_dir_path() / 'takeo.*',
+                                  landmark_resolver=None)
+    assert metadata['mode'][0] == 'RGB'
+    assert metadata['landmarks'].dtype.names == ()
+
+
+@patch('PIL.Image.Image.load')
+def test_image_metadata_does_not_decode(mock_load):
+    mio.image_metadata(mio.data_dir_path() / '*.png')
+    assert mock_load.call_count == 0
+
+
+@raises(ValueError)
+def test_image_metadata_no_images():
+    mio.image_metadata(mio.data_dir_path() / '*.nothing')
+
+
+def _fake_video_stdout(frame_shape):
+    # Each frame is filled with its own index so that reads can be checked
+    n_bytes = int(np.prod(frame_shape))
+    state = {'frame': 0}
+
+    def read(n):
+        frames = []
+        for _ in range(n // n_bytes):
+            frames.append(np.full(n_bytes, state['frame'], dtype=np.uint8))
+            state['frame'] += 1
+        return np.concatenate(frames).tostring()
+    return read
+
+
+@patch('subprocess.Popen')
+@patch('menpo.io.input.video.video_infos_ffprobe')
+def test_ffmpeg_reader_frame_cache(video_infos_ffprobe, pipe):
+    from pathlib import Path
+    from menpo.io.input.video import FFMpegVideoReader
+    video_infos_ffprobe.return_value = {'duration': 4, 'width': 10,
+                                        'height': 15, 'n_frames': 20, 'fps': 5}
+    pipe.return_value.poll.return_value = None
+    pipe.return_value.stdout.read.side_effect = _fake_video_stdout((15, 10, 3))
+    reader = FFMpegVideoReader(Path('fake_video_being_mocked.avi'),
+                               cache_size=4)
+    for i in range(4):
+        assert reader[i][0, 0, 0] == i
+    # Backwards within the cache - the pipe is not reopened
+    assert reader[1][0, 0, 0] == 1
+    assert pipe.call_count == 1
+    # Skipped frames are cached too
+    assert reader[10][0, 0, 0] == 10
+    assert reader[8][0, 0, 0] == 8
+    assert pipe.call_count == 1
+    # Evicted frames require a seek
+    pipe.return_value.stdout.read.side_effect = _fake_video_stdout((15, 10, 3))
+    reader[2]
+    assert pipe.call_count == 2
+
+
+@patch('subprocess.Popen')
+@patch('menpo.io.input.video.video_seek_index')
+@patch('menpo.io.input.video.video_infos_ffprobe')
+def test_ffmpeg_reader_seek_index(video_infos_ffprobe, video_seek_index,
+                                  pipe):
+    from pathlib import Path
+    from menpo.io.input.video import FFMpegVideoReader
+    video_infos_ffprobe.return_value = {'duration': 4, 'width': 10,
+                                        'height': 15, 'n_frames': 20, 'fps': 5}
+    video_seek_index.return_value = (np.arange(20) / 5.0 + 1,
+                                     np.array([0, 10]))
+    pipe.return_value.poll.return_value = None
+    pipe.return_value.stdout.read.side_effect = _fake_video_stdout((15, 10, 3))
+    reader = FFMpegVideoReader(Path('fake_video_being_mocked.avi'),
+                               seek_index=True, cache_size=0)
+    reader[0]
+    # No keyframe is skipped - decode forwards
+    reader[6]
+    assert pipe.call_count == 1
+    # Skipping keyframe 10 - seek half way between frames 14 and 15
+    reader[15]
+    assert pipe.call_count == 2
+    command = pipe.call_args[0][0]
+    seek_time = float(command[command.index('-ss') + 1])
+    assert np.allclose(seek_time, 2.9)
+
+
+@patch('subprocess.Popen')
+def test_video_seek_index_persisted(pipe):
+    import shutil
+    import tempfile
+    from pathlib import Path
+    from menpo.io.input.video import video_seek_index
+    pipe.return_value.stdout.readlines.return_value = [
+        b'0.200000,__\n', b'0.000000,K_\n', b'0.100000,__\n', b'0.300000,K_\n']
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        video_path = Path(tmp_dir) / 'video.avi'
+        with open(str(video_path), 'wb') as f:
+            f.write(b'not really a video')
+        pts, keyframes = video_seek_index(video_path)
+        assert np.allclose(pts, [0, 0.1, 0.2, 0.3])
+        assert list(keyframes) == [0, 3]
+        pts, keyframes = video_seek_index(video_path)
+        assert pipe.call_count == 1
+        assert list(keyframes) == [0, 3]
+    finally:
+        shutil.rmtree(tmp_dir)
+
+
+@patch('subprocess.Popen')
+@patch('menpo.io.input.video.video_infos_ffprobe')
+@patch('menpo.io.input.base.Path.is_file')
+def test_importing_ffmpeg_decode_filters(is_file, video_infos_ffprobe, pipe):
+    video_infos_ffprobe.return_value = {'duration': 2, 'width': 100,
+                                        'height': 150, 'n_frames': 10, 'fps': 5}
+    is_file.return_value = True
+    empty_frame = np.zeros(30 * 20, dtype=np.uint8).tostring()
+    pipe.return_value.stdout.read.return_value = empty_frame
+    pipe.return_value.stderr.read.return_value = b'frame=    5 fps=0.0\n'
+    resolved_frames = []
+
+    def resolver(path, frame_number):
+        resolved_frames.append(frame_number)
+        return {}
+
+    ll = mio.import_video('fake_image_being_mocked.avi', normalize=False,
+                          landmark_resolver=resolver, shape=(30, 20),
+                          crop=((10, 20), (110, 70)), greyscale=True,
+                          fps=2.5)
+    assert len(ll) == 5
+    image = ll[1]
+    assert image.shape == (30, 20)
+    assert image.n_channels == 1
+    # Landmarks are resolved against the original frame numbers
+    assert resolved_frames == [2]
+    command = pipe.call_args[0][0]
+    assert (command[command.index('-vf') + 1] ==
+            'fps=2.5,crop=50:100:20:10,scale=20:30')
+    assert command[command.index('-pix_fmt') + 1] == 'gray'
+
+
+@patch('subprocess.Popen')
+@patch('menpo.io.input.video.video_infos_ffprobe')
+def test_ffmpeg_reader_fps_counts_resampled_frames(video_infos_ffprobe, pipe):
+    from pathlib import Path
+    from menpo.io.input.video import FFMpegVideoReader
+    video_infos_ffprobe.return_value = {'duration': 10, 'width': 10,
+                                        'height': 15, 'n_frames': 100,
+                                        'fps': 30}
+    # 100 frames at 30 fps are 23.3 frames at 7 fps - ffmpeg returns 24
+    pipe.return_value.stderr.read.return_value = (
+        b'frame=   12 fps=0.0 q=-0.0\rframe=   24 fps=0.0 q=-0.0\n')
+    reader = FFMpegVideoReader(Path('fake_video_being_mocked.avi'), fps=7)
+    assert len(reader) == 24
+    command = pipe.call_args[0][0]
+    assert command[command.index('-vf') + 1] == 'fps=7.0'
+
+
+@raises(IndexError)
+@patch('subprocess.Popen')
+@patch('menpo.io.input.video.video_infos_ffprobe')
+def test_ffmpeg_reader_short_read_raises_index_error(video_infos_ffprobe,
+                                                     pipe):
+    from pathlib import Path
+    from menpo.io.input.video import FFMpegVideoReader
+    video_infos_ffprobe.return_value = {'duration': 4, 'width': 10,
+                                        'height': 15, 'n_frames': 20, 'fps': 5}
+    pipe.return_value.poll.return_value = None
+    # ffmpeg returns one frame fewer than expected
+    pipe.return_value.stdout.read.side_effect = lambda n: b'\0' * (n - 1)
+    reader = FFMpegVideoReader(Path('fake_video_being_mocked.avi'))
+    reader[19]
+
+
+@patch('menpo.io.input.video.video_infos_ffprobe')
+def test_ffmpeg_reader_frame_transform(video_infos_ffprobe):
+    from pathlib import Path
+    from menpo.io.input.video import FFMpegVideoReader
+    from menpo.shape import PointCloud
+    video_infos_ffprobe.return_value = {'duration': 2, 'width': 100,
+                                        'height': 150, 'n_frames': 10, 'fps': 5}
+    reader = FFMpegVideoReader(Path('fake_video_being_mocked.avi'),
+                               shape=(50, 25), crop=((10, 20), (110, 70)))
+    pc = PointCloud(np.array([[10., 20.], [110., 70.]]))
+    assert np.allclose(reader.frame_transform.apply(pc).points,
+                       [[0, 0], [50, 25]])
+    assert list(reader.source_frame_indices()) == list(range(10))
+
+
+def test_import_videos_landmarks_use_own_frame_transform():
+    from pathlib import Path
+    from menpo.base import LazyList
+    from menpo.image import Image
+    from menpo.io.input.base import _import_lazylist_attach_landmarks
+    from menpo.io.input.extensions import image_landmark_types
+    from menpo.transform import Scale
+    lm_path = mio.data_path_to('einstein.pts')
+    videos = []
+    for scale in (0.5, 2.0):
+        video = LazyList.init_from_iterable([Image.init_blank((10, 10))])
+        video.path = Path('video_{}.avi'.format(scale))
+        video.frame_transform = Scale(scale, n_dims=2)
+        videos.append(video)
+    _import_lazylist_attach_landmarks(videos, lambda p, i: {'PTS': lm_path},
+                                      landmark_ext_map=image_landmark_types)
+    points = mio.import_landmark_file(lm_path).points
+    assert_allclose(videos[0][0].landmarks['PTS'].points, points * 0.5)
+    assert_allclose(videos[1][0].landmarks['PTS'].points, points * 2.0)
+
+
+def test_import_videos_asf_landmarks_not_frame_transformed():
+    import shutil
+    import tempfile
+    from pathlib import Path
+    from menpo.base import LazyList
+    from menpo.image import Image
+    from menpo.io.input.base import _import_lazylist_attach_landmarks
+    from menpo.io.input.extensions import image_landmark_types
+    from menpo.transform import Scale
+    tmp_dir = Path(tempfile.mkdtemp())
+    try:
+        lm_path = tmp_dir / 'frame.asf'
+        _write_asf(lm_path, [[2., 3.], [4., 6.]], (10, 20))
+        video = LazyList.init_from_iterable([Image.init_blank((10, 20))])
+        video.path = Path('video.avi')
+        video.frame_transform = Scale(0.5, n_dims=2)
+        videos = [video]
+        _import_lazylist_attach_landmarks(videos,
+                                          lambda p, i: {'ASF': lm_path},
+                                          landmark_ext_map=image_landmark_types)
+        # ASF landmarks are relative to the decoded frame, so the frame
+        # transform is not applied again
+        assert_allclose(videos[0][0].landmarks['ASF'].points,
+                        [[2., 3.], [4., 6.]])
+    finally:
+        shutil.rmtree(str(tmp_dir))
+
+
+@raises(ValueError)
+@patch('menpo.io.input.video.video_infos_ffprobe')
+def test_ffmpeg_reader_invalid_crop(video_infos_ffprobe):
+    from pathlib import Path
+    from menpo.io.input.video import FFMpegVideoReader
+    video_infos_ffprobe.return_value = {'duration': 2, 'width': 100,
+                                        'height': 150, 'n_frames': 10, 'fps': 5}
+    FFMpegVideoReader(Path('fake_video_being_mocked.avi'),
+                      crop=((10, 20), (160, 70)))
+
+
+@patch('subprocess.Popen')
+@patch('menpo.io.input.video.video_seek_index')
+@patch('menpo.io.input.video.video_infos_ffprobe')
+def test_ffmpeg_reader_iter_parallel(video_infos_ffprobe, video_seek_index,
+                                     pipe):
+    from pathlib import Path
+    from menpo.io.input.video import FFMpegVideoReader
+    video_infos_ffprobe.return_value = {'duration': 4, 'width': 10,
+                                        'height': 15, 'n_frames': 20, 'fps': 5}
+    # Without a seek index the video is split in to equal ranges
+    video_seek_index.side_effect = OSError('ffprobe not available')
+    reader = FFMpegVideoReader(Path('fake_video_being_mocked.avi'))
+    starts = {}
+
+    def popen(command, **kwargs):
+        # Each process outputs frames filled with their frame index
+        start = 0
+        if '-ss' in command:
+            start = int(round(float(command[command.index('-ss') + 1]) * 5))
+        starts[start] = True
+        process = MagicMock()
+        process.stdout.read.side_effect = _fake_video_stdout((15, 10, 3))
+        if start > 0:
+            process.stdout.read(15 * 10 * 3 * start)  # skip to the start
+        return process
+    pipe.side_effect = popen
+
+    frames = list(reader.iter_parallel(3, chunk_size=4))
+    # One long-lived process per segment
+    assert sorted(starts.keys()) == [0, 6, 13]
+    assert [f[0, 0, 0] for f in frames] == list(range(20))
+
+
+@patch('subprocess.Popen')
+@patch('menpo.io.input.video.video_infos_ffprobe')
+def test_ffmpeg_reader_iter_parallel_keyframe_ranges(video_infos_ffprobe,
+                                                     pipe):
+    from pathlib import Path
+    from menpo.io.input.video import FFMpegVideoReader
+    video_infos_ffprobe.return_value = {'duration': 4, 'width': 10,
+                                        'height': 15, 'n_frames': 20, 'fps': 5}
+    reader = FFMpegVideoReader(Path('fake_video_being_mocked.avi'))
+    reader.keyframes = np.array([0, 3, 8, 10, 16])
+    starts = {}
+
+    def popen(command, **kwargs):
+        start = 0
+        if '-ss' in command:
+            start = int(round(float(command[command.index('-ss') + 1]) * 5))
+        starts[start] = True
+        process = MagicMock()
+        process.stdout.read.side_effect = _fake_video_stdout((15, 10, 3))
+        if start > 0:
+            process.stdout.read(15 * 10 * 3 * start)  # skip to the start
+        return process
+    pipe.side_effect = popen
+
+    frames = list(reader.iter_parallel(2, chunk_size=5))
+    # Every range starts on a keyframe and is at least 5 frames long
+    assert sorted(starts.keys()) == [0, 8, 16]
+    assert [f[0, 0, 0] for f in frames] == list(range(20))
+
+
+@raises(ValueError)
+@patch('subprocess.Popen')
+@patch('menpo.io.input.video.video_infos_ffprobe')
+def test_ffmpeg_reader_iter_parallel_truncated_raises(video_infos_ffprobe,
+                                                      pipe):
+    from pathlib import Path
+    from menpo.io.input.video import FFMpegVideoReader
+    video_infos_ffprobe.return_value = {'duration': 4, 'width': 10,
+                                        'height': 15, 'n_frames': 20, 'fps': 5}
+    reader = FFMpegVideoReader(Path('fake_video_being_mocked.avi'))
+
+    def popen(command, **kwargs):
+        # The video ends after 17 frames, rather than the expected 20
+        start = 0
+        if '-ss' in command:
+            start = int(round(float(command[command.index('-ss') + 1]) * 5))
+        remaining = {'n_bytes': 15 * 10 * 3 * max(17 - start, 0)}
+
+        def read(n):
+            n = min(n, remaining['n_bytes'])
+            remaining['n_bytes'] -= n
+            return b'\0' * n
+        process = MagicMock()
+        process.stdout.read.side_effect = read
+        return process
+    pipe.side_effect = popen
+
+    list(reader.iter_parallel(2, chunk_size=5))
+
+
+def _fake_ffmpeg_popen(frame_shape, fps, reads):
+    # Each process outputs frames filled with their frame index, starting
+    # from the frame it was seeked to, and records the size of every read
+    def popen(command, **kwargs):
+        start = 0
+        if '-ss' in command:
+            start = int(round(float(command[command.index('-ss') + 1]) * fps))
+        fake_read = _fake_video_stdout(frame_shape)
+        if start > 0:
+            fake_read(int(np.prod(frame_shape)) * start)  # skip to the start
+        reads[start] = []
+
+        def read(n):
+            reads[start].append(n)
+            return fake_read(n)
+        process = MagicMock()
+        process.stdout.read.side_effect = read
+        return process
+    return popen
+
+
+@patch('subprocess.Popen')
+@patch('menpo.io.input.video.video_seek_index')
+@patch('menpo.io.input.video.video_infos_ffprobe')
+def test_ffmpeg_reader_iter_parallel_loads_seek_index(video_infos_ffprobe,
+                                                      video_seek_index, pipe):
+    from pathlib import Path
+    from menpo.io.input.video import FFMpegVideoReader
+    video_infos_ffprobe.return_value = {'duration': 4, 'width': 10,
+                                        'height': 15, 'n_frames': 20, 'fps': 5}
+    video_seek_index.return_value = (np.arange(20) / 5.0,
+                                     np.array([0, 12]))
+    reader = FFMpegVideoReader(Path('fake_video_being_mocked.avi'))
+    reads = {}
+    pipe.side_effect = _fake_ffmpeg_popen((15, 10, 3), 5, reads)
+
+    frames = list(reader.iter_parallel(2, chunk_size=4))
+    assert video_seek_index.call_count == 1
+    assert [f[0, 0, 0] for f in frames] == list(range(20))
+    # One process per keyframe aligned range, each read in whole blocks
+    assert sorted(reads.keys()) == [0, 12]
+    assert max(max(r) for r in reads.values()) == 4 * 15 * 10 * 3
+
+
+@patch('subprocess.Popen')
+@patch('menpo.io.input.video.video_seek_index')
+@patch('menpo.io.input.video.video_infos_ffprobe')
+def test_ffmpeg_reader_iter_parallel_ranges_run_ahead(video_infos_ffprobe,
+                                                      video_seek_index, pipe):
+    import time
+    from pathlib import Path
+    from menpo.io.input.video import FFMpegVideoReader
+    video_infos_ffprobe.return_value = {'duration': 4, 'width': 10,
+                                        'height': 15, 'n_frames': 20, 'fps': 5}
+    video_seek_index.side_effect = OSError('ffprobe not available')
+    reader = FFMpegVideoReader(Path('fake_video_being_mocked.avi'))
+    reads = {}
+    pipe.side_effect = _fake_ffmpeg_popen((15, 10, 3), 5, reads)
+
+    frames = reader.iter_parallel(2, chunk_size=2)
+    assert next(frames)[0, 0, 0] == 0
+    # The second range decodes all of its 5 blocks while the consumer is
+    # still on the first frame of the first range
+    deadline = time.time() + 5
+    while len(reads.get(10, [])) < 5 and time.time() < deadline:
+        time.sleep(0.01)
+    assert len(reads.get(10, [])) == 5
+    assert [f[0, 0, 0] for f in frames] == list(range(1, 20))
+
+
+@patch('subprocess.Popen')
+@patch('menpo.io.input.video.video_infos_ffprobe')
+@patch('menpo.io.input.base.Path.is_file')
+def test_importing_ffmpeg_iter_parallel(is_file, video_infos_ffprobe, pipe):
+    video_infos_ffprobe.return_value = {'duration': 2, 'width': 100,
+                                        'height': 150, 'n_frames': 10, 'fps': 5}
+    is_file.return_value = True
+    pipe.return_value.stdout.read.side_effect = lambda n: b'\0' * n
+    ll = mio.import_video('fake_image_being_mocked.avi', normalize=False)
+    frames = list(ll.iter_parallel(2, chunk_size=5))
+    assert len(frames) == 10
+    assert frames[0].shape == (150, 100)
+    assert pipe.call_count == 2
@@ -1,39 +1,82 @@
-from os.path import sep as PATH_SEP
+import os
+import shutil
+import tempfile
 from mock import patch
 from pathlib import Path
 from nose.tools import raises
 
 
-from menpo.io.input.base import _pathlib_glob_for_pattern
+from menpo.io.input.base import _glob_for_pattern
 from menpo.io.output.base import _parse_and_validate_extension
 
 
-@patch('menpo.io.input.base.Path.glob')
-def test_glob_parse_contains_file_glob_no_sort(mock_glob):
-    path = '/tmp/test.*'
-    mock_glob.return_value = ['/tmp/test.test']
-    result = list(_pathlib_glob_for_pattern(path, sort=False))
-    assert len(result) == 1
-    mock_glob.assert_called_with('test.*')
-
-
-@patch('menpo.io.input.base.Path.glob')
-def test_glob_parse_contains_dir_glob_no_sort(mock_glob):
-    path = '/tmp/**/*'
-    mock_glob.return_value = ['/tmp/a/test.test', '/tmp/b/test.test']
-    result = list(_pathlib_glob_for_pattern(path, sort=False))
-    assert len(result) == 2
-    mock_glob.assert_called_with('**/*'.replace('/', PATH_SEP))
-
-
-@patch('menpo.io.input.base.Path.glob')
-def test_glob_parse_sort(mock_glob):
-    path = '/tmp/**/*'
-    mock_glob.return_value = ['/tmp/b/test.test', '/tmp/a/test.test']
-    result = list(_pathlib_glob_for_pattern(path, sort=True))
-    assert len(result) == 2
-    assert result[0] == mock_glob.return_value[1]
-    mock_glob.assert_called_with('**/*'.replace('/', PATH_SEP))
+def _make_tree(root, paths):
+    for p in paths:
+        path = Path(root) / p
+        if not path.parent.is_dir():
+            path.parent.mkdir(parents=True)
+        path.touch()
+
+
+def test_glob_parse_contains_file_glob_no_sort():
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        _make_tree(tmp_dir, ['test.test', 'other.test', 'a/test.test'])
+        result = list(_glob_for_pattern(tmp_dir + '/test.*', sort=False))
+        assert result == [Path(tmp_dir) / 'test.test']
+    finally:
+        shutil.rmtree(tmp_dir)
+
+
+def test_glob_parse_contains_dir_glob_no_sort():
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        _make_tree(tmp_dir, ['a/test.test', 'b/c/test.test'])
+        result = list(_glob_for_pattern(tmp_dir + '/**/*', sort=False))
+        assert len(result) == 2
+    finally:
+        shutil.rmtree(tmp_dir)
+
+
+def test_glob_parse_sort():
+    tmp_dir = tempfile.mkdtemp()
+    paths = ['b/test.test', 'a/test.test', 'a.test', 'b/a/test.test', 'c.test']
+    try:
+        _make_tree(tmp_dir, paths)
+        result = list(_glob_for_pattern(tmp_dir + '/**/*', sort=True))
+        assert result == sorted(Path(tmp_dir) / p for p in paths)
+    finally:
+        shutil.rmtree(tmp_dir)
+
+
+def test_glob_name_filter():
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        _make_tree(tmp_dir, ['a/1.jpg', 'a/1.pts', 'b/2.jpg'])
+        result = list(_glob_for_pattern(
+            tmp_dir + '/*/*', name_filter=lambda n: n.endswith('.jpg')))
+        assert result == [Path(tmp_dir) / 'a/1.jpg', Path(tmp_dir) / 'b/2.jpg']
+    finally:
+        shutil.rmtree(tmp_dir)
+
+
+def test_glob_manifest_reused_until_directory_changes():
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        _make_tree(tmp_dir, ['a/1.jpg', 'b/2.jpg'])
+        pattern = tmp_dir + '/**/*.jpg'
+        first = list(_glob_for_pattern(pattern, manifest=True))
+        assert (Path(tmp_dir) / '.menpo_manifest').is_file()
+        with patch('menpo.io.input.base._walk_glob') as walk_glob:
+            assert list(_glob_for_pattern(pattern, manifest=True)) == first
+            assert walk_glob.call_count == 0
+        # make sure the directory mtime changes, even on coarse filesystems
+        _make_tree(tmp_dir, ['b/3.jpg'])
+        os.utime(os.path.join(tmp_dir, 'b'), (0, 0))
+        result = list(_glob_for_pattern(pattern, manifest=True))
+        assert result == first + [Path(tmp_dir) / 'b/3.jpg']
+    finally:
+        shutil.rmtree(tmp_dir)
 
 
 def test_parse_extension_given_extension():
@@ -1,6 +1,7 @@
 import os
 from pathlib import Path
 import contextlib
+import struct
 
 
 try:
@@ -9,6 +10,28 @@ except ImportError:
     DEVNULL = open(os.devnull, 'wb')
 
 
+# The packed image format (see menpo.io.output.pack) begins with this magic
+# string followed by the offset and length of the header as two uint64s.
+# Every array within the pack is aligned to _PACK_ALIGN bytes.
+_PACK_MAGIC = b'MENPOPK1'
+_PACK_PREAMBLE = len(_PACK_MAGIC) + 16
+_PACK_ALIGN = 64
+
+# The memory mappable pickle format (.mpkl, see menpo.io.output.pickle) begins
+# with this magic string followed by the offset and length of the pickle
+# stream, the offset of the table of out-of-band buffers and the number of
+# buffers, as four uint64s. The table holds an (offset, length) uint64 pair
+# per buffer. Each buffer is aligned to _PACK_ALIGN bytes.
+_MPKL_MAGIC = b'MENPOMP1'
+_MPKL_PREAMBLE = len(_MPKL_MAGIC) + 32
+
+# Block compressed pickles (.pkl.bgz) are a series of gzip members, each
+# holding up to _BGZ_BLOCK_SIZE bytes of the pickle and starting with this
+# fixed size header (which records the size of the member).
+_BGZ_HEADER = struct.Struct('<4BI2BH2sHI')
+_BGZ_BLOCK_SIZE = 2 ** 22
+
+
 def _norm_path(filepath):
     r"""
     Uses all the tricks in the book to expand a path out to an absolute one.
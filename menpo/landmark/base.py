@@ -38,6 +38,9 @@ class Landmarkable(Copyable):
         """
         if self._landmarks is None:
             self._landmarks = LandmarkManager()
+        elif not isinstance(self._landmarks, LandmarkManager):
+            # The landmarks were set lazily - build them now
+            self._landmarks = self._landmarks()
         return self._landmarks
 
     @property
@@ -67,6 +70,32 @@ class Landmarkable(Copyable):
                 "{}D object".format(value.n_dims, self.n_dims))
         self._landmarks = value.copy()
 
+    def _set_landmarks_lazily(self, build_landmarks):
+        r"""
+        Defer setting the landmarks until they are first accessed.
+
+        Parameters
+        ----------
+        build_landmarks : `callable`
+            Called with no arguments on first access of the landmarks, it
+            must return a :map:`LandmarkManager` that is owned by this object.
+        """
+        self._landmarks = build_landmarks
+
+    def copy(self):
+        r"""
+        Generate an efficient copy of this object. Any lazily set landmarks
+        are built first, so that the copy owns its own landmarks.
+
+        Returns
+        -------
+        ``type(self)``
+            A copy of this object
+        """
+        if self.__dict__.get('_landmarks') is not None:
+            self.landmarks
+        return Copyable.copy(self)
+
     @property
     def n_landmark_groups(self):
         r"""
@@ -330,15 +330,22 @@ class PointCloud(Shape):
         Convert this :map:`PointCloud` to a dictionary representation suitable
         for inclusion in the LJSON landmark format.
 
+        Missing (``nan``) coordinates are written as ``None`` so that they
+        are serialized as ``null``.
+
         Returns
         -------
         json : `dict`
             Dictionary with ``points`` keys.
         """
+        points = self.points.tolist()
+        # Only the coordinates that are nan are visited
+        for i, j in zip(*np.nonzero(np.isnan(self.points))):
+            points[i][j] = None
         return {
             'labels': [],
             'landmarks': {
-                'points': self.points.tolist()
+                'points': points
             }
         }
 
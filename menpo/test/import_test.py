@@ -0,0 +1,31 @@
+import subprocess
+import sys
+
+
+def _modules_after(code):
+    # Run in a fresh interpreter so that nothing is already imported
+    out = subprocess.check_output(
+        [sys.executable, '-c',
+         code + '; import sys; print(" ".join(sys.modules))'])
+    return set(out.decode('utf8').split())
+
+
+def test_import_menpo_is_lazy():
+    modules = _modules_after('import menpo')
+    for name in ('menpo.image', 'menpo.feature', 'menpo.model', 'menpo.io',
+                 'menpo.visualize', 'matplotlib'):
+        assert name not in modules
+
+
+def test_import_menpo_subpackage_on_access():
+    modules = _modules_after('import menpo; menpo.shape.PointCloud')
+    assert 'menpo.shape' in modules
+    assert 'menpo.model' not in modules
+
+
+def test_import_landmark_file_does_not_import_image():
+    modules = _modules_after(
+        'import menpo.io as mio; '
+        'mio.import_landmark_file(mio.data_path_to("einstein.pts"))')
+    assert 'menpo.image' not in modules
+    assert 'matplotlib' not in modules
@@ -1,4 +1,5 @@
 import collections
+import sys
 import numpy as np
 from mock import Mock
 from nose.tools import raises
@@ -173,3 +174,140 @@ def test_lazylist_slice_with_ndarray():
     l = LazyList.init_from_iterable(['a', 'b', 'c', 'd', 'e'])
     l_indexed = l[index]
     assert list(l_indexed) == ['b', 'a', 'd']
+
+
+def test_lazylist_cache_hits_and_misses():
+    a = Mock(return_value=np.zeros(10))
+    ll = LazyList([a, a]).cache()
+    ll[0]
+    ll[0]
+    ll[1]
+    assert a.call_count == 2
+    assert ll.cache_info.hits == 1
+    assert ll.cache_info.misses == 2
+    assert ll.cache_info.n_bytes == 160
+
+
+def test_lazylist_cache_evicts_lru_under_budget():
+    callables = [Mock(return_value=np.zeros(10)) for _ in range(3)]
+    ll = LazyList(callables).cache(max_bytes=160)
+    ll[0]
+    ll[1]
+    ll[0]  # 1 is now the least recently used
+    ll[2]
+    assert len(ll.cache_info) == 2
+    assert ll.cache_info.n_bytes == 160
+    ll[0]
+    ll[1]
+    assert callables[0].call_count == 1
+    assert callables[1].call_count == 2
+
+
+def test_lazylist_cache_survives_map_and_slicing():
+    a = Mock(return_value=1)
+    b = Mock(return_value=2)
+    ll = LazyList([a, b]).cache()
+    ll[1]
+    assert ll[1:][0] == 2
+    assert ll.map(lambda x: x * 10)[1] == 20
+    assert b.call_count == 1
+    assert ll.cache_info.hits == 2
+
+
+def test_lazylist_cache_counts_image_bytes():
+    from menpo.image import MaskedImage
+    from menpo.shape import PointCloud
+    image = MaskedImage(np.zeros((3, 10, 10)))
+    image.landmarks['test'] = PointCloud(np.zeros((5, 2)))
+    ll = LazyList([lambda: image]).cache()
+    ll[0]
+    assert ll.cache_info.n_bytes == 3 * 100 * 8 + 100 + 5 * 2 * 8
+
+
+@raises(ValueError)
+def test_lazylist_cache_unknown_policy_raises_value_error():
+    LazyList([]).cache(policy='random')
+
+
+def test_lazylist_materialize_threads():
+    ll = LazyList.init_from_iterable(range(10), f=lambda x: x * 2)
+    assert ll.materialize(workers=3, chunksize=4) == list(range(0, 20, 2))
+
+
+def test_lazylist_imap_parallel_process_shared_memory():
+    from menpo.image import Image
+    ll = LazyList.init_from_iterable([np.zeros((3, 100, 100)),
+                                      np.ones((3, 100, 100)),
+                                      np.ones((2, 2))], f=Image)
+    images = list(ll.imap_parallel(workers=2, backend='process'))
+    assert len(images) == 3
+    assert np.all(images[0].pixels == 0)
+    assert np.all(images[1].pixels == 1)
+    assert images[1].pixels.flags.writeable
+    assert images[2].shape == (2, 2)
+    if sys.version_info >= (3, 8):
+        # The pixels are views on to the shared memory, not copies
+        assert not images[1].pixels.flags.owndata
+
+
+def test_lazylist_imap_parallel_closed_early_frees_shared_memory():
+    from mock import patch
+    from menpo.base import _unlink_shared_memory
+    from menpo.image import Image
+    ll = LazyList.init_from_iterable([np.zeros((3, 100, 100)),
+                                      np.ones((3, 100, 100))], f=Image)
+    with patch('menpo.base._unlink_shared_memory',
+               wraps=_unlink_shared_memory) as unlink:
+        images = ll.imap_parallel(workers=1, backend='process', chunksize=2)
+        next(images)
+        images.close()
+    if sys.version_info >= (3, 8):
+        # The second image of the chunk was never yielded
+        assert unlink.call_count == 1
+
+
+@raises(ValueError)
+def test_lazylist_imap_parallel_invalid_chunksize_raises_value_error():
+    next(LazyList([]).imap_parallel(chunksize=0))
+
+
+def test_lazylist_compact_map_repeat_slice():
+    ll = LazyList.init_from_index_callable(lambda i: i, 1000000)
+    mapped = ll.map(lambda x: x + 1).repeat(2)[::-3]
+    assert len(mapped) == 666667
+    assert mapped[0] == 1000000
+    assert mapped[1] == 999999
+    assert mapped[-1] == 1
+    assert len(mapped._pipeline) == 1
+
+
+def test_lazylist_add_index_lists_shares_source():
+    ll = LazyList.init_from_index_callable(lambda i: i * 2, 10)
+    added = ll[:2] + ll[8:]
+    assert added._source is ll._source
+    assert list(added) == [0, 2, 16, 18]
+    assert list(ll[:2] + LazyList.init_from_iterable([5])) == [0, 2, 5]
+
+
+def test_lazylist_repeated_add_stays_flat():
+    ll = LazyList.init_from_iterable([0])
+    for i in range(1, 2000):
+        ll = ll + [i]
+    assert len(ll) == 2000
+    assert len(ll._source.lazy_lists) == 2000
+    assert ll[0] == 0
+    assert ll[1234] == 1234
+    assert list(ll) == list(range(2000))
+    assert list((ll + ll)[1998:2002]) == [1998, 1999, 0, 1]
+
+
+def test_lazylist_init_from_tuple_of_callables():
+    ll = LazyList((lambda: 1, lambda: 2))
+    assert len(ll) == 2
+    assert ll[1] == 2
+    assert list(ll[::-1]) == [2, 1]
+
+
+@raises(IndexError)
+def test_lazylist_index_callable_out_of_range():
+    LazyList.init_from_index_callable(lambda i: i, 5)[5]
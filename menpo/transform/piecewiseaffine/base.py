@@ -275,7 +275,30 @@ class AbstractPWA(Alignment, Transform, Invertible):
         transformed : ``(K, 2)`` `ndarray`
             The transformed array.
         """
-        tri_index, alpha, beta = self.index_alpha_beta(x)
+        return self._apply_index_alpha_beta(*self.index_alpha_beta(x))
+
+    def _apply_index_alpha_beta(self, tri_index, alpha, beta):
+        r"""
+        Map points to the target space given their containing triangles and
+        barycentric coordinates, as returned by :meth:`index_alpha_beta`.
+        This only depends on the source through ``tri_index``, so the result
+        of :meth:`index_alpha_beta` can be reused between transforms that
+        share the same source.
+
+        Parameters
+        ----------
+        tri_index : ``(K,)`` `ndarray`
+            Triangle index for each point.
+        alpha : ``(K,)`` `ndarray`
+            Alpha for containing triangle of each point.
+        beta : ``(K,)`` `ndarray`
+            Beta for containing triangle of each point.
+
+        Returns
+        -------
+        transformed : ``(K, 2)`` `ndarray`
+            The transformed points.
+        """
         return (self.ti[tri_index] +
                 alpha[:, None] * self.tij[tri_index] +
                 beta[:, None] * self.tik[tri_index])
@@ -1,8 +1,15 @@
-from .base import (
-    Renderer, Viewable, LandmarkableViewable, viewwrapper, Menpo3dMissingError,
-    MenpowidgetsMissingError, PointGraphViewer2d, LandmarkViewer2d,
-    ImageViewer2d, ImageViewer, AlignmentViewer2d, GraphPlotter,
-    view_image_landmarks, view_patches, plot_gaussian_ellipses, plot_curve)
-from .textutils import (print_progress, progress_bar_str, print_dynamic,
-                        bytes_str)
-from .viewmatplotlib import MatplotlibRenderer
+from menpo.base import _lazy_module_attributes
+
+# Only import the (matplotlib based) viewers if they are actually used
+_lazy_module_attributes(__name__, dict(
+    [(name, ('.base', name)) for name in (
+        'Renderer', 'Viewable', 'LandmarkableViewable', 'viewwrapper',
+        'Menpo3dMissingError', 'MenpowidgetsMissingError',
+        'PointGraphViewer2d', 'LandmarkViewer2d', 'ImageViewer2d',
+        'ImageViewer', 'AlignmentViewer2d', 'GraphPlotter',
+        'view_image_landmarks', 'view_patches', 'plot_gaussian_ellipses',
+        'plot_curve')] +
+    [(name, ('.textutils', name)) for name in (
+        'print_progress', 'progress_bar_str', 'print_dynamic',
+        'bytes_str')] +
+    [('MatplotlibRenderer', ('.viewmatplotlib', 'MatplotlibRenderer'))]))